@@ -0,0 +1,280 @@
+"""
+Scheduler benchmark suite
+Runs Scheduler.run() headless for every algorithm over a grid of workload
+sizes and CPU / IO device counts, and reports:
+    ticks/sec   - simulated clock ticks per wall-clock second
+    events/sec  - recorded timeline events per wall-clock second
+    peak RSS    - peak resident memory of the run (MB)
+    export      - time to write the JSON + CSV timelines
+
+Every case runs in a fresh worker process, so peak RSS belongs to that case
+alone. Results are saved as JSON and compared against a stored baseline.
+
+Usage (from the P02 folder, key=value arguments like main.py):
+    python benchmarks/bench_scheduler.py
+    python benchmarks/bench_scheduler.py sizes=100,1000,10000 cpus=1,4 ios=1,2
+    python benchmarks/bench_scheduler.py algorithms=RR,SJF save_baseline=true
+    python benchmarks/bench_scheduler.py sizes=1000000 algorithms=FCFS export=false
+    python benchmarks/bench_scheduler.py record=false export=false fast_path=false
+
+Arguments:
+    algorithms     comma separated list (default: all)
+    sizes          processes per workload (default: 100,1000)
+    cpus / ios     device counts to try (default: 1,4 / 1,2)
+    workload       gen_jobs workload preset (default: standard)
+    seed           random seed for workload generation (default: 5143)
+    export         also time the JSON/CSV exporters (default: true)
+    record         keep the timeline events and log lines (default: true)
+    fast_path      let the basic policies use pkg.fastpath (default: true)
+    out            results file (default: benchmarks/results/latest.json)
+    baseline       baseline file (default: benchmarks/baseline.json)
+    save_baseline  write the results as the new baseline (default: false)
+    threshold      slowdown (fraction) reported as a regression (default: 0.10)
+"""
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Run from anywhere: make the P02 folder importable
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pkg.clock import Clock
+from pkg.eventLog import EventLog
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+from gen_jobs.generate_jobs import generate_processes, load_user_classes
+
+ALGORITHMS = ["FCFS", "SJF", "SRTF", "Priority", "PriorityPreemptive", "RR", "EDF", "RM", "Stride", "Lottery"]
+
+
+# ---------------------------------------
+# Argument handling (same key=value style as main.py)
+# ---------------------------------------
+def parse_args(argv):
+    """Parse key=value arguments into a settings dict"""
+    settings = {
+        "algorithms": ",".join(ALGORITHMS),
+        "sizes": "100,1000",
+        "cpus": "1,4",
+        "ios": "1,2",
+        "workload": "standard",
+        "seed": "5143",
+        "export": "true",
+        "record": "true",
+        "fast_path": "true",
+        "out": os.path.join(ROOT, "benchmarks", "results", "latest.json"),
+        "baseline": os.path.join(ROOT, "benchmarks", "baseline.json"),
+        "save_baseline": "false",
+        "threshold": "0.10",
+    }
+    for arg in argv:
+        if "=" in arg:
+            key, value = arg.split("=", 1)
+            settings[key] = value
+
+    def int_list(value):
+        return [int(v) for v in str(value).split(",") if v]
+
+    return {
+        "algorithms": [a for a in settings["algorithms"].split(",") if a],
+        "sizes": int_list(settings["sizes"]),
+        "cpus": int_list(settings["cpus"]),
+        "ios": int_list(settings["ios"]),
+        "workload": settings["workload"],
+        "seed": int(settings["seed"]),
+        "export": settings["export"].lower() == "true",
+        "record": settings["record"].lower() == "true",
+        "fast_path": settings["fast_path"].lower() == "true",
+        "out": settings["out"],
+        "baseline": settings["baseline"],
+        "save_baseline": settings["save_baseline"].lower() == "true",
+        "threshold": float(settings["threshold"]),
+    }
+
+
+# ---------------------------------------
+# One benchmark case (runs inside a fresh worker process)
+# ---------------------------------------
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None if unknown)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def build_workload(size, workload, seed):
+    """Generate 'size' job dicts with gen_jobs (quietly, reproducibly)"""
+    random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        user_classes = load_user_classes("job_classes.json")
+        jobs, _ = generate_processes(user_classes, n=size, workload_type=workload)
+    return jobs
+
+
+def run_case(case):
+    """Run one (algorithm, size, cpus, ios) case and return its measurements"""
+    jobs = build_workload(case["size"], case["workload"], case["seed"])
+
+    sched = Scheduler(
+        num_cpus=case["cpus"],
+        num_ios=case["ios"],
+        verbose=False,
+        algorithm=case["algorithm"],
+        clock=Clock(shared=False),
+        record=case["record"],
+        # without recording, the log lines go too
+        event_log=None if case["record"] else EventLog(level="off"),
+        fast_path=case["fast_path"],
+    )
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    del jobs
+
+    start = time.perf_counter()
+    sched.run()
+    elapsed = time.perf_counter() - start
+
+    export_seconds = None
+    if case["export"] and case["record"]:
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            sched.export_json(os.path.join(tmp, "timeline.json"))
+            sched.export_csv(os.path.join(tmp, "timeline.csv"))
+            export_seconds = time.perf_counter() - start
+
+    ticks = sched.clock.now()
+    events = len(sched.events)
+    return dict(
+        case,
+        ticks=ticks,
+        events=events,
+        seconds=elapsed,
+        ticks_per_sec=ticks / elapsed if elapsed else None,
+        events_per_sec=events / elapsed if elapsed else None,
+        export_seconds=export_seconds,
+        peak_rss_mb=peak_rss_mb(),
+    )
+
+
+def case_key(case):
+    """Key used to match a result with its baseline entry"""
+    key = f"{case['algorithm']}|n={case['size']}|cpus={case['cpus']}|ios={case['ios']}|{case['workload']}"
+    if not case.get("record", True):
+        key += "|norecord"
+    # results saved before the fast path existed ran the generic step
+    key += "|fast" if case.get("fast_path", False) else "|generic"
+    return key
+
+
+# ---------------------------------------
+# Reporting
+# ---------------------------------------
+def compare(results, baseline, threshold):
+    """
+    Attach the change against the baseline to every result
+    Returns: list of keys that got slower than 'threshold'
+    """
+    base = {case_key(r): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        old = base.get(case_key(r))
+        if not old or not old.get("ticks_per_sec") or not r["ticks_per_sec"]:
+            r["vs_baseline"] = None
+            continue
+        change = r["ticks_per_sec"] / old["ticks_per_sec"] - 1
+        r["vs_baseline"] = change
+        if change < -threshold:
+            regressions.append(case_key(r))
+    return regressions
+
+
+def print_table(results):
+    """Print one line per case"""
+    print(f"{'case':54} {'ticks/s':>11} {'events/s':>11} {'RSS MB':>8} {'export s':>9} {'vs base':>8}")
+    print("-" * 106)
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "-"
+        export = f"{r['export_seconds']:.3f}" if r["export_seconds"] is not None else "-"
+        change = f"{r['vs_baseline']:+.1%}" if r.get("vs_baseline") is not None else "-"
+        print(f"{case_key(r):54} {r['ticks_per_sec']:11.0f} {r['events_per_sec']:11.0f} "
+              f"{rss:>8} {export:>9} {change:>8}")
+
+
+def main(argv):
+    settings = parse_args(argv)
+    os.chdir(ROOT)  # gen_jobs and job_jsons paths are relative to P02
+
+    cases = [
+        {
+            "algorithm": algorithm,
+            "size": size,
+            "cpus": cpus,
+            "ios": ios,
+            "workload": settings["workload"],
+            "seed": settings["seed"],
+            "export": settings["export"],
+            "record": settings["record"],
+            "fast_path": settings["fast_path"],
+        }
+        for size in settings["sizes"]
+        for cpus in settings["cpus"]
+        for ios in settings["ios"]
+        for algorithm in settings["algorithms"]
+    ]
+
+    # maxtasksperchild=1: a fresh worker per case keeps peak RSS per case
+    results = []
+    with multiprocessing.Pool(1, maxtasksperchild=1) as pool:
+        for result in pool.imap(run_case, cases):
+            results.append(result)
+            print(f"  done {case_key(result)} in {result['seconds']:.2f}s", file=sys.stderr)
+
+    baseline = {}
+    if os.path.exists(settings["baseline"]):
+        with open(settings["baseline"]) as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, settings["threshold"])
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(settings["out"])), exist_ok=True)
+    with open(settings["out"], "w") as f:
+        json.dump(report, f, indent=2)
+    if settings["save_baseline"]:
+        with open(settings["baseline"], "w") as f:
+            json.dump(report, f, indent=2)
+
+    print_table(results)
+    print(f"\nResults saved to {settings['out']}")
+    if regressions:
+        print(f"Regressions (> {settings['threshold']:.0%} slower than baseline):")
+        for key in regressions:
+            print(f"  {key}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
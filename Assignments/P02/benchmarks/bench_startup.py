@@ -0,0 +1,130 @@
+"""
+Startup-time benchmark
+Starts a fresh interpreter for each entry point, many times, and reports
+the wall time until it exits plus the heavy modules (numpy, pygame, pandas,
+...) it ended up importing. Short simulations started by the thousand pay
+this on every run, so an entry point that imports something it doesn't use
+shows up here.
+
+Usage (from the P02 folder, key=value arguments like main.py):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py runs=30
+
+Arguments:
+    runs    interpreter starts per entry point (default: 15)
+    out     results file (default: benchmarks/results/startup.json)
+"""
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["numpy", "pandas", "matplotlib", "pygame", "rich", "multiprocessing", "lzma"]
+
+# name -> interpreter arguments (run from the P02 folder)
+ENTRY_POINTS = {
+    "python (no imports)": ["-c", "pass"],
+    "import pkg": ["-c", "import pkg"],
+    "from pkg import Scheduler": ["-c", "from pkg import Scheduler"],
+    "pkg.batch (numpy)": ["-c", "import pkg.batch"],
+    "short simulation": ["-c", (
+        "from pkg.clock import Clock\n"
+        "from pkg.loader import load_jobs, to_processes\n"
+        "from pkg.scheduler import Scheduler\n"
+        "s = Scheduler(verbose=False, record=False, clock=Clock(shared=False))\n"
+        "for p in to_processes(load_jobs('job_jsons/process_file_0001.json', cache=False)):\n"
+        "    s.add_process(p)\n"
+        "s.run()\n"
+    )],
+    "main.py headless": ["main.py", "headless=true", "file_num=1"],
+    "import gant_chart": ["-c", "import gant_chart"],
+}
+
+
+def parse_args(argv):
+    """Parse key=value arguments into a settings dict"""
+    settings = {
+        "runs": "15",
+        "out": os.path.join(ROOT, "benchmarks", "results", "startup.json"),
+    }
+    for arg in argv:
+        if "=" in arg:
+            key, value = arg.split("=", 1)
+            settings[key] = value
+    return {"runs": int(settings["runs"]), "out": settings["out"]}
+
+
+def time_start(args):
+    """Wall time of one interpreter run in seconds (raises if it fails)"""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def heavy_imports(args):
+    """Heavy modules loaded by an entry point (checked at interpreter exit)"""
+    probe = (
+        "import atexit, sys\n"
+        "atexit.register(lambda: sys.__stderr__.write('HEAVY=' + ','.join("
+        f"m for m in {HEAVY_MODULES!r} if m in sys.modules) + '\\n'))\n"
+    )
+    if args[0] == "-c":
+        command = ["-c", probe + args[1]]
+    else:  # a script: run it through runpy after the probe is installed
+        command = ["-c", probe + f"import runpy; sys.argv = {args!r}; runpy.run_path({args[0]!r}, run_name='__main__')"]
+    result = subprocess.run([sys.executable] + command, cwd=ROOT, capture_output=True, text=True)
+    if result.returncode:
+        return None  # the entry point failed (e.g. a missing dependency)
+    for line in result.stderr.splitlines():
+        if line.startswith("HEAVY="):
+            return [m for m in line[len("HEAVY="):].split(",") if m]
+    return None
+
+
+def main(argv):
+    settings = parse_args(argv)
+    results = []
+    for name, args in ENTRY_POINTS.items():
+        modules = heavy_imports(args)
+        if modules is None:
+            print(f"  skipped {name}: it doesn't run here", file=sys.stderr)
+            continue
+        time_start(args)  # warm the .pyc and OS file caches
+        times = [time_start(args) for _ in range(settings["runs"])]
+        results.append({
+            "entry_point": name,
+            "median_ms": statistics.median(times) * 1000,
+            "min_ms": min(times) * 1000,
+            "heavy_modules": modules,
+        })
+
+    print(f"{'entry point':28} {'median ms':>10} {'min ms':>8}  heavy modules")
+    print("-" * 80)
+    for r in results:
+        print(f"{r['entry_point']:28} {r['median_ms']:10.1f} {r['min_ms']:8.1f}  {', '.join(r['heavy_modules']) or '-'}")
+
+    report = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "runs": settings["runs"],
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(settings["out"])), exist_ok=True)
+    with open(settings["out"], "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {settings['out']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
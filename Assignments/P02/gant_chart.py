@@ -1,11 +1,15 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+"""
+Gantt chart of a timeline CSV (one bar per device per run of a process)
 
-# ---------------------------------------
-# Load timeline.csv into Pandas
-# ---------------------------------------
-df = pd.read_csv("./timelines/timeline0001.csv")
+Usage:
+    python gant_chart.py [timeline.csv]
+
+pandas and matplotlib are imported inside the functions that need them, so
+importing this module (e.g. to reuse load_timeline or build_schedule) stays cheap.
+"""
+import sys
+
+DEFAULT_TIMELINE = "./timelines/timeline0001.csv"
 
 
 # Flatten CPU/IO columns (lists stored as strings → eval safely)
@@ -16,69 +20,99 @@ def parse_list(s):
         return []
 
 
-df["cpus"] = df["cpus"].apply(parse_list)
-df["ios"] = df["ios"].apply(parse_list)
+# ---------------------------------------
+# Load timeline.csv into Pandas
+# ---------------------------------------
+def load_timeline(filename=DEFAULT_TIMELINE):
+    """Timeline CSV as a DataFrame with the cpus / ios columns parsed into lists"""
+    import pandas as pd
+
+    df = pd.read_csv(filename)
+    df["cpus"] = df["cpus"].apply(parse_list)
+    df["ios"] = df["ios"].apply(parse_list)
+    return df
+
 
 # ---------------------------------------
 # Build per-device schedules
 # ---------------------------------------
-records = []
-for _, row in df.iterrows():
-    t = row["time"]
-    for cid, proc in enumerate(row["cpus"]):
-        if proc and proc != "None":
-            records.append({"device": f"CPU{cid}", "time": t, "process": proc})
-    for did, proc in enumerate(row["ios"]):
-        if proc and proc != "None":
-            records.append({"device": f"IO{did}", "time": t, "process": proc})
-
-sched_df = pd.DataFrame(records)
+def build_schedule(df):
+    """One row per (device, time, process) while a device is busy"""
+    import pandas as pd
+
+    records = []
+    for _, row in df.iterrows():
+        t = row["time"]
+        for cid, proc in enumerate(row["cpus"]):
+            if proc and proc != "None":
+                records.append({"device": f"CPU{cid}", "time": t, "process": proc})
+        for did, proc in enumerate(row["ios"]):
+            if proc and proc != "None":
+                records.append({"device": f"IO{did}", "time": t, "process": proc})
+
+    return pd.DataFrame(records)
+
 
 # ---------------------------------------
 # Plot Gantt chart
 # ---------------------------------------
-fig, ax = plt.subplots(figsize=(12, 6))
-
-devices = sched_df["device"].unique()
-device_map = {dev: i for i, dev in enumerate(devices)}
-
-colors = {}
-ylabels = []
-for dev in devices:
-    ylabels.append(dev)
-
-for dev, dev_df in sched_df.groupby("device"):
-    y = device_map[dev]
-    for proc, proc_df in dev_df.groupby("process"):
-        # group consecutive time slots
-        times = proc_df["time"].sort_values().tolist()
-        start = times[0]
-        prev = start
-        for t in times[1:] + [None]:
-            if t is None or t != prev + 1:
-                ax.broken_barh(
-                    [(start, prev - start + 1)],
-                    (y - 0.4, 0.8),
-                    facecolors=colors.get(proc, None),
-                    edgecolor="black",
-                    linewidth=0.5,
-                    label=proc if proc not in colors else "",
-                )
-                if proc not in colors:
-                    colors[proc] = ax._get_lines.get_next_color()
-                if t is not None:
-                    start = t
-            prev = t
-
-# Labels and formatting
-ax.set_yticks(range(len(devices)))
-ax.set_yticklabels(ylabels)
-ax.set_xlabel("Time")
-ax.set_title("Process Execution Timeline (Gantt Chart)")
-
-# Build legend (one color per process)
-patches = [mpatches.Patch(color=col, label=proc) for proc, col in colors.items()]
-ax.legend(handles=patches, bbox_to_anchor=(1.05, 1), loc="upper left")
-
-plt.tight_layout()
-plt.show()
+def plot_gantt(sched_df, show=True):
+    """Draw the chart; returns the matplotlib (figure, axes)"""
+    import matplotlib.pyplot as plt
+    import matplotlib.patches as mpatches
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+
+    devices = sched_df["device"].unique()
+    device_map = {dev: i for i, dev in enumerate(devices)}
+
+    colors = {}
+    ylabels = []
+    for dev in devices:
+        ylabels.append(dev)
+
+    for dev, dev_df in sched_df.groupby("device"):
+        y = device_map[dev]
+        for proc, proc_df in dev_df.groupby("process"):
+            # group consecutive time slots
+            times = proc_df["time"].sort_values().tolist()
+            start = times[0]
+            prev = start
+            for t in times[1:] + [None]:
+                if t is None or t != prev + 1:
+                    ax.broken_barh(
+                        [(start, prev - start + 1)],
+                        (y - 0.4, 0.8),
+                        facecolors=colors.get(proc, None),
+                        edgecolor="black",
+                        linewidth=0.5,
+                        label=proc if proc not in colors else "",
+                    )
+                    if proc not in colors:
+                        colors[proc] = ax._get_lines.get_next_color()
+                    if t is not None:
+                        start = t
+                prev = t
+
+    # Labels and formatting
+    ax.set_yticks(range(len(devices)))
+    ax.set_yticklabels(ylabels)
+    ax.set_xlabel("Time")
+    ax.set_title("Process Execution Timeline (Gantt Chart)")
+
+    # Build legend (one color per process)
+    patches = [mpatches.Patch(color=col, label=proc) for proc, col in colors.items()]
+    ax.legend(handles=patches, bbox_to_anchor=(1.05, 1), loc="upper left")
+
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return fig, ax
+
+
+def main(filename=DEFAULT_TIMELINE):
+    plot_gantt(build_schedule(load_timeline(filename)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_TIMELINE)
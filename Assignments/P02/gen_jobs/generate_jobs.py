@@ -1,4 +1,5 @@
 import json
+import math
 import random
 import uuid
 from pathlib import Path
@@ -8,6 +9,8 @@ import os
 
 pid = 0
 
+DISK_BLOCKS = 10000  # disk size used for block addresses (see pkg/diskDevice.py)
+
 # ----------------------------------------------------------
 # Workload presets
 # ----------------------------------------------------------
@@ -117,7 +120,11 @@ def generate_io_burst(user_class):
             )
         ),
     )
-    return {"type": io_type, "duration": duration}
+    burst = {"type": io_type, "duration": duration}
+    # Disk requests get a block address for the seek-time disk model
+    if io_type.startswith("DISK"):
+        burst["block"] = random.randrange(DISK_BLOCKS)
+    return burst
 
 
 # ----------------------------------------------------------
@@ -186,7 +193,7 @@ def generate_process(user_class, workload_preset=None, max_bursts=20):
                 bursts.append({"io": generate_io_burst(user_class)})
             burst_count += 1
 
-    return {
+    job = {
         "pid": ppid,
         "class_id": user_class["class_id"],
         "priority": priority,
@@ -196,6 +203,15 @@ def generate_process(user_class, workload_preset=None, max_bursts=20):
         "bursts": bursts,
     }
 
+    # Latency-SLO classes get a deadline (ticks after arrival) in proportion
+    # to the work they need, and a release period for rate-monotonic (EDF/RM)
+    if "deadline_slack" in user_class:
+        work = cpu_used + sum(b["io"]["duration"] for b in bursts if "io" in b)
+        job["deadline"] = math.ceil(user_class["deadline_slack"] * work)
+    if "period" in user_class:
+        job["period"] = user_class["period"]
+    return job
+
 
 # ----------------------------------------------------------
 def generate_processes(user_classes, n=10, workload_type="standard", arrival_spacing=None):
@@ -5,12 +5,18 @@ Supports workload generation on-the-fly
 
 import json
 import sys
-from rich import print
+import time
 
+# rich (console colours) and pkg.visualizer (pygame) are imported in the
+# __main__ block below, only for interactive runs, so headless runs start fast
 from pkg.clock import Clock
+from pkg.eventLog import EventLog
+from pkg.ioDevice import parse_io_config
+from pkg.loader import JobFileError, find_job_file, load_jobs, to_processes
+from pkg.predictor import make_predictor
+from pkg.fairShare import parse_shares
 from pkg.scheduler import Scheduler
 from pkg.process import Process
-from pkg.visualizer import Visualizer
 
 # ---------------------------------------
 # Import the generator module
@@ -33,53 +39,22 @@ except ImportError:
 # ---------------------------------------
 # Load JSON into Process objects
 # ---------------------------------------
-def load_processes_from_json(filename="generated_processes.json", limit=None):
+def load_processes_from_json(filename="generated_processes.json", limit=None, num_cpus=None):
     """Load processes from a JSON file into Process instances"""
-    # Try different possible locations
-    possible_paths = [
-        filename,
-        f"./job_jsons/{filename}",
-        f"./job_jsons/process_file_{str(filename).zfill(4)}.json",
-        f"process_file_{str(filename).zfill(4)}.json"
-    ]
-
-    data = None
-    for path in possible_paths:
-        try:
-            with open(path) as f:
-                data = json.load(f)
-                break
-        except FileNotFoundError:
-            continue
-
-    if data is None:
+    # Accepts a path, a name in ./job_jsons or a file number
+    path = find_job_file(filename)
+    if path is None:
         print(f"Error: Could not find file {filename}")
         return []
 
-    processes = []
-    if limit is None or limit > len(data):
-        limit = len(data)
-
-    for p in data[:limit]:
-        bursts = []
-        for b in p["bursts"]:
-            if "cpu" in b:
-                bursts.append({"cpu": b["cpu"]})
-            elif "io" in b:
-                bursts.append(
-                    {"io": {"type": b["io"]["type"], "duration": b["io"]["duration"]}}
-                )
-
-        proc = Process(
-            pid=p["pid"],
-            bursts=bursts,
-            priority=p.get("priority", 0),
-            quantum=p.get("quantum", 4),
-            arrival_time=p.get("arrival_time", 0)
-        )
-        processes.append(proc)
+    # Validated once, then cached in a per-user directory (see pkg.loader)
+    try:
+        jobs = load_jobs(path, num_cpus=num_cpus)
+    except JobFileError as e:
+        print(f"Error: {e}")
+        return []
 
-    return processes
+    return to_processes(jobs, limit=limit)
 
 # ---------------------------------------
 # Generate processes on-the-fly
@@ -106,25 +81,7 @@ def generate_and_get_processes(workload_type="standard", num_processes=10, arriv
     )
 
     # Convert to Process objects
-    processes = []
-    for p in processes_data:
-        bursts = []
-        for b in p["bursts"]:
-            if "cpu" in b:
-                bursts.append({"cpu": b["cpu"]})
-            elif "io" in b:
-                bursts.append(
-                    {"io": {"type": b["io"]["type"], "duration": b["io"]["duration"]}}
-                )
-
-        proc = Process(
-            pid=p["pid"],
-            bursts=bursts,
-            priority=p.get("priority", 0),
-            quantum=p.get("quantum", 4),
-            arrival_time=p.get("arrival_time", 0)
-        )
-        processes.append(proc)
+    processes = [Process.from_dict(p) for p in processes_data]
 
     print(f"✓ Generated {len(processes)} {workload_type} processes")
     print(f"  Workload: {preset['description']}")
@@ -171,6 +128,16 @@ if __name__ == "__main__":
     # Parse command line arguments
     args = argParse()
 
+    # headless=true: no visualizer, run to completion at full speed and print
+    # a JSON metrics summary on stdout (everything else goes to stderr)
+    headless = args.get("headless", False)
+    record = args.get("record", not headless)  # keep the event log; needed for timeline exports
+    stdout = sys.stdout
+    if headless:
+        sys.stdout = sys.stderr
+    else:
+        from rich import print  # rebinds the module's print for the functions above too
+
     # Get parameters with defaults
     file_num = args.get("file_num", None)
     workload = args.get("workload", None)
@@ -181,6 +148,33 @@ if __name__ == "__main__":
     generate_num = args.get("generate_num", 10)
     arrival_spacing = args.get("arrival_spacing", None)
     save_temp = args.get("save_temp", False)  # Optionally save to file for testing
+    profile = args.get("profile", False)  # Time each phase of Scheduler.step()
+    io_config = args.get("io_config", None)  # Typed IO pools, e.g. DISK:2,NIC:1,CONSOLE:1
+    if io_config:
+        io_config = parse_io_config(io_config)
+    disk_policy = args.get("disk_policy", None)  # FIFO, SSTF, SCAN, C-SCAN, DEADLINE (needs a DISK pool)
+    # Context switch overhead model (ticks, default free)
+    switch_cost = args.get("switch_cost", 0)
+    migration_penalty = args.get("migration_penalty", 0)
+    dispatch_latency = args.get("dispatch_latency", 0)
+    # CPU placement: prefer the last CPU, NUMA nodes (CPU groups) and their migration penalty
+    soft_affinity = args.get("soft_affinity", False)
+    numa_nodes = args.get("numa_nodes", 1)
+    numa_penalty = args.get("numa_penalty", 0)
+    columnar = args.get("columnar", False)  # also export a compressed columnar timeline (.tlc)
+    quantum_policy = args.get("quantum_policy", None)  # "adaptive" tunes RR quanta per process
+    predictor = args.get("predictor", None)  # "ema": SJF/SRTF use predicted burst lengths
+    shares = args.get("shares", None)  # Stride/Lottery class shares, e.g. A:1,B:3,C:2,D:1
+    if shares:
+        shares = parse_shares(shares)
+    # Human-readable event log: level (debug, info, warning, off), optional file,
+    # and console sampling (every Nth line) / rate limit (lines per second)
+    log_file = args.get("log_file", None)
+    log_level = args.get("log_level", "off" if headless and not log_file else "debug")
+    log_every = args.get("log_every", 1)
+    log_rate = args.get("log_rate", None)
+    if predictor:
+        predictor = make_predictor(predictor, alpha=args.get("predictor_alpha", 0.5))
 
     # Determine how to get processes
     processes = []
@@ -202,7 +196,7 @@ if __name__ == "__main__":
         # Load from existing file (backward compatibility)
         filename = f"process_file_{str(file_num).zfill(4)}.json"
         print(f"\nLoading processes from {filename}...")
-        processes = load_processes_from_json(filename, limit=limit)
+        processes = load_processes_from_json(filename, limit=limit, num_cpus=cpus)
 
     else:
         # Default: generate standard processes
@@ -222,9 +216,24 @@ if __name__ == "__main__":
     print(f"\n{'='*60}")
     print(f"Simulation Configuration:")
     print(f"  Algorithm: {algorithm}")
-    print(f"  CPUs: {cpus}")
-    print(f"  IO Devices: {ios}")
+    print(f"  CPUs: {cpus}" + (f" in {numa_nodes} NUMA nodes" if numa_nodes > 1 else ""))
+    if io_config:
+        print(f"  IO Devices: {', '.join(f'{t} x{n}' for t, n in io_config.items())}")
+    else:
+        print(f"  IO Devices: {ios}")
+    if disk_policy:
+        print(f"  Disk Policy: {disk_policy}")
+    if quantum_policy:
+        print(f"  Quantum Policy: {quantum_policy}")
+    if shares:
+        print(f"  Class Shares: {', '.join(f'{c}={s:g}' for c, s in shares.items())}")
+    if predictor:
+        print(f"  Burst Predictor: {predictor.name} (alpha={predictor.alpha})")
     print(f"  Processes: {len(processes)}")
+    if log_file:
+        print(f"  Log File: {log_file} (level {log_level})")
+    if headless:
+        print(f"  Mode: headless" + ("" if record else " (events not recorded)"))
     if workload:
         print(f"  Workload Type: {workload}")
     if file_num:
@@ -258,15 +267,30 @@ if __name__ == "__main__":
 
     # Initialize scheduler and run simulation
     clock = Clock()
-    sched = Scheduler(num_cpus=cpus, num_ios=ios, verbose=True, algorithm=algorithm)
+    event_log = EventLog(level=log_level, filename=log_file, console=not headless, console_level=log_level,
+                         console_every=log_every, console_rate=log_rate)
+    sched = Scheduler(num_cpus=cpus, num_ios=ios, verbose=not headless, algorithm=algorithm, profile=profile,
+                      io_config=io_config, disk_policy=disk_policy, switch_cost=switch_cost,
+                      migration_penalty=migration_penalty, dispatch_latency=dispatch_latency,
+                      quantum_policy=quantum_policy, predictor=predictor, shares=shares,
+                      soft_affinity=soft_affinity, numa_nodes=numa_nodes, numa_penalty=numa_penalty,
+                      record=record, event_log=event_log)
 
     for p in processes:
         sched.add_process(p)
 
-    # Run with visualizer
-    print("\nStarting simulation with visualizer...")
-    visualizer = Visualizer(sched)
-    visualizer.run()
+    started = time.perf_counter()
+    if headless:
+        print("\nRunning simulation headless...")
+        sched.run()
+    else:
+        # Run with visualizer
+        print("\nStarting simulation with visualizer...")
+        from pkg.visualizer import Visualizer
+
+        visualizer = Visualizer(sched)
+        visualizer.run()
+    wall_time = time.perf_counter() - started
 
     # Print final log and stats
     print("\n--- Simulation Complete ---")
@@ -274,7 +298,9 @@ if __name__ == "__main__":
     print(f"Finished processes: {[p.pid for p in sched.finished]}")
 
     # Calculate and export statistics
-    if hasattr(sched, 'finished') and sched.finished:
+    if hasattr(sched, 'finished') and sched.finished and not record:
+        print("\nTimeline not recorded (record=false), nothing to export")
+    elif hasattr(sched, 'finished') and sched.finished:
         print(f"\nPerformance Metrics:")
         print(f"  Total processes completed: {len(sched.finished)}")
         print(f"  Total simulation time: {sched.clock.now()}")
@@ -292,11 +318,22 @@ if __name__ == "__main__":
 
         sched.export_json(f"./timelines/timeline_{algorithm}_{file_id}.json")
         sched.export_csv(f"./timelines/timeline_{algorithm}_{file_id}.csv")
+        if columnar:
+            sched.export_columnar(f"./timelines/timeline_{algorithm}_{file_id}.tlc")
 
         print(f"\nTimeline exported to:")
         print(f"  ./timelines/timeline_{algorithm}_{file_id}.json")
         print(f"  ./timelines/timeline_{algorithm}_{file_id}.csv")
+        if columnar:
+            print(f"  ./timelines/timeline_{algorithm}_{file_id}.tlc")
 
+    metrics = sched.metrics()
+    event_log.close()
     clock.reset()
 
-    print("\n✅ Simulation completed successfully!")
\ No newline at end of file
+    print("\n✅ Simulation completed successfully!")
+
+    if headless:
+        metrics["processes"] = len(processes)
+        metrics["wall_time"] = wall_time
+        stdout.write(json.dumps(metrics) + "\n")
\ No newline at end of file
@@ -1,7 +1,36 @@
-from .clock import Clock
-from .cpu import CPU
-from .ioDevice import IODevice
-from .scheduler import Scheduler
-from .process import Process
+"""
+Scheduler simulation package
 
-__all__ = ["Clock", "CPU", "IODevice", "Scheduler", "Process"]
+The names below are imported on first use (PEP 562 module __getattr__), so
+`import pkg` or `import pkg.scheduler` doesn't pay for numpy (pkg.batch) or
+multiprocessing (pkg.whatIf) unless they're actually used.
+"""
+import importlib
+
+# public name -> submodule it lives in
+_EXPORTS = {
+    "Clock": ".clock",
+    "CPU": ".cpu",
+    "IODevice": ".ioDevice",
+    "Scheduler": ".scheduler",
+    "Process": ".process",
+    "run_variants": ".whatIf",
+    "encode_workloads": ".batch",
+    "simulate_batch": ".batch",
+    "run_workloads": ".multiRun",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
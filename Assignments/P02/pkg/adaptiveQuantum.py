@@ -0,0 +1,101 @@
+import copy
+import math
+
+
+class AdaptiveQuantum:
+    """
+    Round Robin quantum tuned per process from the CPU bursts it has run
+
+    Every finished CPU burst updates an exponential moving average of the
+    process's burst length and of how far bursts stray from it (the same
+    smoothing TCP uses for round trip times):
+
+        dev = (1 - beta) * dev + beta * |length - ema|
+        ema = (1 - alpha) * ema + alpha * length
+        quantum = ceil(ema + k * dev), clamped to [min_quantum, max_quantum]
+
+    so short, steady interactive bursts get a slice just long enough to
+    finish in one go, and long batch bursts get long slices instead of
+    being preempted over and over. Each class keeps the same estimate
+    over all of its processes, which seeds the quantum of new arrivals.
+
+    Attributes:
+        alpha / beta: smoothing of the length and deviation estimates
+        k: how many deviations of headroom the quantum gets
+        min_quantum / max_quantum: bounds on the quantum
+        class_estimates: class_id -> [ema, dev]
+        stats: class_id -> {"bursts", "within_slice", "quantum_sum"}
+    Methods:
+        admit(process): give an arriving process its class's quantum
+        observe(process, length): learn from a finished CPU burst
+        metrics(): per class share of bursts that fit in one slice
+        copy(): independent copy (for forked simulations)
+    """
+
+    def __init__(self, alpha=0.5, beta=0.25, k=2, min_quantum=1, max_quantum=32):
+        self.alpha = alpha
+        self.beta = beta
+        self.k = k
+        self.min_quantum = min_quantum
+        self.max_quantum = max_quantum
+        self.class_estimates = {}
+        self.stats = {}
+
+    def _quantum(self, ema, dev):
+        quantum = math.ceil(ema + self.k * dev)
+        return max(self.min_quantum, min(self.max_quantum, quantum))
+
+    def _update(self, estimate, length):
+        """Fold one burst length into an [ema, dev] pair (None = no data yet)"""
+        if estimate is None:
+            return [length, length / 2]
+        ema, dev = estimate
+        dev = (1 - self.beta) * dev + self.beta * abs(length - ema)
+        ema = (1 - self.alpha) * ema + self.alpha * length
+        return [ema, dev]
+
+    def admit(self, process):
+        """
+        Set an arriving process's quantum from its class estimate
+        Until the class has run a burst the job file's quantum is kept.
+        """
+        estimate = self.class_estimates.get(process.class_id)
+        if estimate is not None and process.burst_estimate is None:
+            process.quantum = process.remaining_quantum = self._quantum(*estimate)
+
+    def observe(self, process, length):
+        """
+        Learn from a CPU burst that just finished
+        Args:
+            process: Process whose burst finished (already advanced)
+            length: total CPU ticks the burst took
+        Returns: None
+        """
+        stats = self.stats.setdefault(process.class_id, {"bursts": 0, "within_slice": 0, "quantum_sum": 0})
+        stats["bursts"] += 1
+        stats["within_slice"] += length <= process.quantum
+        stats["quantum_sum"] += process.quantum
+
+        process.burst_estimate = self._update(process.burst_estimate, length)
+        self.class_estimates[process.class_id] = self._update(
+            self.class_estimates.get(process.class_id), length
+        )
+        process.quantum = process.remaining_quantum = self._quantum(*process.burst_estimate)
+
+    def metrics(self):
+        """
+        Per class summary
+        Returns: dict of class_id -> {"bursts", "within_slice", "avg_quantum"}
+        """
+        return {
+            str(class_id): {
+                "bursts": s["bursts"],
+                "within_slice": s["within_slice"] / s["bursts"],
+                "avg_quantum": s["quantum_sum"] / s["bursts"],
+            }
+            for class_id, s in self.stats.items()
+        }
+
+    def copy(self):
+        """Independent copy, so a fork keeps learning on its own"""
+        return copy.deepcopy(self)
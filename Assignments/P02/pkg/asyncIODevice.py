@@ -0,0 +1,153 @@
+import collections
+import heapq
+
+from pkg.ioDevice import IODevice
+
+
+class AsyncIODevice(IODevice):
+    """
+    An I/O device that keeps several requests in flight (NVMe drive, NIC)
+
+    Up to 'queue_depth' requests can be outstanding on the device. Up to
+    'slots' of them are serviced in parallel; the rest wait in the device's
+    own submission queue. Service completions go on an event heap keyed by
+    finish time, so a tick only touches requests that actually finish.
+
+    Finished requests are handed back to the scheduler in batches
+    ("interrupts"): as soon as 'coalesce' completions are waiting, or when
+    the oldest one has waited 'coalesce_timeout' ticks. coalesce=1 delivers
+    every completion on the tick it happens.
+
+    Attributes:
+        queue_depth: max outstanding requests
+        slots: requests serviced in parallel
+        coalesce / coalesce_timeout: interrupt batching settings
+        interrupts: number of completion batches delivered
+        slot_time: sum over ticks of requests in service (for avg in-flight)
+    Methods:
+        can_accept(): True if another request fits in the queue depth
+        assign(process): submit a request
+        tick_all(): advance one tick, returns processes whose IO is complete
+        outstanding(): [(process, remaining duration)] for every request held
+    """
+
+    def __init__(self, did, clock, dtype="GENERIC_IO", queue_depth=32, slots=4,
+                 coalesce=1, coalesce_timeout=0):
+        super().__init__(did, clock, dtype)
+        self.queue_depth = max(1, queue_depth)
+        self.slots = max(1, min(slots, self.queue_depth))
+        self.coalesce = max(1, coalesce)
+        self.coalesce_timeout = coalesce_timeout
+        self._in_service = []  # heap of (finish_time, seq, process)
+        self._submitted = collections.deque()  # accepted, waiting for a slot
+        self._completed = []  # [(completion_time, process)] not yet delivered
+        self._seq = 0
+        self.interrupts = 0
+        self.slot_time = 0
+
+    @property
+    def current(self):
+        """One of the requests on the device (for snapshots), or None"""
+        if self._in_service:
+            return self._in_service[0][2]
+        if self._submitted:
+            return self._submitted[0]
+        if self._completed:
+            return self._completed[0][1]
+        return None
+
+    @current.setter
+    def current(self, process):
+        # IODevice.__init__ sets current = None; nothing else assigns it
+        if process is not None:
+            self.assign(process)
+
+    def _load(self):
+        return len(self._in_service) + len(self._submitted) + len(self._completed)
+
+    def is_busy(self):
+        """True while any request is held by the device"""
+        return self._load() > 0
+
+    def can_accept(self):
+        """True if another request fits in the queue depth"""
+        return self._load() < self.queue_depth
+
+    def _start(self, process, now):
+        duration = process.current_burst()["io"]["duration"]
+        heapq.heappush(self._in_service, (now + duration, self._seq, process))
+        self._seq += 1
+
+    def assign(self, process):
+        """Submit a request; it starts right away if a slot is free"""
+        process.state = "io"
+        if len(self._in_service) < self.slots:
+            self._start(process, self.clock.now())
+        else:
+            self._submitted.append(process)
+
+    def tick_all(self):
+        """
+        Advance the device by one time unit
+        Returns: list of processes whose IO burst is complete (may be empty)
+        """
+        now = self.clock.now()
+        in_service = self._in_service
+        if in_service:
+            self.busy_time += 1
+            self.slot_time += len(in_service)
+
+        # Finish every request whose service time is up; freed slots pick
+        # up submitted requests straight away
+        while in_service and in_service[0][0] <= now:
+            _, _, process = heapq.heappop(in_service)
+            process.current_burst()["io"]["duration"] = 0
+            self._completed.append((now, process))
+            if self._submitted:
+                self._start(self._submitted.popleft(), now)
+
+        if not self._completed:
+            return []
+        oldest = self._completed[0][0]
+        if len(self._completed) < self.coalesce and now - oldest < self.coalesce_timeout:
+            return []
+
+        # Deliver one interrupt for the whole batch
+        self.interrupts += 1
+        delivered = [process for _, process in self._completed]
+        self._completed = []
+        for process in delivered:
+            process.advance_burst()
+        return delivered
+
+    def outstanding(self):
+        """Every request held by the device with the IO time it still needs"""
+        now = self.clock.now()
+        held = [(p, max(0, finish - now)) for finish, _, p in sorted(self._in_service)]
+        held += [(p, p.current_burst()["io"]["duration"]) for p in self._submitted]
+        held += [(p, 0) for _, p in self._completed]
+        return held
+
+    def adopt(self, process, source):
+        """
+        Continue serving a process that was on 'source'
+        A request 'source' has finished but not yet delivered keeps waiting
+        for its interrupt here, with its original completion time.
+        """
+        if isinstance(source, AsyncIODevice):
+            for completed_at, held in source._completed:
+                if held.pid == process.pid:
+                    process.state = "io"
+                    self._completed.append((completed_at, process))
+                    return
+        self.assign(process)
+
+    def carry_counters(self, source):
+        """Add 'source's busy time, slot time and interrupt count to this device's"""
+        super().carry_counters(source)
+        if isinstance(source, AsyncIODevice):
+            self.slot_time += source.slot_time
+            self.interrupts += source.interrupts
+
+    def __repr__(self):
+        return f"IO{self.did}: {self._load()} outstanding"
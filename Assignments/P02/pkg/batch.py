@@ -0,0 +1,258 @@
+"""
+Vectorized batch simulator for the non-preemptive FCFS and SJF policies.
+
+Instead of stepping Process objects one tick at a time, every workload is
+encoded into NumPy arrays (workload x process x burst) and all workloads
+advance together: each tick is a handful of array operations per CPU and
+per IO device, no matter how many workloads are in the batch.
+
+The engine follows the same tick order as Scheduler.step() (arrivals, CPU
+ticks, IO ticks, CPU dispatch, IO dispatch) and the same tie-breaking, so
+finish times match the object simulation exactly. Run `python -m pkg.batch`
+from the project folder to check that against the shipped job_jsons files.
+
+Example:
+    batch = encode_workloads([jobs_a, jobs_b, jobs_c])
+    result = simulate_batch(batch, algorithm="SJF", num_cpus=2, num_ios=2)
+    result["avg_wait"]  # one value per workload
+"""
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch engine
+    np = None
+
+BATCH_ALGORITHMS = ("FCFS", "SJF")
+
+# Burst kinds
+NONE, CPU_BURST, IO_BURST = 0, 1, 2
+
+# Process states
+FUTURE, READY, RUNNING, WAITING, IN_IO, DONE, EMPTY = range(7)
+
+# Ready/wait keys are packed as key * SEQ_SPAN + sequence number
+SEQ_SPAN = 1 << 32
+NO_KEY = np.iinfo(np.int64).max if np is not None else None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("The batch simulator needs numpy (pip install numpy)")
+
+
+def encode_workloads(workloads):
+    """
+    Encode job lists into padded arrays
+    Args:
+        workloads: list of workloads, each a list of job dicts as written by
+                   gen_jobs (pid, bursts, optional arrival_time)
+    Returns: dict of arrays
+        kind (W, P, B+1): burst kind (NONE / CPU_BURST / IO_BURST)
+        length (W, P, B+1): burst length (cpu time or io duration)
+        arrival (W, P): arrival times
+        valid (W, P): False for padding slots
+        pids: list of pid lists, in the (sorted) process order used
+    """
+    _require_numpy()
+    num_w = len(workloads)
+    num_p = max((len(w) for w in workloads), default=0)
+    num_b = max((len(j["bursts"]) for w in workloads for j in w), default=0)
+
+    # One extra burst column so "the burst after the last one" reads as NONE
+    kind = np.zeros((num_w, num_p, num_b + 1), dtype=np.int8)
+    length = np.zeros((num_w, num_p, num_b + 1), dtype=np.int64)
+    arrival = np.zeros((num_w, num_p), dtype=np.int64)
+    valid = np.zeros((num_w, num_p), dtype=bool)
+    pids = []
+
+    for w, jobs in enumerate(workloads):
+        # Scheduler.add_process keeps late arrivals sorted (stable) by arrival
+        # time, so (arrival, file order) is the order processes show up in
+        order = sorted(range(len(jobs)), key=lambda i: jobs[i].get("arrival_time", 0))
+        pids.append([jobs[i]["pid"] for i in order])
+        for p, i in enumerate(order):
+            job = jobs[i]
+            arrival[w, p] = job.get("arrival_time", 0)
+            valid[w, p] = True
+            for b, burst in enumerate(job["bursts"]):
+                if "cpu" in burst:
+                    kind[w, p, b] = CPU_BURST
+                    length[w, p, b] = burst["cpu"]
+                else:
+                    io = burst["io"]
+                    kind[w, p, b] = IO_BURST
+                    length[w, p, b] = io if isinstance(io, int) else io["duration"]
+
+    return {"kind": kind, "length": length, "arrival": arrival, "valid": valid, "pids": pids}
+
+
+def simulate_batch(batch, algorithm="FCFS", num_cpus=1, num_ios=1):
+    """
+    Simulate every workload in an encoded batch
+    Args:
+        batch: output of encode_workloads()
+        algorithm: "FCFS" or "SJF"
+        num_cpus / num_ios: devices per workload
+    Returns: dict of arrays
+        finish (W, P): finish time per process (-1 for padding)
+        turnaround (W, P), wait (W, P): per-process metrics
+        makespan (W,): clock time when the workload's run() would return
+        avg_turnaround (W,), avg_wait (W,): per-workload averages
+    """
+    _require_numpy()
+    if algorithm not in BATCH_ALGORITHMS:
+        raise ValueError(f"Batch engine supports {BATCH_ALGORITHMS}, not {algorithm!r}")
+
+    kind, length = batch["kind"], batch["length"]
+    arrival, valid = batch["arrival"], batch["valid"]
+    num_w, num_p = arrival.shape
+    rows = np.arange(num_w)
+
+    state = np.where(valid, FUTURE, EMPTY).astype(np.int8)
+    bidx = np.zeros((num_w, num_p), dtype=np.int64)  # current burst index
+    remaining = length[:, :, 0].copy()  # time left in the current burst
+    ready_key = np.full((num_w, num_p), NO_KEY, dtype=np.int64)
+    wait_key = np.full((num_w, num_p), NO_KEY, dtype=np.int64)
+    finish = np.full((num_w, num_p), -1, dtype=np.int64)
+    counter = np.zeros(num_w, dtype=np.int64)  # per-workload insertion sequence
+    on_cpu = np.full((num_w, num_cpus), -1, dtype=np.int64)
+    on_io = np.full((num_w, num_ios), -1, dtype=np.int64)
+
+    def make_ready(w, p):
+        """Ready queue order: (arrival or burst length, insertion order)"""
+        major = arrival[w, p] if algorithm == "FCFS" else remaining[w, p]
+        ready_key[w, p] = major * SEQ_SPAN + counter[w]
+        counter[w] += 1
+        state[w, p] = READY
+
+    def complete_burst(w, p, to_wait, now):
+        """Advance to the next burst and route the process"""
+        bidx[w, p] += 1
+        nxt = kind[w, p, bidx[w, p]]
+        remaining[w, p] = length[w, p, bidx[w, p]]
+
+        done = nxt == NONE
+        state[w[done], p[done]] = DONE
+        finish[w[done], p[done]] = now
+
+        if to_wait:
+            io = nxt == IO_BURST
+            wi, pi = w[io], p[io]
+            wait_key[wi, pi] = counter[wi]
+            counter[wi] += 1
+            state[wi, pi] = WAITING
+            rest = nxt == CPU_BURST
+        else:
+            rest = ~done
+        make_ready(w[rest], p[rest])
+
+    now = 0
+    active = valid.any(axis=1)
+    while active.any():
+        # Handle arrivals (in process order, which is arrival order)
+        arriving = (state == FUTURE) & (arrival <= now)
+        if arriving.any():
+            rank = np.cumsum(arriving, axis=1) - 1
+            w, p = np.nonzero(arriving)
+            major = arrival[w, p] if algorithm == "FCFS" else remaining[w, p]
+            ready_key[w, p] = major * SEQ_SPAN + counter[w] + rank[w, p]
+            state[w, p] = READY
+            counter += arriving.sum(axis=1)
+
+        # CPU ticks (each workload has at most one process per CPU slot)
+        for c in range(num_cpus):
+            w = np.nonzero(on_cpu[:, c] >= 0)[0]
+            p = on_cpu[w, c]
+            remaining[w, p] -= 1
+            done = remaining[w, p] == 0
+            w, p = w[done], p[done]
+            on_cpu[w, c] = -1
+            complete_burst(w, p, to_wait=True, now=now)
+
+        # IO ticks
+        for d in range(num_ios):
+            w = np.nonzero(on_io[:, d] >= 0)[0]
+            p = on_io[w, d]
+            remaining[w, p] -= 1
+            done = remaining[w, p] == 0
+            w, p = w[done], p[done]
+            on_io[w, d] = -1
+            complete_burst(w, p, to_wait=False, now=now)
+
+        # Dispatch to CPUs: lowest (key, sequence) in the ready queue
+        for c in range(num_cpus):
+            keys = np.where(state == READY, ready_key, NO_KEY)
+            best = keys.argmin(axis=1)
+            take = (on_cpu[:, c] < 0) & (keys[rows, best] != NO_KEY)
+            w, p = rows[take], best[take]
+            on_cpu[w, c] = p
+            state[w, p] = RUNNING
+
+        # Dispatch to IO devices: FIFO wait queue
+        for d in range(num_ios):
+            keys = np.where(state == WAITING, wait_key, NO_KEY)
+            best = keys.argmin(axis=1)
+            take = (on_io[:, d] < 0) & (keys[rows, best] != NO_KEY)
+            w, p = rows[take], best[take]
+            on_io[w, d] = p
+            state[w, p] = IN_IO
+
+        now += 1
+        active = ((state != DONE) & (state != EMPTY)).any(axis=1)
+
+    # Wait time is everything that wasn't CPU or IO service
+    service = np.where(kind[:, :, :-1] != NONE, length[:, :, :-1], 0).sum(axis=2)
+    turnaround = np.where(valid, finish - arrival, 0)
+    wait = np.where(valid, turnaround - service, 0)
+    count = np.maximum(valid.sum(axis=1), 1)
+    return {
+        "finish": finish,
+        "turnaround": turnaround,
+        "wait": wait,
+        "makespan": np.where(valid.any(axis=1), finish.max(axis=1) + 1, 0),
+        "avg_turnaround": turnaround.sum(axis=1) / count,
+        "avg_wait": wait.sum(axis=1) / count,
+    }
+
+
+def verify_against_scheduler(workloads, algorithm="FCFS", num_cpus=1, num_ios=1):
+    """
+    Run each workload through Scheduler and compare finish times
+    Returns: list of workload indexes whose results differ (empty = match)
+    """
+    from pkg.clock import Clock
+    from pkg.process import Process
+    from pkg.scheduler import Scheduler
+
+    batch = encode_workloads(workloads)
+    result = simulate_batch(batch, algorithm, num_cpus, num_ios)
+
+    mismatched = []
+    for w, jobs in enumerate(workloads):
+        sched = Scheduler(num_cpus=num_cpus, num_ios=num_ios, verbose=False,
+                          algorithm=algorithm, clock=Clock(shared=False))
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        sched.run()
+
+        expected = {p.pid: p.finish_time for p in sched.finished}
+        got = dict(zip(batch["pids"][w], result["finish"][w].tolist()))
+        if expected != got or sched.clock.now() != result["makespan"][w]:
+            mismatched.append(w)
+    return mismatched
+
+
+if __name__ == "__main__":
+    import glob
+    import json
+
+    files = sorted(glob.glob("job_jsons/process_file_*.json"))
+    loaded = []
+    for name in files:
+        with open(name) as f:
+            loaded.append(json.load(f))
+
+    for algo in BATCH_ALGORITHMS:
+        for cpus, ios in [(1, 1), (2, 2), (4, 2)]:
+            bad = verify_against_scheduler(loaded, algo, cpus, ios)
+            status = "OK" if not bad else f"MISMATCH in {[files[i] for i in bad]}"
+            print(f"{algo:5} cpus={cpus} ios={ios}: {len(files)} workloads {status}")
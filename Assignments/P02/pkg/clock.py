@@ -2,13 +2,15 @@
 class Clock:
     """
     Singleton clock using Borg pattern
-    All instances share the same state"""
+    All instances share the same state, unless created with shared=False
+    (used by forked / batch simulations that each need their own timeline)"""
 
     _shared_state = {}  # Dictionary that's shared between all instances
 
-    def __init__(self):
+    def __init__(self, shared=True):
         # Make the instance's __dict__ point to the shared state
-        self.__dict__ = self._shared_state
+        if shared:
+            self.__dict__ = self._shared_state
         # Initialize time if not already done
         if not hasattr(self, "time"):
             self.time = 0
@@ -5,18 +5,50 @@ class CPU:
         cid: CPU ID
         clock: reference to the shared Clock instance
         current: currently assigned process or None
+        switch_cost: ticks to switch to a process that didn't run here last
+                     (a CPU's first process isn't a switch: there is nothing to switch from)
+        migration_penalty: extra ticks (cache warm-up) for a process that last ran on another CPU
+        dispatch_latency: ticks added to every dispatch
+        node: NUMA node (CPU group) the CPU belongs to
+        numa_penalty: extra ticks for a process that last ran on another node
+        bit: 1 << cid, the CPU's bit in affinity / idle masks
+        overhead_remaining: overhead ticks left before the current process runs
+        overhead_time: total ticks spent on overhead (not charged to any process)
+        busy_time: total ticks spent running process bursts
+        switches / migrations: number of context switches / cross-CPU migrations
+        node_migrations: migrations that crossed NUMA nodes
     Methods:
         is_busy(): returns True if CPU is busy
         assign(process): assigns a process to the CPU
+        adopt(process, source): continues a process from another CPU (used by Scheduler.fork)
+        carry_counters(source): adds another CPU's time and switch counters to this one (forks)
         tick(): advances the CPU by one time unit, returns finished process if any
         __repr__(): string representation for debugging
     """
 
-    def __init__(self, cid, clock):
+    def __init__(self, cid, clock, switch_cost=0, migration_penalty=0, dispatch_latency=0,
+                 node=0, numa_penalty=0):
         """Initialize CPU with ID and clock reference"""
         self.cid = cid
         self.clock = clock
         self.current = None
+        self.node = node
+        self.bit = 1 << cid
+
+        # Overhead model - all zero means switches are free
+        self.switch_cost = switch_cost
+        self.migration_penalty = migration_penalty
+        self.dispatch_latency = dispatch_latency
+        self.numa_penalty = numa_penalty
+        self.overhead_remaining = 0
+        self.last_tick_overhead = False  # True if the last tick was spent on overhead
+        self.last_pid = None  # pid of the last process that ran here
+
+        self.overhead_time = 0
+        self.busy_time = 0
+        self.switches = 0
+        self.migrations = 0
+        self.node_migrations = 0
 
     def is_busy(self):
         """Check if the CPU is currently busy"""
@@ -27,6 +59,37 @@ class CPU:
         self.current = process
         process.state = "running"
 
+        # Work out the overhead paid before the process gets to run
+        overhead = self.dispatch_latency
+        if self.last_pid is not None and process.pid != self.last_pid:
+            overhead += self.switch_cost
+            self.switches += 1
+        if process.last_cpu is not None and process.last_cpu != self.cid:
+            overhead += self.migration_penalty
+            self.migrations += 1
+            if process.last_node != self.node:
+                # cold cache and remote memory on the other node
+                overhead += self.numa_penalty
+                self.node_migrations += 1
+        self.overhead_remaining = overhead
+        self.last_pid = process.pid
+        process.last_cpu = self.cid
+        process.last_node = self.node
+
+    def adopt(self, process, source):
+        """Continue running a process that was on 'source', including its pending overhead"""
+        self.current = process
+        self.overhead_remaining = source.overhead_remaining
+        self.last_pid = source.last_pid
+
+    def carry_counters(self, source):
+        """Add 'source's busy / overhead time and switch counts to this CPU's"""
+        self.busy_time += source.busy_time
+        self.overhead_time += source.overhead_time
+        self.switches += source.switches
+        self.migrations += source.migrations
+        self.node_migrations += source.node_migrations
+
     def tick(self):
         """
         Advance the process on the CPU by one time unit
@@ -34,12 +97,21 @@ class CPU:
              the process if it finished its CPU burst, else None
         """
         if not self.current:
+            self.last_tick_overhead = False
+            return None
+        # Pay switch / migration / dispatch overhead before running the burst
+        if self.overhead_remaining > 0:
+            self.overhead_remaining -= 1
+            self.overhead_time += 1
+            self.last_tick_overhead = True
             return None
+        self.last_tick_overhead = False
         # Process the current burst
         burst = self.current.current_burst()
         # If it's a CPU burst, decrement its time
         if burst and "cpu" in burst:
             burst["cpu"] -= 1
+            self.busy_time += 1
             # If the burst is done, advance to the next one (could be CPU or IO or done)
             if burst["cpu"] == 0:
                 self.current.advance_burst()  # Move to the next burst
@@ -0,0 +1,354 @@
+import bisect
+import collections
+import heapq
+import zlib
+
+from pkg.ioDevice import IODevice
+
+DISK_POLICIES = ("FIFO", "SSTF", "SCAN", "C-SCAN", "DEADLINE")
+
+DISK_BLOCKS = 10000  # blocks on the simulated disk (addresses 0..DISK_BLOCKS-1)
+
+
+def burst_block(process):
+    """
+    Block address of a process's current IO burst
+    Bursts from gen_jobs carry a "block"; older job files don't, so those get
+    a stable pseudo-random address derived from the pid and burst position.
+    """
+    io = process.current_burst()["io"]
+    block = io.get("block")
+    if block is None:
+        block = zlib.crc32(f"{process.pid}:{process.burst_index}".encode()) % DISK_BLOCKS
+        io["block"] = block
+    return block
+
+
+class BlockIndex:
+    """
+    Queued requests by block address, as (block, seq) pairs
+    A Fenwick (binary indexed) tree holds the number of requests at each
+    block, so finding the first request at or past a block (or the last at
+    or before it) is a descent of the tree, and adding or removing one
+    updates log(blocks) counts. Blocks past the end grow the tree.
+    Requests at the same block are told apart by their sequence number.
+    Methods:
+        add(block, seq) / discard(block, seq): index / unindex a request
+        at_or_after(block): lowest block >= 'block', with its lowest seq
+        at_or_before(block): highest block <= 'block', with its highest seq
+        around(block): (at_or_before(block - 1), at_or_after(block)), one count
+        first() / last(): lowest block (lowest seq) / highest block (highest seq)
+        __len__: number of requests
+    The lookups return a (block, seq) pair, or None if there is none.
+    """
+
+    def __init__(self, size=DISK_BLOCKS):
+        self._size = 1 << max(size - 1, 1).bit_length()  # power of two, for the descent
+        self._tree = [0] * (self._size + 1)  # 1-based: index i counts block i - 1
+        self._seqs = {}  # block -> sorted seqs queued there
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _update(self, block, delta):
+        i = block + 1
+        tree = self._tree
+        size = self._size
+        while i <= size:
+            tree[i] += delta
+            i += i & -i
+
+    def _grow(self, block):
+        """Resize the tree to hold 'block' and recount every block"""
+        self._size = 1 << block.bit_length()
+        self._tree = [0] * (self._size + 1)
+        for b, seqs in self._seqs.items():
+            self._update(b, len(seqs))
+
+    def _prefix(self, block):
+        """Requests at blocks <= 'block'"""
+        i = min(block + 1, self._size)
+        tree = self._tree
+        total = 0
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def _kth(self, k):
+        """Block of the k-th request (1-based) in block order"""
+        tree = self._tree
+        size = self._size
+        pos = 0
+        step = size
+        while step:
+            nxt = pos + step
+            if nxt <= size and tree[nxt] < k:
+                pos = nxt
+                k -= tree[nxt]
+            step >>= 1
+        return pos  # tree index pos + 1, i.e. block pos
+
+    def add(self, block, seq):
+        if block < 0:
+            raise ValueError(f"Disk block addresses can't be negative, got {block}")
+        if block >= self._size:
+            self._grow(block)
+        seqs = self._seqs.get(block)
+        if seqs is None:
+            self._seqs[block] = [seq]
+        else:
+            bisect.insort(seqs, seq)  # requests at one block are few
+        self._update(block, 1)
+        self._count += 1
+
+    def discard(self, block, seq):
+        seqs = self._seqs[block]
+        del seqs[bisect.bisect_left(seqs, seq)]
+        if not seqs:
+            del self._seqs[block]
+        self._update(block, -1)
+        self._count -= 1
+
+    def at_or_after(self, block):
+        k = (self._prefix(block - 1) if block > 0 else 0) + 1
+        if k > self._count:
+            return None
+        found = self._kth(k)
+        return found, self._seqs[found][0]
+
+    def at_or_before(self, block):
+        if block < 0:
+            return None
+        k = self._prefix(block)
+        if k == 0:
+            return None
+        found = self._kth(k)
+        return found, self._seqs[found][-1]
+
+    def around(self, block):
+        k = self._prefix(block - 1) if block > 0 else 0
+        before = after = None
+        if k > 0:
+            found = self._kth(k)
+            before = found, self._seqs[found][-1]
+        if k < self._count:
+            found = self._kth(k + 1)
+            after = found, self._seqs[found][0]
+        return before, after
+
+    def first(self):
+        return self.at_or_after(0)
+
+    def last(self):
+        return self.at_or_before(self._size - 1)
+
+
+class DiskQueue:
+    """
+    Wait queue for a pool of disks that picks the next request by policy
+    Attributes:
+        clock: Clock used to stamp DEADLINE expiry times
+        policy: one of DISK_POLICIES
+        read_expire / write_expire: DEADLINE policy expiry times (ticks)
+    Methods:
+        append(process) / appendleft(process): queue a request
+        popleft(): oldest request (FIFO order, ignores policy)
+        pop_for(device, now): next request for a disk by policy
+        requests(): (process, DEADLINE expiry or None) in arrival order
+        __len__ / __iter__: size and requests in arrival order
+
+    Requests are indexed by block in a BlockIndex, so finding the next
+    request around the head position and taking it out are O(log blocks).
+    An ordered dict keeps arrival order for FIFO, and DEADLINE keeps a heap
+    of expiry times whose stale entries (already served) are skipped lazily.
+    """
+
+    def __init__(self, clock, policy="FIFO", read_expire=50, write_expire=250):
+        self.clock = clock
+        policy = policy.upper()
+        if policy not in DISK_POLICIES:
+            raise ValueError(f"Unknown disk policy {policy!r}; choose from {DISK_POLICIES}")
+        self.policy = policy
+        self.read_expire = read_expire
+        self.write_expire = write_expire
+        self._blocks = BlockIndex()  # (block, seq) of every queued request
+        self._fifo = collections.OrderedDict()  # seq -> (block, seq, process)
+        self._deadlines = []  # heap of (deadline, seq)
+        self._next_seq = 0
+        self._front_seq = 0
+
+    def __len__(self):
+        return len(self._fifo)
+
+    def __iter__(self):
+        return (entry[2] for entry in self._fifo.values())
+
+    def requests(self):
+        """
+        Queued requests in arrival order with their DEADLINE expiry times
+        A fork re-queues these so its requests keep their order and expiry.
+        Returns: list of (process, expiry time or None)
+        """
+        # seqs are never reused, so a stale heap entry can't match a queued one
+        expiry = {seq: deadline for deadline, seq in self._deadlines}
+        return [(entry[2], expiry.get(seq)) for seq, entry in self._fifo.items()]
+
+    def _add(self, process, seq, expire_at):
+        entry = (burst_block(process), seq, process)
+        self._blocks.add(entry[0], seq)
+        self._fifo[seq] = entry
+        if self.policy == "DEADLINE":
+            if expire_at is None:
+                io_type = process.current_burst()["io"].get("type", "")
+                expire = self.write_expire if "WRITE" in io_type else self.read_expire
+                expire_at = self.clock.now() + expire
+            heapq.heappush(self._deadlines, (expire_at, seq))
+        return entry
+
+    def append(self, process, expire_at=None):
+        """
+        Queue a request behind everything already queued
+        Args:
+            process: Process whose current burst is a disk request
+            expire_at: DEADLINE expiry time to keep (default: now + read/write expire)
+        """
+        self._add(process, self._next_seq, expire_at)
+        self._next_seq += 1
+
+    def appendleft(self, process, expire_at=None):
+        """Queue a request ahead of everything already queued (see append)"""
+        self._front_seq -= 1
+        self._add(process, self._front_seq, expire_at)
+        self._fifo.move_to_end(self._front_seq, last=False)
+
+    def _remove(self, entry):
+        """Take an entry out of every index and return its process"""
+        self._blocks.discard(entry[0], entry[1])
+        del self._fifo[entry[1]]
+        return entry[2]
+
+    def popleft(self):
+        """Oldest queued request"""
+        seq = next(iter(self._fifo))
+        return self._remove(self._fifo[seq])
+
+    def pop_for(self, device, now):
+        """
+        Next request for 'device' according to the queue's policy
+        Args:
+            device: DiskDevice asking (its head and direction are used)
+            now: current clock time (for DEADLINE)
+        Returns: Process
+        """
+        if self.policy == "FIFO":
+            return self.popleft()
+
+        if self.policy == "DEADLINE":
+            # Serve an expired request first, else fall back to C-SCAN order
+            while self._deadlines and self._deadlines[0][1] not in self._fifo:
+                heapq.heappop(self._deadlines)
+            if self._deadlines and self._deadlines[0][0] <= now:
+                _, seq = heapq.heappop(self._deadlines)
+                return self._remove(self._fifo[seq])
+            return self._remove(self._cscan(device.head))
+
+        if self.policy == "SSTF":
+            return self._remove(self._nearest(device.head))
+
+        if self.policy == "C-SCAN":
+            return self._remove(self._cscan(device.head))
+
+        # SCAN: keep moving the same way, turn around at the last request
+        blocks = self._blocks
+        if device.direction > 0:
+            found = blocks.at_or_after(device.head)
+            if found is None:
+                device.direction = -1
+                found = blocks.last()
+        else:
+            found = blocks.at_or_before(device.head)
+            if found is None:
+                device.direction = 1
+                found = blocks.first()
+        return self._remove(self._fifo[found[1]])
+
+    def _nearest(self, head):
+        """Entry with the block closest to 'head'"""
+        below, above = self._blocks.around(head)
+        if below is None or (above is not None and (above[0] - head, above[1]) < (head - below[0], below[1])):
+            return self._fifo[above[1]]
+        return self._fifo[below[1]]
+
+    def _cscan(self, head):
+        """First entry at or past 'head', wrapping round to the lowest block"""
+        found = self._blocks.at_or_after(head) or self._blocks.first()
+        return self._fifo[found[1]]
+
+
+class DiskDevice(IODevice):
+    """
+    A disk whose service time depends on how far the head has to move
+    Each request costs settle + distance / blocks_per_tick ticks of seeking
+    (rounded up) before its transfer time (the burst duration) starts.
+    Attributes:
+        head: block the head is over
+        direction: +1 / -1, sweep direction for SCAN
+        seek_remaining: seek ticks left for the current request
+        seek_distance: total blocks travelled
+        seek_time: total ticks spent seeking
+    """
+
+    def __init__(self, did, clock, dtype="DISK", settle=1, blocks_per_tick=500):
+        super().__init__(did, clock, dtype)
+        self.settle = settle
+        self.blocks_per_tick = blocks_per_tick
+        self.head = 0
+        self.direction = 1
+        self.seek_remaining = 0
+        self.seek_distance = 0
+        self.seek_time = 0
+
+    def take(self, queue):
+        """Pick this disk's next request from its pool's queue"""
+        return queue.pop_for(self, self.clock.now())
+
+    def assign(self, process):
+        """Assign a request and start seeking to its block"""
+        block = burst_block(process)
+        distance = abs(block - self.head)
+        if block != self.head:
+            self.direction = 1 if block > self.head else -1
+        self.head = block
+        self.seek_remaining = self.settle + -(-distance // self.blocks_per_tick)
+        self.seek_distance += distance
+        super().assign(process)
+
+    def adopt(self, process, source):
+        """Continue a request (and head position) from another disk"""
+        super().adopt(process, source)
+        if isinstance(source, DiskDevice):
+            self.inherit_head(source)
+            self.seek_remaining = source.seek_remaining
+
+    def carry_counters(self, source):
+        """Add 'source's busy time and seek totals to this disk's"""
+        super().carry_counters(source)
+        if isinstance(source, DiskDevice):
+            self.seek_distance += source.seek_distance
+            self.seek_time += source.seek_time
+
+    def inherit_head(self, source):
+        """Take over another disk's head position and sweep direction (forks)"""
+        self.head = source.head
+        self.direction = source.direction
+
+    def tick(self):
+        """Seek first, then transfer"""
+        if self.current and self.seek_remaining > 0:
+            self.seek_remaining -= 1
+            self.seek_time += 1
+            self.busy_time += 1
+            return None
+        return super().tick()
@@ -0,0 +1,160 @@
+"""
+Leveled, buffered log for the scheduler's human-readable event lines
+
+Scheduler used to print() every event when verbose and append every line to
+an ever-growing list. EventLog sends each line to up to three sinks:
+
+    ring buffer   the last `capacity` lines in memory (Scheduler.log / timeline())
+    file          lines are collected and written `flush_every` at a time
+    console       optional, with sampling (every Nth line) and a rate limit
+                  (lines per second of wall time); skipped lines are counted
+
+Every event type has a level (EVENT_LEVELS). A line is only formatted when
+some sink wants its level, see EventLog.enabled(); at level "off" the
+scheduler does no log formatting at all.
+
+Example:
+    log = EventLog(level="info", filename="run.log", console=True, console_every=100)
+    sched = Scheduler(event_log=log)
+    sched.run()
+    log.close()
+"""
+import collections
+import sys
+import time
+
+DEBUG, INFO, WARNING, OFF = 10, 20, 30, 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "off": OFF}
+
+# event_type -> level: queue moves happen many times per process and are
+# debug; a process arriving or finishing is info
+EVENT_LEVELS = {
+    "enqueue": DEBUG,
+    "dispatch_cpu": DEBUG,
+    "dispatch_io": DEBUG,
+    "cpu_to_io": DEBUG,
+    "cpu_to_ready": DEBUG,
+    "io_to_ready": DEBUG,
+    "preempted": DEBUG,
+    "arrival": INFO,
+    "finished": INFO,
+    "info": INFO,
+}
+
+
+def parse_level(level):
+    """Level number from a name in LEVELS or a number"""
+    if isinstance(level, str):
+        if level.lower() not in LEVELS:
+            raise ValueError(f"Unknown log level {level!r}; choose from {list(LEVELS)}")
+        return LEVELS[level.lower()]
+    return level
+
+
+class EventLog:
+    """
+    Leveled log with a ring buffer, batched file output and a throttled console
+    Attributes:
+        level: lowest level kept in the ring buffer and the file
+        lines: deque of the last `capacity` lines (capacity None = keep all)
+        console_level: lowest level printed (when console is on)
+        threshold: lowest level any sink wants (check before formatting)
+        suppressed: console lines skipped by sampling or the rate limit
+    Methods:
+        enabled(level): would a line at this level go anywhere?
+        write(level, line): send a formatted line to the sinks
+        flush(): write pending file lines
+        close(): flush and close the file
+    """
+
+    def __init__(self, level="debug", capacity=10000, filename=None, flush_every=1000,
+                 console=False, console_level="debug", console_every=1, console_rate=None, stream=None):
+        """
+        Args:
+            level: lowest level for the ring buffer and the file
+            capacity: lines kept in memory (None = unbounded)
+            filename: also write lines to this file (truncated on first flush)
+            flush_every: pending lines that trigger a file write
+            console: print lines
+            console_level: lowest level printed
+            console_every: print only every Nth line that passes console_level
+            console_rate: at most this many printed lines per second (None = no limit)
+            stream: console stream (default: sys.stdout at the time of writing)
+        """
+        if console_every < 1:
+            raise ValueError(f"console_every must be at least 1, got {console_every}")
+        self.level = parse_level(level)
+        self.lines = collections.deque(maxlen=capacity)
+        self.filename = filename
+        self.flush_every = flush_every
+        self.console = console
+        self.console_level = parse_level(console_level)
+        self.console_every = console_every
+        self.console_rate = console_rate
+        self.stream = stream
+        self.threshold = min(self.level, self.console_level if console else OFF)
+        self.suppressed = 0
+
+        self._pending = []  # lines waiting for the next file write
+        self._file = None
+        self._console_seen = 0
+        self._hidden = 0  # lines suppressed since the last one printed
+        self._tokens = console_rate or 0  # rate limit bucket, refilled by wall time
+        self._last_refill = time.monotonic()
+
+    def enabled(self, level):
+        """True if a line at 'level' would be kept or printed"""
+        return level >= self.threshold
+
+    def write(self, level, line):
+        """Send one formatted line to every sink that wants its level"""
+        if level >= self.level:
+            self.lines.append(line)
+            if self.filename is not None:
+                self._pending.append(line)
+                if len(self._pending) >= self.flush_every:
+                    self.flush()
+        if self.console and level >= self.console_level:
+            self._print(line)
+
+    def _print(self, line):
+        self._console_seen += 1
+        if (self._console_seen - 1) % self.console_every:
+            self._skip()
+            return
+        if self.console_rate:
+            now = time.monotonic()
+            self._tokens = min(self.console_rate, self._tokens + (now - self._last_refill) * self.console_rate)
+            self._last_refill = now
+            if self._tokens < 1:
+                self._skip()
+                return
+            self._tokens -= 1
+        stream = self.stream or sys.stdout
+        if self._hidden:
+            stream.write(f"... {self._hidden} log lines not shown\n")
+            self._hidden = 0
+        stream.write(line + "\n")
+
+    def _skip(self):
+        self.suppressed += 1
+        self._hidden += 1
+
+    def flush(self):
+        """Write the pending lines to the file"""
+        if not self._pending:
+            return
+        if self._file is None:
+            self._file = open(self.filename, "w", encoding="utf-8")
+        self._file.write("\n".join(self._pending) + "\n")
+        self._file.flush()
+        self._pending = []
+
+    def close(self):
+        """Flush and close the log file (the log can still be written to afterwards)"""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self.filename = None
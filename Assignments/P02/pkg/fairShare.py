@@ -0,0 +1,193 @@
+import collections
+import heapq
+import random
+
+# Algorithms that share the CPU between process classes (class_id)
+FAIR_SHARE_ALGORITHMS = ("Stride", "Lottery")
+
+STRIDE_ONE = 1 << 20  # stride = STRIDE_ONE / share, as in Waldspurger's stride scheduling
+
+
+def parse_shares(text):
+    """
+    Parse a share list from the command line
+    Args:
+        text: "CLASS:SHARE,..." e.g. "A:1,B:3,C:2,D:1"
+    Returns: dict of class_id -> share
+    """
+    shares = {}
+    for part in str(text).split(","):
+        if not part:
+            continue
+        class_id, _, share = part.partition(":")
+        shares[class_id.strip()] = float(share) if share else 1.0
+    return shares
+
+
+class FairShareQueue:
+    """
+    Ready queue that shares the CPU between process classes
+
+    Each class (class_id) has its own FIFO of ready processes and a share.
+    Stride: every CPU tick a class gets advances its "pass" by
+    STRIDE_ONE / share, and the next process comes from the ready class
+    with the lowest pass. Lottery: the next class is drawn at random with
+    probability proportional to its share.
+
+    Stride keeps the passes of ready classes in a heap. Passes change
+    while a class's processes run, so entries go stale; a stale entry is
+    only noticed (and pushed again with the current pass) when it reaches
+    the top, which keeps selection O(log classes).
+
+    Attributes:
+        policy: "Stride" or "Lottery"
+        shares: class_id -> share (classes not listed get default_share)
+        passes: class_id -> current pass (Stride)
+        usage: class_id -> CPU ticks the class has received
+    Methods:
+        append(process) / appendleft(process) / popleft() / remove(process):
+            ready queue interface
+        charge(process): account one CPU tick to the process's class
+        inherit(other, clone, keep_random): continue another queue's state (forks)
+        metrics(): CPU share each class got against its target
+        __len__ / __iter__: size and processes class by class
+    """
+
+    def __init__(self, policy="Stride", shares=None, default_share=1, seed=None):
+        if policy not in FAIR_SHARE_ALGORITHMS:
+            raise ValueError(f"Unknown fair share policy {policy!r}; choose from {FAIR_SHARE_ALGORITHMS}")
+        self.policy = policy
+        self.shares = dict(shares or {})
+        self.default_share = default_share
+        self.passes = {}
+        self.usage = {}
+        self._queues = collections.OrderedDict()  # class_id -> deque of ready processes
+        self._heap = []  # (pass, seq, class_id), may hold stale entries
+        self._seq = 0
+        self._count = 0
+        self._virtual_time = 0  # pass of the last class picked
+        self._random = random.Random(seed)
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        return (p for queue in self._queues.values() for p in queue)
+
+    def share(self, class_id):
+        share = self.shares.get(class_id, self.default_share)
+        if share <= 0:
+            raise ValueError(f"Share for class {class_id!r} must be positive, got {share}")
+        return share
+
+    def _push(self, class_id):
+        heapq.heappush(self._heap, (self.passes[class_id], self._seq, class_id))
+        self._seq += 1
+
+    def append(self, process, front=False):
+        """Queue a process behind (or with front=True, ahead of) the other ready processes of its class"""
+        class_id = process.class_id
+        queue = self._queues.get(class_id)
+        if queue is None:
+            queue = self._queues[class_id] = collections.deque()
+        if not queue:
+            # A class coming back from idle starts at the current pass, so
+            # it can't use the time it was idle to starve everyone else
+            self.passes[class_id] = max(self.passes.get(class_id, 0), self._virtual_time)
+            if self.policy == "Stride":
+                self._push(class_id)
+        if front:
+            queue.appendleft(process)
+        else:
+            queue.append(process)
+        self._count += 1
+
+    def appendleft(self, process):
+        """Queue a process ahead of the other ready processes of its class"""
+        self.append(process, front=True)
+
+    def _pick_class(self):
+        if self.policy == "Lottery":
+            ready = [c for c, q in self._queues.items() if q]
+            weights = [self.share(c) for c in ready]
+            return self._random.choices(ready, weights=weights)[0]
+
+        # Stride: lowest pass among ready classes, skipping stale entries
+        heap = self._heap
+        while True:
+            pass_value, _, class_id = heap[0]
+            if not self._queues[class_id]:
+                heapq.heappop(heap)  # class has nothing ready any more
+            elif pass_value != self.passes[class_id]:
+                heapq.heappop(heap)
+                self._push(class_id)  # pass moved on while it ran
+            else:
+                return class_id
+
+    def popleft(self):
+        """Next process: the oldest ready process of the chosen class"""
+        class_id = self._pick_class()
+        self._virtual_time = self.passes[class_id]
+        self._count -= 1
+        return self._queues[class_id].popleft()
+
+    def remove(self, process):
+        """Take a specific process out of the queue"""
+        self._queues[process.class_id].remove(process)
+        self._count -= 1
+
+    def charge(self, process):
+        """Account one CPU tick to the process's class"""
+        class_id = process.class_id
+        self.usage[class_id] = self.usage.get(class_id, 0) + 1
+        self.passes[class_id] = self.passes.get(class_id, self._virtual_time) + STRIDE_ONE / self.share(class_id)
+
+    def inherit(self, other, clone, keep_random=True):
+        """
+        Continue from another queue (used by Scheduler.fork)
+        Copies the passes, usage and class FIFOs (with cloned processes). For
+        the same policy the Stride heap is copied entry for entry with its
+        tie-break counter, and Lottery takes over the random generator's
+        state, so a fork without overrides picks exactly as the parent would.
+        Args:
+            other: FairShareQueue to continue from
+            clone: function returning the fork's copy of a process
+            keep_random: continue other's random draws (False when the fork has its own seed)
+        """
+        self.passes = dict(other.passes)
+        self.usage = dict(other.usage)
+        self._virtual_time = other._virtual_time
+        self._queues = collections.OrderedDict(
+            (class_id, collections.deque(clone(p) for p in queue))
+            for class_id, queue in other._queues.items()
+        )
+        self._count = len(other)
+        if self.policy == other.policy:
+            self._heap = list(other._heap)
+            self._seq = other._seq
+        elif self.policy == "Stride":
+            for class_id, queue in self._queues.items():
+                if queue:
+                    self._push(class_id)
+        if keep_random:
+            self._random.setstate(other._random.getstate())
+
+    def metrics(self):
+        """
+        CPU share each class received against its target
+        Targets are the shares normalised over the classes that used the CPU.
+        Both policies are work-conserving, so a class that doesn't keep
+        processes ready (e.g. IO-bound) gets less and the others get more.
+        Returns: dict of class_id -> {"share", "target", "actual", "cpu_time"}
+        """
+        total = sum(self.usage.values())
+        weight = sum(self.share(c) for c in self.usage)
+        return {
+            str(class_id): {
+                "share": self.share(class_id),
+                "target": self.share(class_id) / weight if weight else 0.0,
+                "actual": ticks / total if total else 0.0,
+                "cpu_time": ticks,
+            }
+            for class_id, ticks in sorted(self.usage.items(), key=lambda kv: str(kv[0]))
+        }
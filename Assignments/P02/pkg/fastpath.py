@@ -0,0 +1,421 @@
+"""
+Specialized Scheduler.step() for the basic policies
+
+The generic step() asks `self.algorithm == "RR"`, `in ["SRTF", ...]` and so
+on for every CPU on every tick, rebuilds the ready queue deque on every
+insert and scans it with min() on every SJF / SRTF / Priority pick. For the
+six basic policies the fast path replaces all of that:
+
+    FCFS, SJF, Priority        no preemption
+    RR                         quantum preemption
+    SRTF, PriorityPreemptive   preemption by the ready queue's best process
+
+The policy is looked up once, when the Scheduler is built (select()). The
+ready queue stays a deque sorted by the policy's key, with ties in arrival
+order, so an insert is a bisect and the pick is always popleft(). That is
+exactly the process the generic min() finds (the first one with the
+smallest key), so both paths produce the same timeline event for event.
+
+Scheduler.step(), run() and run_until() all go through run() here, which
+keeps the loop state in locals across ticks instead of re-entering the
+Scheduler for every phase of every tick.
+
+Only the common configuration is covered: plain CPUs and IO devices, no
+adaptive quantum, no burst predictor, no profiler. Anything else keeps the
+generic step(), and so does a scheduler that needs placement (affinity,
+soft affinity, NUMA), which can only become known after construction.
+
+Log lines and timeline events go through Scheduler._record as before, but
+only when something keeps them (record=True or a log level that isn't off).
+"""
+import bisect
+
+from pkg.cpu import CPU
+from pkg.eventLog import EVENT_LEVELS
+from pkg.ioDevice import IODevice
+
+INF = float("inf")
+MAX_EVENT_LEVEL = max(EVENT_LEVELS.values())
+
+
+# ---------------------------------------
+# Ready queue sort keys (same values as the generic Scheduler keys)
+# ---------------------------------------
+def arrival_key(p):
+    """FCFS: arrival time"""
+    return p.arrival_time
+
+
+def next_burst_key(p):
+    """SJF: length of the next CPU burst (inf if it isn't a CPU burst)"""
+    head = p._head
+    return head["cpu"] if head and "cpu" in head else INF
+
+
+def remaining_key(p):
+    """SRTF: CPU time left in the current burst (0 if it isn't a CPU burst)"""
+    head = p._head
+    return head["cpu"] if head and "cpu" in head else 0
+
+
+def priority_key(p):
+    """Priority / PriorityPreemptive: lower number = higher priority"""
+    return p.priority
+
+
+def insert(queue, proc, key):
+    """Insert into a ready queue kept sorted by 'key' (None = FIFO), after equal keys"""
+    if key is None:
+        queue.append(proc)
+        return
+    k = key(proc)
+    if not queue or key(queue[-1]) <= k:
+        queue.append(proc)
+    else:
+        queue.insert(bisect.bisect_right(queue, k, key=key), proc)
+
+
+# ---------------------------------------
+# CPU tick, one per kind of policy
+# ---------------------------------------
+def tick_cpus(sched, queue, key, now, log):
+    """FCFS / SJF / Priority: run every busy CPU one tick, no preemption"""
+    cpus = sched.cpus
+    idle = sched._idle_cpus
+    busy = sched._all_cpus & ~idle
+    while busy:  # busy CPUs in cid order
+        bit = busy & -busy
+        busy ^= bit
+        cpu = cpus[bit.bit_length() - 1]
+        if cpu.overhead_remaining > 0:
+            cpu.overhead_remaining -= 1
+            cpu.overhead_time += 1
+            cpu.last_tick_overhead = True
+            continue
+        cpu.last_tick_overhead = False
+        proc = cpu.current
+        burst = proc._head
+        if burst and "cpu" in burst:
+            burst["cpu"] -= 1
+            cpu.busy_time += 1
+            if burst["cpu"] == 0:
+                proc.advance_burst()
+                cpu.current = None
+                idle |= bit
+                cpu_burst_done(sched, queue, key, proc, cpu, now, log)
+    sched._idle_cpus = idle
+
+
+def tick_cpus_quantum(sched, queue, key, now, log):
+    """RR: run every busy CPU one tick and preempt when the quantum runs out"""
+    cpus = sched.cpus
+    idle = sched._idle_cpus
+    busy = sched._all_cpus & ~idle
+    while busy:
+        bit = busy & -busy
+        busy ^= bit
+        cpu = cpus[bit.bit_length() - 1]
+        if cpu.overhead_remaining > 0:
+            # switch overhead doesn't use up the quantum
+            cpu.overhead_remaining -= 1
+            cpu.overhead_time += 1
+            cpu.last_tick_overhead = True
+            continue
+        cpu.last_tick_overhead = False
+        proc = cpu.current
+        burst = proc._head
+        if burst and "cpu" in burst:
+            burst["cpu"] -= 1
+            cpu.busy_time += 1
+            if burst["cpu"] == 0:
+                proc.advance_burst()
+                cpu.current = None
+                idle |= bit
+                cpu_burst_done(sched, queue, key, proc, cpu, now, log)
+                continue
+        proc.remaining_quantum -= 1
+        if proc.remaining_quantum <= 0 and burst and "cpu" in burst and burst["cpu"] > 0:
+            cpu.current = None
+            idle |= bit
+            proc.state = "ready"
+            proc.remaining_quantum = proc.quantum
+            insert(queue, proc, key)
+            if log:
+                sched._record(
+                    f"{proc.pid} quantum expired ({sched.algorithm} preemption)",
+                    event_type="preempted",
+                    proc=proc.pid,
+                    device=f"CPU{cpu.cid}",
+                )
+    sched._idle_cpus = idle
+
+
+def tick_cpus_preemptive(sched, queue, key, now, log):
+    """SRTF / PriorityPreemptive: run every busy CPU one tick, then let a better ready process take it"""
+    cpus = sched.cpus
+    idle = sched._idle_cpus
+    busy = sched._all_cpus & ~idle
+    while busy:
+        bit = busy & -busy
+        busy ^= bit
+        cpu = cpus[bit.bit_length() - 1]
+        proc = cpu.current
+        if cpu.overhead_remaining > 0:
+            # the generic path checks for preemption on overhead ticks too
+            cpu.overhead_remaining -= 1
+            cpu.overhead_time += 1
+            cpu.last_tick_overhead = True
+        else:
+            cpu.last_tick_overhead = False
+            burst = proc._head
+            if burst and "cpu" in burst:
+                burst["cpu"] -= 1
+                cpu.busy_time += 1
+                if burst["cpu"] == 0:
+                    proc.advance_burst()
+                    cpu.current = None
+                    idle |= bit
+                    cpu_burst_done(sched, queue, key, proc, cpu, now, log)
+                    continue
+        if queue:
+            top = queue[0]  # the sorted queue's front is the generic min()
+            if key(top) < key(proc) and (top.affinity is None or top.affinity & bit):
+                cpu.current = None
+                proc.state = "ready"
+                insert(queue, proc, key)
+                cpu.assign(queue.popleft())  # that is 'top'
+                if log:
+                    sched._record(
+                        f"{top.pid} preempts {proc.pid} ({PREEMPT_LABELS[sched.algorithm]})",
+                        event_type="preempted",
+                        proc=proc.pid,
+                        device=f"CPU{cpu.cid}",
+                    )
+    sched._idle_cpus = idle
+
+
+def cpu_burst_done(sched, queue, key, proc, cpu, now, log):
+    """Send a process that finished a CPU burst to IO, the ready queue or the finished list"""
+    next_burst = proc._head
+    if next_burst is None:
+        finish(sched, proc, now, f"CPU{cpu.cid}", log)
+    elif "io" in next_burst:
+        proc.state = "waiting"
+        sched._enqueue_io(proc)
+        if log:
+            sched._record(
+                f"{proc.pid} finished CPU → wait queue",
+                event_type="cpu_to_io",
+                proc=proc.pid,
+                device=f"CPU{cpu.cid}",
+            )
+    elif "cpu" in next_burst:
+        proc.state = "ready"
+        insert(queue, proc, key)
+        if sched._callback:
+            sched._callback(proc.pid, "ready")
+        if log:
+            sched._record(
+                f"{proc.pid} finished CPU → ready queue",
+                event_type="cpu_to_ready",
+                proc=proc.pid,
+                device=f"CPU{cpu.cid}",
+            )
+
+
+def finish(sched, proc, now, device, log):
+    """A process ran out of bursts"""
+    proc.state = "finished"
+    proc.finish_time = now
+    sched.finished.append(proc)
+    sched.deadline_stats.record(proc)
+    if sched._callback:
+        sched._callback(proc.pid, "finished")
+    if log:
+        sched._record(
+            f"{proc.pid} finished all bursts",
+            event_type="finished",
+            proc=proc.pid,
+            device=device,
+        )
+
+
+# algorithm -> (CPU tick, ready queue key)
+POLICIES = {
+    "FCFS": (tick_cpus, arrival_key),
+    "SJF": (tick_cpus, next_burst_key),
+    "Priority": (tick_cpus, priority_key),
+    "RR": (tick_cpus_quantum, None),
+    "SRTF": (tick_cpus_preemptive, remaining_key),
+    "PriorityPreemptive": (tick_cpus_preemptive, priority_key),
+}
+
+# name used in the "preempts" log line
+PREEMPT_LABELS = {"SRTF": "SRTF", "PriorityPreemptive": "Priority"}
+
+
+def select(sched):
+    """
+    The fast path policy for a newly built scheduler
+    Returns: (CPU tick, ready queue key), or None if it needs the generic step()
+    """
+    policy = POLICIES.get(sched.algorithm)
+    if policy is None or sched.quantum_policy or sched.predictor or sched.profiler:
+        return None
+    if any(type(cpu) is not CPU for cpu in sched.cpus):
+        return None
+    if any(type(dev) is not IODevice for dev in sched.io_devices):
+        return None
+    return policy
+
+
+# ---------------------------------------
+# The step
+# ---------------------------------------
+def run(sched, until=None, single=False):
+    """
+    Step a scheduler until its work is done (Scheduler.run) or the clock
+    reaches 'until' (Scheduler.run_until); single=True does exactly one
+    step like Scheduler.step, even with nothing left to do.
+    Stretches where every device is idle and the next process hasn't
+    arrived yet have no events, so the clock jumps over them.
+    """
+    tick, key = sched._fast_policy
+    clock = sched.clock
+    all_cpus = sched._all_cpus
+    future = sched.future_processes
+    # (wait queue, free-device mask, stats) per pool, in pool order
+    pools = [
+        (sched.wait_queues[dtype], mask, sched.io_stats[dtype])
+        for dtype, mask in sched._pool_masks.items()
+    ]
+    log = sched.record or sched.event_log.threshold <= MAX_EVENT_LEVEL
+
+    while True:
+        now = clock.time
+        queue = sched.ready_queue
+        if not single:
+            if until is not None and now >= until:
+                return
+            if not (queue or sched._idle_cpus != all_cpus or sched._busy_ios
+                    or any(pool[0] for pool in pools)):
+                if not future:
+                    return
+                # nothing to run until the next arrival
+                if future[0].arrival_time > now:
+                    now = future[0].arrival_time if until is None else min(future[0].arrival_time, until)
+                    clock.time = now
+                    continue
+
+        # Arrivals: future_processes is sorted by arrival time, so they're a prefix
+        if future and future[0].arrival_time <= now:
+            n = 1
+            while n < len(future) and future[n].arrival_time <= now:
+                n += 1
+            arrived = future[:n]
+            del future[:n]
+            for p in arrived:
+                p.state = "ready"
+                insert(queue, p, key)
+            if log:
+                for p in arrived:
+                    sched._record(
+                        f"{p.pid} arrived (arrival_time={p.arrival_time})",
+                        event_type="arrival",
+                        proc=p.pid,
+                    )
+
+        if sched._idle_cpus != all_cpus:
+            tick(sched, queue, key, now, log)
+        if sched._busy_ios:
+            tick_ios(sched, queue, key, now, log)
+        if sched._idle_cpus and queue:
+            dispatch_cpus(sched, queue, log)
+        for waiting, mask, stats in pools:
+            if waiting and mask & ~sched._busy_ios:
+                dispatch_ios(sched, waiting, mask, stats, now, log)
+
+        clock.time = now + 1
+        if single:
+            return
+
+
+def tick_ios(sched, queue, key, now, log):
+    """Run every busy IO device one tick"""
+    devices = sched.io_devices
+    busy = sched._busy_ios
+    pending = busy
+    while pending:  # busy devices in ID order
+        bit = pending & -pending
+        pending ^= bit
+        dev = devices[bit.bit_length() - 1]
+        proc = dev.current
+        dev.busy_time += 1
+        burst = proc._head
+        if not (burst and "io" in burst):
+            continue
+        io = burst["io"]
+        io["duration"] -= 1
+        if io["duration"]:
+            continue
+        proc.advance_burst()
+        dev.current = None
+        busy &= ~bit
+        if proc._head is None:
+            finish(sched, proc, now, f"IO{dev.did}", log)
+            continue
+        proc.state = "ready"
+        insert(queue, proc, key)
+        if sched._callback:
+            sched._callback(proc.pid, "ready")
+        if log:
+            sched._record(
+                f"{proc.pid} finished I/O → ready queue",
+                event_type="io_to_ready",
+                proc=proc.pid,
+                device=f"IO{dev.did}",
+            )
+    sched._busy_ios = busy
+
+
+def dispatch_cpus(sched, queue, log):
+    """Give idle CPUs (in cid order) the front of the ready queue"""
+    cpus = sched.cpus
+    idle = sched._idle_cpus
+    while idle and queue:
+        bit = idle & -idle
+        idle ^= bit
+        cpu = cpus[bit.bit_length() - 1]
+        proc = queue.popleft()
+        sched._idle_cpus &= ~bit
+        cpu.assign(proc)
+        if log:
+            sched._record(
+                f"{proc.pid} dispatched to CPU{cpu.cid} ({sched.algorithm})",
+                event_type="dispatch_cpu",
+                proc=proc.pid,
+                device=f"CPU{cpu.cid}",
+            )
+
+
+def dispatch_ios(sched, waiting, mask, stats, now, log):
+    """Give a pool's idle IO devices (in ID order) the front of its wait queue"""
+    devices = sched.io_devices
+    free = mask & ~sched._busy_ios
+    while free and waiting:
+        bit = free & -free
+        free ^= bit
+        dev = devices[bit.bit_length() - 1]
+        proc = waiting.popleft()
+        stats["served"] += 1
+        stats["queue_delay"] += now - proc.io_enqueued_at
+        dev.current = proc
+        proc.state = "io"
+        sched._busy_ios |= bit
+        if log:
+            sched._record(
+                f"{proc.pid} dispatched to IO{dev.did}",
+                event_type="dispatch_io",
+                proc=proc.pid,
+                device=f"IO{dev.did}",
+            )
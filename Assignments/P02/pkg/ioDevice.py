@@ -1,3 +1,55 @@
+# Device type that serves each IO burst type. Burst types that are not
+# listed here (or whose device type isn't configured) go to GENERIC_IO.
+IO_ROUTES = {
+    "DISK_READ": "DISK",
+    "DISK_WRITE": "DISK",
+    "KEYBOARD_INPUT": "CONSOLE",
+    "CONSOLE_OUTPUT": "CONSOLE",
+    "SOCKET_READ": "NIC",
+    "SOCKET_WRITE": "NIC",
+    "NETWORK_RECV": "NIC",
+}
+
+
+# Short names accepted by parse_io_config for AsyncIODevice settings
+ASYNC_OPTION_NAMES = {
+    "depth": "queue_depth",
+    "queue_depth": "queue_depth",
+    "slots": "slots",
+    "coalesce": "coalesce",
+    "timeout": "coalesce_timeout",
+    "coalesce_timeout": "coalesce_timeout",
+}
+
+
+def parse_io_config(text):
+    """
+    Parse a device pool description such as "DISK:2,NIC:1,CONSOLE:1"
+    A pool can also be given asynchronous device settings:
+        "NIC:2:depth=32:slots=8:coalesce=4:timeout=2"
+    Args:
+        text: comma separated TYPE:COUNT[:key=value...] entries (COUNT defaults to 1)
+    Returns: dict of device type -> device count, or -> dict of settings
+             ({"count": 2, "queue_depth": 32, ...}) for asynchronous pools
+    """
+    config = {}
+    for item in str(text).split(","):
+        item = item.strip()
+        if not item:
+            continue
+        dtype, *fields = item.split(":")
+        count = int(fields[0]) if fields and "=" not in fields[0] else 1
+        options = {}
+        for field in fields:
+            if "=" in field:
+                key, value = field.split("=", 1)
+                if key not in ASYNC_OPTION_NAMES:
+                    raise ValueError(f"Unknown IO device option {key!r} in {item!r}")
+                options[ASYNC_OPTION_NAMES[key]] = int(value)
+        config[dtype.strip().upper()] = dict(options, count=count) if options else count
+    return config
+
+
 class IODevice:
     """
     Represents an I/O device
@@ -6,10 +58,17 @@ class IODevice:
         dtype: Device type
         clock: reference to the shared Clock instance
         current: currently assigned process or None
+        busy_time: number of ticks spent serving a process
     Methods:
         is_busy(): returns True if the device is busy
+        can_accept(): returns True if the device can take another process
         assign(process): assigns a process to the device
+        take(queue): picks the next process from a wait queue
+        adopt(process, source): continues a process from another device
+        carry_counters(source): adds another device's counters to this one (forks)
         tick(): advances the device by one time unit, returns finished process if any
+        tick_all(): same as tick() but returns a tuple (devices with several requests)
+        outstanding(): processes held by the device with their remaining IO time
         __repr__(): string representation for debugging
     """
 
@@ -19,6 +78,7 @@ class IODevice:
         self.dtype = dtype
         self.clock = clock
         self.current = None
+        self.busy_time = 0
 
     def is_busy(self):
         """Check if the IO device is currently busy"""
@@ -29,10 +89,27 @@ class IODevice:
         self.current = process
         process.state = "io"  # sets the current process state to io
 
+    def can_accept(self):
+        """Check if the device can take another process"""
+        return self.current is None
+
+    def take(self, queue):
+        """Pick the next process for this device from its wait queue (FIFO)"""
+        return queue.popleft()
+
+    def adopt(self, process, source):
+        """Continue serving a process that was on 'source' (used by Scheduler.fork)"""
+        self.current = process
+
+    def carry_counters(self, source):
+        """Add 'source's busy time to this device's"""
+        self.busy_time += source.busy_time
+
     def tick(self):
         """Advance the process on the IO device by one time unit"""
         if not self.current:
             return None
+        self.busy_time += 1
         # Process the current burst
         burst = self.current.current_burst()
         # If it's an I/O burst, decrement its duration
@@ -46,5 +123,19 @@ class IODevice:
                 return finished_proc  # Return the finished process
         return None
 
+    def tick_all(self):
+        """
+        Advance the device by one time unit
+        Returns: processes whose IO burst finished (empty if none)
+        """
+        proc = self.tick()
+        return (proc,) if proc else ()
+
+    def outstanding(self):
+        """[(process, IO time still needed)] for the process on the device"""
+        if not self.current:
+            return []
+        return [(self.current, self.current.current_burst()["io"]["duration"])]
+
     def __repr__(self):
         return f"IO{self.did}: {self.current.pid if self.current else 'idle'}"
@@ -0,0 +1,321 @@
+"""
+Job file loading: parse, validate and cache job_jsons/process_file_XXXX.json
+
+load_jobs() parses a job file once, checks every job against the schema
+while building canonical job dicts in the same pass, and pickles the result
+into a per-user cache directory. The next load of an unchanged file reads
+the pickle and skips JSON parsing and validation altogether.
+
+Unpickling runs code, so the cache never lives next to the (possibly
+shared) job file: it is kept in a directory only the current user can
+write (~/.cache/scheduler-sim, or $SCHEDULER_SIM_CACHE), and load_jobs()
+refuses a directory or cache file that someone else owns or can write.
+A cache entry is used only if its stored SHA-256 matches the job file's
+content. orjson is used for parsing when it's installed, json otherwise.
+
+Canonical job dicts have exactly these keys, with bursts already in the
+form Process keeps them ({"cpu": n} or {"io": {"duration": n, ...}}):
+    pid, bursts, priority, quantum, arrival_time, class_id, deadline,
+    period, affinity
+
+Example:
+    jobs = load_jobs("job_jsons/process_file_0001.json")
+    processes = to_processes(jobs, limit=10)
+"""
+import gc
+import hashlib
+import json
+import os
+import pickle
+
+try:
+    import orjson
+except ImportError:  # optional, only makes parsing faster
+    orjson = None
+
+from pkg.process import Process, affinity_mask
+
+CACHE_VERSION = 2
+CACHE_ENV = "SCHEDULER_SIM_CACHE"
+
+
+class JobFileError(ValueError):
+    """A job file that can't be parsed or doesn't match the job schema"""
+
+
+def cache_dir():
+    """Per-user directory for job file caches"""
+    if os.environ.get(CACHE_ENV):
+        return os.environ[CACHE_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "scheduler-sim")
+
+
+def cache_path(path):
+    """Cache file for a job file (named by a hash of its absolute path)"""
+    name = hashlib.sha256(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(cache_dir(), f"{name}.pickle")
+
+
+def _private(path):
+    """True if 'path' is owned by this user and nobody else can write it"""
+    if not hasattr(os, "getuid"):  # Windows: the profile directory is already per user
+        return True
+    st = os.stat(path)
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def find_job_file(filename):
+    """
+    Resolve a job file name the way main.py accepts it
+    Args:
+        filename: a path, a name inside ./job_jsons, or a file number (e.g. 3)
+    Returns: path of the first candidate that exists, or None
+    """
+    candidates = [
+        filename,
+        f"./job_jsons/{filename}",
+        f"./job_jsons/process_file_{str(filename).zfill(4)}.json",
+        f"process_file_{str(filename).zfill(4)}.json",
+    ]
+    for path in candidates:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def parse_json(raw):
+    """Parse JSON bytes with orjson if available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+# ---- validation ----
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _burst(burst, where, shared):
+    """
+    Canonical copy of one burst, or JobFileError
+    Equal bursts come back as the same dict (from 'shared'): Processes never
+    modify their burst list, and the cache pickles each distinct burst once.
+    """
+    if isinstance(burst, dict) and len(burst) == 1:
+        if "cpu" in burst:
+            length = burst["cpu"]
+            if _is_int(length) and length > 0:
+                key = ("cpu", length)
+                canonical = shared.get(key)
+                if canonical is None:
+                    canonical = shared[key] = {"cpu": length}
+                return canonical
+            raise JobFileError(f"{where}: cpu must be a positive integer, got {length!r}")
+        if "io" in burst:
+            io = burst["io"]
+            if _is_int(io):
+                io = {"duration": io}
+            elif isinstance(io, dict):
+                io = dict(io)
+            else:
+                raise JobFileError(f"{where}: io must be a duration or an object, got {io!r}")
+            duration = io.get("duration")
+            if _is_int(duration) and duration > 0:
+                try:
+                    return shared.setdefault(("io",) + tuple(sorted(io.items())), {"io": io})
+                except TypeError:  # unhashable extra fields, don't share
+                    return {"io": io}
+            raise JobFileError(f"{where}: io duration must be a positive integer, got {duration!r}")
+    raise JobFileError(f"{where}: a burst must be {{\"cpu\": n}} or {{\"io\": ...}}, got {burst!r}")
+
+
+def _job(data, where, shared):
+    """Canonical job dict for one job file entry, or JobFileError"""
+    if not isinstance(data, dict):
+        raise JobFileError(f"{where}: a job must be an object, got {type(data).__name__}")
+    pid = data.get("pid")
+    if not isinstance(pid, (str, int)) or isinstance(pid, bool):
+        raise JobFileError(f"{where}: pid must be a string or integer, got {pid!r}")
+    where = f"{where} (pid {pid!r})"
+
+    bursts = data.get("bursts")
+    if not isinstance(bursts, list) or not bursts:
+        raise JobFileError(f"{where}: bursts must be a non-empty list")
+    bursts = [_burst(b, f"{where}: burst {i}", shared) for i, b in enumerate(bursts)]
+
+    job = {
+        "pid": pid,
+        "bursts": bursts,
+        "priority": data.get("priority", 0),
+        "quantum": data.get("quantum", 4),
+        "arrival_time": data.get("arrival_time", 0),
+        "class_id": data.get("class_id"),
+        "deadline": data.get("deadline"),
+        "period": data.get("period"),
+        "affinity": data.get("affinity"),
+    }
+    if not _is_int(job["priority"]):
+        raise JobFileError(f"{where}: priority must be an integer, got {job['priority']!r}")
+    if not _is_int(job["quantum"]) or job["quantum"] < 1:
+        raise JobFileError(f"{where}: quantum must be a positive integer, got {job['quantum']!r}")
+    if not _is_int(job["arrival_time"]) or job["arrival_time"] < 0:
+        raise JobFileError(f"{where}: arrival_time must be a non-negative integer, got {job['arrival_time']!r}")
+    for name in ("deadline", "period"):
+        value = job[name]
+        if value is not None and (not _is_number(value) or value <= 0):
+            raise JobFileError(f"{where}: {name} must be a positive number, got {value!r}")
+    affinity = job["affinity"]
+    if affinity is not None and not (
+        isinstance(affinity, list) and affinity and all(_is_int(c) and c >= 0 for c in affinity)
+    ):
+        raise JobFileError(f"{where}: affinity must be a non-empty list of CPU ids, got {affinity!r}")
+    return job
+
+
+def check_affinity(jobs, num_cpus, source="job file"):
+    """
+    Check that every job's affinity names at least one of num_cpus CPUs
+    A job that can run nowhere would wait in the ready queue forever.
+    Raises: JobFileError for affinity ids >= num_cpus
+    """
+    for i, job in enumerate(jobs):
+        affinity = job["affinity"]
+        if affinity is not None and max(affinity) >= num_cpus:
+            raise JobFileError(
+                f"{source}: job {i} (pid {job['pid']!r}): affinity {affinity} names CPUs "
+                f"that don't exist (num_cpus={num_cpus})"
+            )
+
+
+def validate_jobs(data, source="job file", num_cpus=None):
+    """
+    Check parsed job file data and build canonical job dicts in one pass
+    Args:
+        data: the parsed JSON (a list of job objects)
+        source: name used in error messages
+        num_cpus: if known, also reject affinity ids >= num_cpus
+    Returns: list of canonical job dicts
+    Raises: JobFileError on the first problem found
+    """
+    if not isinstance(data, list):
+        raise JobFileError(f"{source}: expected a list of jobs, got {type(data).__name__}")
+    jobs = []
+    seen = set()
+    shared = {}  # burst key -> canonical burst dict
+    for i, entry in enumerate(data):
+        job = _job(entry, f"{source}: job {i}", shared)
+        if job["pid"] in seen:
+            raise JobFileError(f"{source}: job {i}: duplicate pid {job['pid']!r}")
+        seen.add(job["pid"])
+        jobs.append(job)
+    if num_cpus is not None:
+        check_affinity(jobs, num_cpus, source)
+    return jobs
+
+
+# ---- cache ----
+def _read_cache(path):
+    """The cached entry for a job file, or None (missing, unreadable or not private)"""
+    target = cache_path(path)
+    try:
+        if not (_private(os.path.dirname(target)) and _private(target)):
+            return None  # someone else could have planted it
+    except OSError:
+        return None
+    # The cache is hundreds of thousands of small dicts; the cyclic GC would
+    # keep rescanning them while they're unpickled
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        with open(target, "rb") as f:
+            cached = pickle.load(f)
+    except Exception:  # a damaged pickle can fail in almost any way (even MemoryError)
+        return None
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if not isinstance(cached, dict) or cached.get("version") != CACHE_VERSION:
+        return None
+    return cached
+
+
+def _write_cache(path, digest, jobs):
+    """Write the cache atomically; a directory we can't use just means no cache"""
+    target = cache_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    cached = {
+        "version": CACHE_VERSION,
+        "sha256": digest,
+        "jobs": jobs,
+    }
+    try:
+        os.makedirs(os.path.dirname(target), mode=0o700, exist_ok=True)
+        if not _private(os.path.dirname(target)):
+            return
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(cached, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except OSError:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+
+
+def load_jobs(path, cache=True, num_cpus=None):
+    """
+    Load and validate a job file, using its binary cache when it's current
+    Args:
+        path: job file (JSON list of jobs)
+        cache: read and write the job file's entry in cache_dir()
+        num_cpus: if known, also reject affinity ids >= num_cpus
+    Returns: list of canonical job dicts (treat as read-only; Processes share their bursts)
+    Raises: OSError if the file can't be read, JobFileError if it's invalid
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cache:
+        cached = _read_cache(path)
+        if cached and cached.get("sha256") == digest:
+            if num_cpus is not None:
+                check_affinity(cached["jobs"], num_cpus, path)
+            return cached["jobs"]
+
+    try:
+        data = parse_json(raw)
+    except ValueError as e:  # json.JSONDecodeError and orjson.JSONDecodeError
+        raise JobFileError(f"{path}: invalid JSON: {e}") from None
+    jobs = validate_jobs(data, path)
+    if cache:
+        _write_cache(path, digest, jobs)  # cached before the CPU check, which depends on the run
+    if num_cpus is not None:
+        check_affinity(jobs, num_cpus, path)
+    return jobs
+
+
+def to_processes(jobs, limit=None):
+    """
+    Build Process objects from canonical job dicts
+    Bursts are already normalized, so this skips the copying Process.from_dict does.
+    """
+    return [
+        Process(
+            pid=job["pid"],
+            bursts=job["bursts"],
+            priority=job["priority"],
+            quantum=job["quantum"],
+            arrival_time=job["arrival_time"],
+            class_id=job["class_id"],
+            deadline=job["deadline"],
+            period=job["period"],
+            affinity=affinity_mask(job["affinity"]),
+        )
+        for job in jobs[:limit]
+    ]
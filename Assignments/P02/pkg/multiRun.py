@@ -0,0 +1,183 @@
+"""
+Many small simulations in one interpreter, interleaved, as one results table
+
+A regression run over hundreds of small traces (like job_jsons/process_file_0001
+to 0007) used to start a process per trace and configuration, paying for
+interpreter startup, imports and JSON parsing each time, for a simulation
+that itself takes milliseconds. run_workloads() does all of them here:
+
+    - every workload is loaded and validated once (pkg.loader) and turned
+      into process templates; each run builds its Processes from them
+      without copying or re-summing the bursts
+    - each run gets its own Clock and no recording (record=False, log off),
+      so the basic policies take the fast path (pkg.fastpath)
+    - runs advance in turns of `slice_ticks` clock ticks, round robin, so
+      a long run doesn't hold up the short ones behind it
+
+Results come back as one table: a dict of column name -> list, one entry
+per (workload, config) run in workload-major order.
+
+Example:
+    table = run_workloads(
+        ["job_jsons/process_file_0001.json", "job_jsons/process_file_0002.json"],
+        [{"algorithm": "RR"}, {"algorithm": "SRTF", "num_cpus": 2}],
+    )
+    print(format_table(table))
+
+From the P02 folder, `python -m pkg.multiRun` runs every shipped job file
+under the six basic policies and prints the table and the time per run.
+"""
+import os
+
+from pkg.clock import Clock
+from pkg.eventLog import EventLog
+from pkg.loader import load_jobs, validate_jobs
+from pkg.process import Process, affinity_mask
+from pkg.scheduler import Scheduler
+
+COLUMNS = ["workload", "config", "algorithm", "cpus", "ios", "time", "finished",
+           "avg_turnaround", "avg_wait", "max_wait", "throughput",
+           "cpu_utilization", "switches", "error"]
+
+# Settings run_workloads owns; a config can't override them
+RESERVED = ("clock", "record", "event_log", "verbose", "profile")
+
+
+def templates(jobs):
+    """
+    Process constructor arguments for canonical jobs, burst totals included
+    Building a Process from these shares the (read-only) burst lists.
+    """
+    result = []
+    for job in jobs:
+        bursts = job["bursts"]
+        result.append({
+            "pid": job["pid"],
+            "bursts": bursts,
+            "priority": job["priority"],
+            "quantum": job["quantum"],
+            "arrival_time": job["arrival_time"],
+            "class_id": job["class_id"],
+            "deadline": job["deadline"],
+            "period": job["period"],
+            "affinity": affinity_mask(job["affinity"]),
+            "totals": (
+                sum(b["cpu"] for b in bursts if "cpu" in b),
+                sum(b["io"]["duration"] for b in bursts if "io" in b),
+            ),
+        })
+    return result
+
+
+def _load(workload, index):
+    """(name, templates) for a job file path or a list of job dicts"""
+    if isinstance(workload, (str, os.PathLike)):
+        return os.path.basename(workload), templates(load_jobs(workload))
+    return f"workload {index}", templates(validate_jobs(workload, f"workload {index}"))
+
+
+def run_workloads(workloads, configs, slice_ticks=1000):
+    """
+    Simulate every workload under every config, interleaved in this process
+    Args:
+        workloads: job file paths and/or lists of job dicts (gen_jobs format)
+        configs: dicts of Scheduler keyword arguments, e.g.
+                 {"algorithm": "SJF", "num_cpus": 2, "num_ios": 1}
+        slice_ticks: clock ticks a run advances before the next one gets a turn
+    Returns: dict of column name (COLUMNS) -> list, one entry per run.
+             A run that fails has its message in "error" and None metrics.
+    Raises: OSError / JobFileError if a workload can't be loaded
+    """
+    if slice_ticks < 1:
+        raise ValueError(f"slice_ticks must be at least 1, got {slice_ticks}")
+    for config in configs:
+        reserved = [key for key in RESERVED if key in config]
+        if reserved:
+            raise ValueError(f"run_workloads sets {reserved} itself; remove them from the config")
+
+    loaded = [_load(workload, i) for i, workload in enumerate(workloads)]
+    silent = EventLog(level="off")  # writes nothing, so every run can share it
+
+    # one slot per run: [workload name, config index, scheduler or None, error]
+    runs = []
+    for name, procs in loaded:
+        for c, config in enumerate(configs):
+            try:
+                sched = Scheduler(clock=Clock(shared=False), record=False, event_log=silent,
+                                  verbose=False, **config)
+                for kwargs in procs:
+                    sched.add_process(Process(**kwargs))
+                runs.append([name, c, sched, None])
+            except Exception as e:  # a bad config fails its own runs only
+                runs.append([name, c, None, f"{type(e).__name__}: {e}"])
+
+    # Round robin over the unfinished runs, slice_ticks at a time
+    active = [run for run in runs if run[2] is not None]
+    while active:
+        still_active = []
+        for run in active:
+            sched = run[2]
+            try:
+                sched.run_until(sched.clock.now() + slice_ticks)
+            except Exception as e:
+                run[3] = f"{type(e).__name__}: {e}"
+                continue
+            if sched.has_work():
+                still_active.append(run)
+        active = still_active
+
+    table = {column: [] for column in COLUMNS}
+    for name, c, sched, error in runs:
+        row = dict.fromkeys(COLUMNS)
+        row.update(workload=name, config=c, error=error)
+        if sched is not None and error is None:
+            m = sched.metrics()
+            for key in ("algorithm", "cpus", "ios", "time", "finished",
+                        "avg_turnaround", "avg_wait", "max_wait", "throughput"):
+                row[key] = m[key]
+            row["cpu_utilization"] = m["cpu"]["utilization"]
+            row["switches"] = m["cpu"]["switches"]
+        elif sched is not None:
+            row["algorithm"] = sched.algorithm
+        for column in COLUMNS:
+            table[column].append(row[column])
+    return table
+
+
+def format_table(table):
+    """The results table as aligned text, one line per run"""
+    widths = {
+        column: max([len(column)] + [len(_cell(v)) for v in table[column]])
+        for column in COLUMNS
+    }
+    lines = ["  ".join(column.rjust(widths[column]) for column in COLUMNS)]
+    lines.append("-" * len(lines[0]))
+    for i in range(len(table["workload"])):
+        lines.append("  ".join(_cell(table[column][i]).rjust(widths[column]) for column in COLUMNS))
+    return "\n".join(lines)
+
+
+def _cell(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+if __name__ == "__main__":
+    import glob
+    import time
+
+    files = sorted(glob.glob("job_jsons/process_file_*.json"))
+    configs = [
+        {"algorithm": algorithm, "num_cpus": cpus, "num_ios": ios}
+        for algorithm in ("FCFS", "SJF", "SRTF", "Priority", "PriorityPreemptive", "RR")
+        for cpus, ios in ((1, 1), (2, 2))
+    ]
+    start = time.perf_counter()
+    results = run_workloads(files, configs)
+    elapsed = time.perf_counter() - start
+    print(format_table(results))
+    count = len(results["workload"])
+    print(f"\n{count} runs in {elapsed:.3f}s ({elapsed / count * 1000:.2f} ms per run)")
@@ -0,0 +1,125 @@
+import abc
+import copy
+
+
+class BurstPredictor(abc.ABC):
+    """
+    Base class for CPU burst length predictors used by SJF / SRTF
+
+    A real scheduler can't read the next burst length out of the job file,
+    so with a predictor SJF and SRTF order the ready queue by an estimate
+    learned from the bursts a process has already run. The estimate for a
+    process lives on the process itself (process.predicted_burst).
+
+    Subclasses implement estimate(predicted, length) to fold a finished burst
+    into the process's next prediction; the base class handles the first
+    guess and keeps the prediction error statistics.
+
+    Attributes:
+        initial: prediction for a process with no history before any burst
+                 has been seen (afterwards the mean of all bursts seen is used)
+        bursts: number of bursts predicted
+        abs_error / error: sum of |predicted - actual| and (predicted - actual)
+    Methods:
+        predict(process): predicted length of the process's current CPU burst
+        observe(process, length): learn from a burst that just finished
+        metrics(): prediction error summary
+        copy(): independent copy (for forked simulations)
+    """
+
+    name = "base"
+
+    def __init__(self, initial=5):
+        self.initial = initial
+        self.bursts = 0
+        self.abs_error = 0
+        self.error = 0
+        self.seen_total = 0  # sum of every burst length observed
+
+    def predict(self, process):
+        """Predicted length of the process's current CPU burst"""
+        if process.predicted_burst is None:
+            return self.seen_total / self.bursts if self.bursts else self.initial
+        return process.predicted_burst
+
+    def observe(self, process, length):
+        """
+        Record the error of the last prediction and update it
+        Args:
+            process: Process whose CPU burst just finished
+            length: total CPU ticks the burst took
+        Returns: None
+        """
+        predicted = self.predict(process)
+        self.bursts += 1
+        self.error += predicted - length
+        self.abs_error += abs(predicted - length)
+        self.seen_total += length
+        process.predicted_burst = self.estimate(predicted, length)
+
+    @abc.abstractmethod
+    def estimate(self, predicted, length):
+        """Next prediction from the last prediction and the actual length"""
+
+    def metrics(self):
+        """
+        Prediction error over every finished CPU burst
+        Returns: dict with "predictor", "bursts", "mean_abs_error",
+                 "mean_error" (positive = overestimates) and "mean_burst"
+        """
+        n = self.bursts
+        return {
+            "predictor": self.name,
+            "bursts": n,
+            "mean_abs_error": self.abs_error / n if n else 0.0,
+            "mean_error": self.error / n if n else 0.0,
+            "mean_burst": self.seen_total / n if n else 0.0,
+        }
+
+    def copy(self):
+        """Independent copy, so a fork keeps learning on its own"""
+        return copy.deepcopy(self)
+
+
+class ExponentialPredictor(BurstPredictor):
+    """
+    Exponential averaging: next = alpha * actual + (1 - alpha) * predicted
+    alpha=1 predicts the last burst again; small alpha trusts history more.
+    """
+
+    name = "ema"
+
+    def __init__(self, alpha=0.5, initial=5):
+        super().__init__(initial)
+        if not 0 <= alpha <= 1:
+            raise ValueError(f"alpha must be between 0 and 1, got {alpha}")
+        self.alpha = alpha
+
+    def estimate(self, predicted, length):
+        return self.alpha * length + (1 - self.alpha) * predicted
+
+    def metrics(self):
+        result = super().metrics()
+        result["alpha"] = self.alpha
+        return result
+
+
+# name -> predictor class, for Scheduler(predictor="ema") and main.py
+PREDICTORS = {
+    "ema": ExponentialPredictor,
+}
+
+
+def make_predictor(predictor, **options):
+    """
+    Build a predictor from a name in PREDICTORS, or pass an instance through
+    Args:
+        predictor: name, BurstPredictor instance or None
+        options: constructor arguments when a name is given (e.g. alpha=0.3)
+    Returns: BurstPredictor or None
+    """
+    if predictor is None or isinstance(predictor, BurstPredictor):
+        return predictor
+    if predictor not in PREDICTORS:
+        raise ValueError(f"Unknown predictor {predictor!r}; choose from {list(PREDICTORS)}")
+    return PREDICTORS[predictor](**options)
@@ -1,59 +1,205 @@
 # ---------------------------------------
+import copy
+
+
+def affinity_mask(cpus):
+    """Bitmask for a list of CPU ids (None stays None = any CPU)"""
+    if cpus is None:
+        return None
+    mask = 0
+    for cid in cpus:
+        mask |= 1 << cid
+    return mask
+
+
 class Process:
     """
     Represents a process with CPU and I/O bursts
     Attributes:
         pid: unique process ID
-        bursts: list of bursts [{"cpu": X}, {"io": {"type": T, "duration": D}}, ...]
+        bursts: list of remaining bursts [{"cpu": X}, {"io": {"type": T, "duration": D}}, ...]
         priority: scheduling priority (0 = highest)
         state: current state ("new", "ready", "running", "waiting", "finished")
+        class_id: user class from the job file (A/B/C/D) or None
+        deadline: relative deadline (ticks after arrival) or None
+        period: release period for rate-monotonic scheduling or None
+        affinity: bitmask of CPUs the process may run on (bit i = CPU i) or None for any
+        total_cpu / total_io: CPU and I/O time the process needs in total
+        finish_time: clock time the process finished (None while running)
     Methods:
         current_burst(): returns the current burst or None if done
         advance_burst(): moves to the next burst
+        previous_burst(): the burst the process last moved past
+        burst_elapsed(): CPU time already spent on the current burst
+        fork(): cheap copy that shares the burst list with this process
+        from_dict(data): build a Process from a job file entry
         __repr__(): string representation for debugging
         __str__(): user-friendly string representation
+
+    The burst list is never modified once the process is built. Only the
+    current burst is copied into a private dict (the "head") that the CPU
+    and IO devices count down, and a cursor marks where we are in the list.
+    This makes fork() copy-on-write: forks share every untouched burst.
     """
 
-    def __init__(self, pid, bursts, priority=0, quantum=4, arrival_time=0):
-        """Initialize process with pid, bursts, and priority"""
+    def __init__(self, pid, bursts, priority=0, quantum=4, arrival_time=0, class_id=None,
+                 deadline=None, period=None, affinity=None, totals=None):
+        """
+        Initialize process with pid, bursts, and priority
+        totals: (total_cpu, total_io) when 'bursts' is an already normalized,
+                read-only sequence (e.g. a SharedTrace burst view); the
+                bursts are then used as they are instead of being copied
+        """
         self.pid = pid
-        self.bursts = bursts[:]  # [{"cpu": X}, {"io": {...}}, ...]
 
-        normalized = []
-        for burst in self.bursts:
-            # If it's an IO burst but incorrectly formatted
-            if "io" in burst and isinstance(burst["io"], int):
-                burst = {"io": {"duration": burst["io"]}}
-            normalized.append(burst)
+        if totals is None:
+            normalized = []
+            for burst in bursts:
+                # If it's an IO burst but incorrectly formatted
+                if "io" in burst and isinstance(burst["io"], int):
+                    burst = {"io": {"duration": burst["io"]}}
+                normalized.append(burst)
+        else:
+            normalized = bursts
 
-        self.bursts = normalized
+        self._bursts = normalized  # shared with forks - never modified
+        self._pos = 0  # index of the current burst in self._bursts
+        self._head = self._copy_burst(normalized[0]) if normalized else None
 
         self.priority = priority
-        self.state = "new"
+        self._registry = None  # ProcessRegistry told about state changes (see pkg.registry)
+        self._state = "new"
         self.quantum = quantum
         self.remaining_quantum = quantum
         self.arrival_time = arrival_time
+        self.class_id = class_id
+        self.deadline = deadline
+        self.period = period
+        self.affinity = affinity
+
+        # Totals are used for wait/turnaround metrics once the process is done
+        if totals is None:
+            self.total_cpu = sum(b["cpu"] for b in normalized if "cpu" in b)
+            self.total_io = sum(b["io"]["duration"] for b in normalized if "io" in b)
+        else:
+            self.total_cpu, self.total_io = totals
+        self.finish_time = None
+        self.io_enqueued_at = None  # time the process last joined an IO wait queue
+        self.last_cpu = None  # cid of the CPU the process last ran on
+        self.last_node = None  # NUMA node of that CPU
+        self.burst_estimate = None  # [ema, deviation] of CPU burst length (see pkg.adaptiveQuantum)
+        self.predicted_burst = None  # SJF/SRTF prediction of the next CPU burst (see pkg.predictor)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Build a Process from a job dict (gen_jobs / job_jsons format)
+        Args:
+            data: dict with "pid", "bursts" and optional "priority",
+                  "quantum", "arrival_time", "class_id", "deadline", "period",
+                  "affinity" (list of CPU ids)
+        Returns: Process instance
+        """
+        bursts = []
+        for b in data["bursts"]:
+            if "cpu" in b:
+                bursts.append({"cpu": b["cpu"]})
+            elif "io" in b:
+                bursts.append(b if isinstance(b["io"], int) else {"io": dict(b["io"])})
+        return cls(
+            pid=data["pid"],
+            bursts=bursts,
+            priority=data.get("priority", 0),
+            quantum=data.get("quantum", 4),
+            arrival_time=data.get("arrival_time", 0),
+            class_id=data.get("class_id"),
+            deadline=data.get("deadline"),
+            period=data.get("period"),
+            affinity=affinity_mask(data.get("affinity")),
+        )
+
+    @staticmethod
+    def _copy_burst(burst):
+        """Return a private copy of a burst that can be counted down"""
+        if "cpu" in burst:
+            return {"cpu": burst["cpu"]}
+        return {"io": dict(burst["io"])}
+
+    @property
+    def bursts(self):
+        """Remaining bursts, starting with the (partially used) current one"""
+        if self._head is None:
+            return []
+        return [self._head] + self._bursts[self._pos + 1:]
+
+    @property
+    def state(self):
+        """Current state ("new", "ready", "running", "waiting", "io", "finished")"""
+        return self._state
+
+    @state.setter
+    def state(self, new):
+        # Keep the scheduler's per-state counts in step
+        if self._registry is not None:
+            self._registry.transition(self._state, new)
+        self._state = new
+
+    @property
+    def absolute_deadline(self):
+        """Clock time the process must finish by (implicit deadline = period), or None"""
+        relative = self.deadline if self.deadline is not None else self.period
+        return None if relative is None else self.arrival_time + relative
+
+    @property
+    def burst_index(self):
+        """Position of the current burst in the process's full burst list"""
+        return self._pos
 
     def remaining_burst_time(self):
         burst = self.current_burst()
         if burst and "cpu" in burst:
             return burst["cpu"]
         return 0
-    
+
     def current_burst(self):
         """Get the current burst"""
-        # Return the first burst if it exists, else None
-        return self.bursts[0] if self.bursts else None
+        # Return the current burst if it exists, else None
+        return self._head
 
     def advance_burst(self):
         """Move to the next burst"""
-        if self.bursts:
-            # Remove the first burst
-            self.bursts.pop(0)
-            # No return needed - modifies in place and current_burst() will reflect change
+        if self._head is not None:
+            # Move the cursor and copy the next burst so it can be counted down
+            self._pos += 1
+            if self._pos < len(self._bursts):
+                self._head = self._copy_burst(self._bursts[self._pos])
+            else:
+                self._head = None
+            # No return needed - current_burst() will reflect change
             self.remaining_quantum = self.quantum
 
-            
+    def burst_elapsed(self):
+        """CPU time already spent on the current burst (0 for IO bursts)"""
+        if self._head is None or "cpu" not in self._head:
+            return 0
+        return self._bursts[self._pos]["cpu"] - self._head["cpu"]
+
+    def previous_burst(self):
+        """The burst the process last moved past (as it was in the job), or None"""
+        return self._bursts[self._pos - 1] if self._pos else None
+
+    def fork(self):
+        """
+        Copy this process for a forked simulation
+        The burst list is shared; only the current burst is copied
+        Returns: new Process instance
+        """
+        clone = copy.copy(self)
+        clone._registry = None  # the fork's scheduler registers it
+        if self._head is not None:
+            clone._head = self._copy_burst(self._head)
+        return clone
+
     def __repr__(self):
         # return self.__str__()
         return f"{self.pid}"
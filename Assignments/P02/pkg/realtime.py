@@ -0,0 +1,138 @@
+import copy
+import heapq
+
+from pkg.profiler import StepProfiler
+
+INF = float("inf")
+
+
+def deadline_key(process):
+    """EDF: earliest absolute deadline first (no deadline = last)"""
+    deadline = process.absolute_deadline
+    return INF if deadline is None else deadline
+
+
+def period_key(process):
+    """Rate-monotonic: shortest period first (no period = last)"""
+    return INF if process.period is None else process.period
+
+
+# algorithm name -> ready queue ordering key
+REALTIME_KEYS = {
+    "EDF": deadline_key,
+    "RM": period_key,
+}
+
+
+class DeadlineQueue:
+    """
+    Ready queue for the real-time policies, kept as a heap
+    Attributes:
+        key: function giving a process's heap key (see REALTIME_KEYS)
+    Methods:
+        append(process): queue a process, O(log n)
+        appendleft(process): queue a process ahead of others with the same key
+        popleft(): process with the smallest key, O(log n)
+        peek(): process with the smallest key without removing it
+        remove(process): take a specific process out
+        __len__ / __iter__: size and processes in key order
+
+    Entries are (key, seq, process); seq keeps ties in arrival order and
+    stops the heap from ever comparing two processes.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._heap = []
+        self._seq = 0
+        self._front_seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __iter__(self):
+        return (entry[2] for entry in sorted(self._heap))
+
+    def append(self, process):
+        """Queue a process by its key"""
+        heapq.heappush(self._heap, (self.key(process), self._seq, process))
+        self._seq += 1
+
+    def appendleft(self, process):
+        """Queue a process ahead of the processes with the same key"""
+        self._front_seq -= 1
+        heapq.heappush(self._heap, (self.key(process), self._front_seq, process))
+
+    def popleft(self):
+        """Remove and return the process with the smallest key"""
+        return heapq.heappop(self._heap)[2]
+
+    def peek(self):
+        """Process with the smallest key (the queue must not be empty)"""
+        return self._heap[0][2]
+
+    def remove(self, process):
+        """Take a specific process out of the queue"""
+        for i, entry in enumerate(self._heap):
+            if entry[2] is process:
+                self._heap[i] = self._heap[-1]
+                self._heap.pop()
+                heapq.heapify(self._heap)
+                return
+        raise ValueError(f"{process} not in ready queue")
+
+
+class DeadlineStats:
+    """
+    Deadline-miss accounting, updated as each job with a deadline finishes
+    Lateness is finish time - absolute deadline (negative = early).
+    Attributes:
+        jobs / missed: jobs with a deadline that finished / that finished late
+        lateness_sum / max_lateness: for the average and worst lateness
+        histogram: lateness of missed jobs, bucketed by powers of two
+    Methods:
+        record(process): account for a finished process
+        metrics(): summary suitable for JSON export
+        copy(): independent copy (for forked simulations)
+    """
+
+    def __init__(self):
+        self.jobs = 0
+        self.missed = 0
+        self.lateness_sum = 0
+        self.max_lateness = None
+        self.histogram = {}
+
+    def record(self, process):
+        """Account for a finished process (ignored if it has no deadline)"""
+        deadline = process.absolute_deadline
+        if deadline is None:
+            return
+        lateness = process.finish_time - deadline
+        self.jobs += 1
+        self.lateness_sum += lateness
+        if self.max_lateness is None or lateness > self.max_lateness:
+            self.max_lateness = lateness
+        if lateness > 0:
+            self.missed += 1
+            bucket = StepProfiler.bucket(lateness)
+            self.histogram[bucket] = self.histogram.get(bucket, 0) + 1
+
+    def metrics(self):
+        """
+        Returns: dict with "jobs", "missed", "miss_rate", "avg_lateness",
+                 "max_lateness" and "lateness_histogram" (missed jobs only)
+        """
+        return {
+            "jobs": self.jobs,
+            "missed": self.missed,
+            "miss_rate": self.missed / self.jobs if self.jobs else 0.0,
+            "avg_lateness": self.lateness_sum / self.jobs if self.jobs else 0.0,
+            "max_lateness": self.max_lateness,
+            "lateness_histogram": dict(
+                sorted(self.histogram.items(), key=lambda kv: int(kv[0].split("-")[0]))
+            ),
+        }
+
+    def copy(self):
+        return copy.deepcopy(self)
@@ -0,0 +1,61 @@
+class ProcessRegistry:
+    """
+    Index of every process a scheduler knows about
+
+    Keeps pid -> Process and a count of processes per state. A registered
+    process reports its own state changes (see Process.state), so lookups
+    and state counts are O(1) instead of rebuilding a dict from every queue.
+
+    Attributes:
+        by_pid: dict of pid -> Process (treat as read-only)
+    Methods:
+        register(process): add a process (replaces one with the same pid)
+        get(pid): Process or None
+        count(state): number of processes in a state
+        counts(): dict of state -> count
+        transition(old, new): called by Process when its state changes
+        __len__ / __contains__ / __iter__: size, pid lookup, processes
+    """
+
+    def __init__(self):
+        self.by_pid = {}
+        self._counts = {}
+
+    def __len__(self):
+        return len(self.by_pid)
+
+    def __contains__(self, pid):
+        return pid in self.by_pid
+
+    def __iter__(self):
+        return iter(self.by_pid.values())
+
+    def register(self, process):
+        """Add a process to the index and start tracking its state"""
+        old = self.by_pid.get(process.pid)
+        if old is process:
+            return
+        if old is not None:
+            old._registry = None
+            self._counts[old.state] -= 1
+        self.by_pid[process.pid] = process
+        process._registry = self
+        self._counts[process.state] = self._counts.get(process.state, 0) + 1
+
+    def get(self, pid):
+        """Process with this pid, or None"""
+        return self.by_pid.get(pid)
+
+    def count(self, state):
+        """Number of registered processes in 'state'"""
+        return self._counts.get(state, 0)
+
+    def counts(self):
+        """Copy of the state -> count table (states with no processes left out)"""
+        return {state: n for state, n in self._counts.items() if n}
+
+    def transition(self, old, new):
+        """Move one process from state 'old' to state 'new'"""
+        counts = self._counts
+        counts[old] -= 1
+        counts[new] = counts.get(new, 0) + 1
@@ -1,6 +1,16 @@
 from pkg.clock import Clock
 from pkg.cpu import CPU
-from pkg.ioDevice import IODevice
+from pkg.ioDevice import IODevice, IO_ROUTES
+from pkg.diskDevice import DiskDevice, DiskQueue
+from pkg.asyncIODevice import AsyncIODevice
+from pkg.profiler import StepProfiler
+from pkg.adaptiveQuantum import AdaptiveQuantum
+from pkg.predictor import make_predictor
+from pkg.realtime import REALTIME_KEYS, DeadlineQueue, DeadlineStats
+from pkg.fairShare import FAIR_SHARE_ALGORITHMS, FairShareQueue
+from pkg.registry import ProcessRegistry
+from pkg.eventLog import EVENT_LEVELS, INFO, EventLog
+from pkg import fastpath
 import collections
 import csv
 import json
@@ -12,45 +22,216 @@ class Scheduler:
 
     Attributes:
         clock: shared Clock instance
-        ready_queue: deque of processes ready for CPU
-        wait_queue: deque of processes waiting for I/O
+        ready_queue: deque of processes ready for CPU (a DeadlineQueue heap for EDF / RM,
+                     a FairShareQueue for Stride / Lottery)
+        wait_queues: dict of device type -> deque of processes waiting for that device type
+        wait_queue: all processes waiting for I/O (read-only view over wait_queues)
         cpus: list of CPU instances
         io_devices: list of IODevice instances
+        io_pools: dict of device type -> list of IODevice instances of that type
         finished: list of completed processes
-        log: human-readable log of events
+        registry: ProcessRegistry, pid -> Process index with per-state counts
+        log: the last lines of the human-readable log (ring buffer of event_log)
+        event_log: EventLog the human-readable lines go to (levels, file, console)
         events: structured log of events for export
-        verbose: if True, print log entries to console
+        verbose: if True, print log entries to console (when no event_log is given)
+        record: if False, events stays empty (no timeline to export)
+        fast_path: if True, step() uses the specialized tick of pkg.fastpath when it applies
+        profiler: StepProfiler timing each phase of step(), or None
+        quantum_policy: AdaptiveQuantum tuning RR quanta, or None for the job file quanta
+        predictor: BurstPredictor SJF/SRTF use instead of the true burst lengths, or None
+        deadline_stats: DeadlineStats for processes that have a deadline
     Methods:
         add_process(process): add a new process to the ready queue
+        processes(): pid -> Process for every process added (from the registry)
+        state_counts(): number of processes per state, O(states)
         step(): advance the scheduler by one time unit
         run(): run the scheduler until all processes are finished
+        run_until(time): run the scheduler up to a given clock time
+        has_work(): True until every process has finished
+        fork(**overrides): copy-on-write copy of the simulation at the current time
+        fork_many(variants): one fork per dict of overrides
+        metrics(): summary statistics for finished processes
+        cpu_metrics(): CPU utilization and context-switch overhead
+        io_metrics(): utilization and queueing delay per IO device type
         timeline(): return the human-readable log as a string
         export_json(filename): export the structured log to a JSON file
-        export_csv(filename): export the structured log to a CSV file"""
+        export_csv(filename): export the structured log to a CSV file
+        export_columnar(filename): export the structured log as a compressed columnar file
+        export_profile(filename): export the step() phase timings to a JSON file"""
 
-    def __init__(self, num_cpus=1, num_ios=1, verbose=True, algorithm="RR"):
-
-        self.clock = Clock()  # shared clock instance for all components Borg pattern
+    def __init__(self, num_cpus=1, num_ios=1, verbose=True, algorithm="RR", clock=None, profile=False,
+                 io_config=None, disk_policy=None, switch_cost=0, migration_penalty=0, dispatch_latency=0,
+                 quantum_policy=None, predictor=None, shares=None, seed=None,
+                 soft_affinity=False, numa_nodes=1, numa_penalty=0, record=True, event_log=None,
+                 fast_path=True):
+        """
+        Args:
+            num_cpus: number of CPUs
+            num_ios: number of GENERIC_IO devices (ignored if io_config is given)
+            verbose: print log entries to console
+            algorithm: scheduling algorithm name (FCFS, SJF, SRTF, Priority,
+                       PriorityPreemptive, RR, EDF, RM, Stride or Lottery)
+            clock: Clock to use (default: the shared Borg clock)
+            profile: time each phase of step() (see pkg.profiler)
+            io_config: dict of device type -> count, e.g. {"DISK": 2, "NIC": 1, "CONSOLE": 1}.
+                       IO bursts are routed to a pool by their type (see IO_ROUTES);
+                       add a "GENERIC_IO" pool to catch types without a pool.
+                       A count can be replaced by a dict of AsyncIODevice settings,
+                       e.g. {"NIC": {"count": 2, "queue_depth": 32, "slots": 8}}
+            disk_policy: if set, the DISK pool uses the seek-time disk model
+                         (see pkg.diskDevice) with this queue policy:
+                         FIFO, SSTF, SCAN, C-SCAN or DEADLINE
+            switch_cost: CPU ticks to switch to a different process
+            migration_penalty: extra CPU ticks (cache warm-up) when a process moves to another CPU
+            dispatch_latency: CPU ticks added to every dispatch
+            quantum_policy: "adaptive" (or an AdaptiveQuantum) to tune each
+                            process's RR quantum from its burst history
+            predictor: "ema" (or a BurstPredictor, see pkg.predictor) to make
+                       SJF / SRTF use predicted burst lengths
+            shares: Stride / Lottery CPU shares per class_id, e.g. {"A": 1, "B": 3}
+                    (classes not listed get a share of 1)
+            seed: random seed for Lottery draws
+            soft_affinity: send a process back to the CPU it last ran on when that CPU is free
+            numa_nodes: split the CPUs into this many equal NUMA nodes (CPU groups)
+            numa_penalty: extra CPU ticks when a process moves to a CPU on another node
+            record: keep the structured events; turn off for headless runs
+                    that only need metrics()
+            event_log: EventLog for the human-readable lines (see pkg.eventLog);
+                       default keeps the last 10000 lines and prints them if verbose
+            fast_path: use the per-policy step of pkg.fastpath for FCFS, SJF, SRTF,
+                       Priority, PriorityPreemptive and RR (same timeline, faster);
+                       False always runs the generic step()
+        """
 
-        # deque (double ended queue) for efficient pops from left
-        self.ready_queue = collections.deque()
+        # shared clock instance for all components Borg pattern,
+        # unless the caller hands us a private one (forks, batch runs)
+        self.clock = clock if clock is not None else Clock()
 
-        # deque (double ended queue) for efficient pops from left
-        self.wait_queue = collections.deque()
+        # deque (double ended queue) for efficient pops from left;
+        # the real-time policies keep a heap on deadline / period instead
+        if algorithm in REALTIME_KEYS:
+            self.ready_queue = DeadlineQueue(REALTIME_KEYS[algorithm])
+        elif algorithm in FAIR_SHARE_ALGORITHMS:
+            # one FIFO per class_id, classes picked by stride pass / lottery
+            self.ready_queue = FairShareQueue(algorithm, shares, seed=seed)
+        else:
+            self.ready_queue = collections.deque()
 
         # uses a list comprehension to create a list of CPU objects
-        self.cpus = [CPU(cid=i, clock=self.clock) for i in range(num_cpus)]
+        # Overhead ticks are CPU time that isn't charged to any process
+        self.cpu_costs = {
+            "switch_cost": switch_cost,
+            "migration_penalty": migration_penalty,
+            "dispatch_latency": dispatch_latency,
+        }
+        self.numa_nodes = max(1, min(numa_nodes, num_cpus)) if num_cpus else 1
+        self.cpu_costs["numa_penalty"] = numa_penalty
+        self.cpus = [
+            CPU(cid=i, clock=self.clock, node=i * self.numa_nodes // num_cpus, **self.cpu_costs)
+            for i in range(num_cpus)
+        ]
+
+        # Placement works on CPU bitmasks: bit i is CPU i
+        self.soft_affinity = soft_affinity
+        self._all_cpus = (1 << num_cpus) - 1
+        self._node_masks = [0] * self.numa_nodes
+        for cpu in self.cpus:
+            self._node_masks[cpu.node] |= cpu.bit
+        # Dispatch goes through _place_processes only when placement matters
+        self._placement = soft_affinity or self.numa_nodes > 1
+        # Idle CPUs as a bitmask, kept up to date as processes come and go, so
+        # ticking, dispatch and the "anything left?" check skip idle units
+        self._idle_cpus = self._all_cpus
 
-        # uses a list comprehension to create a list of IODevice objects
-        self.io_devices = [IODevice(did=i, clock=self.clock) for i in range(num_ios)]
+        # One pool of devices and one FIFO wait queue per device type.
+        # Device IDs are numbered across all pools in config order.
+        self.io_config = dict(io_config) if io_config else {"GENERIC_IO": num_ios}
+        self.io_devices = []
+        self.io_pools = {}
+        self.wait_queues = {}
+        self.io_stats = {}
+        self._async_pools = set()  # device types whose devices take several requests
+        self.disk_policy = disk_policy
+        if disk_policy and "DISK" not in self.io_config:
+            raise ValueError("disk_policy needs a DISK pool in io_config, e.g. {'DISK': 2, 'GENERIC_IO': 1}")
+        for dtype, spec in self.io_config.items():
+            # A pool is either a device count or a dict of AsyncIODevice settings
+            options = dict(spec) if isinstance(spec, dict) else {"count": spec}
+            count = options.pop("count", 1)
+            disk_model = dtype == "DISK" and disk_policy
+            if disk_model and options:
+                raise ValueError("The disk model doesn't support asynchronous DISK pool settings")
+            if disk_model:
+                device_class = DiskDevice
+            elif options:
+                device_class = AsyncIODevice
+            else:
+                device_class = IODevice
+            pool = [
+                device_class(did=len(self.io_devices) + i, clock=self.clock, dtype=dtype, **options)
+                for i in range(count)
+            ]
+            self.io_devices.extend(pool)
+            self.io_pools[dtype] = pool
+            if disk_model:
+                # sorted by block address so the policy can pick around the head
+                self.wait_queues[dtype] = DiskQueue(self.clock, disk_policy)
+            else:
+                # deque (double ended queue) for efficient pops from left
+                self.wait_queues[dtype] = collections.deque()
+            self.io_stats[dtype] = {"served": 0, "queue_delay": 0}
+            if device_class is AsyncIODevice:
+                self._async_pools.add(dtype)
+
+        # Busy IO devices as a bitmask (bit = device ID), plus each pool's mask
+        self._busy_ios = 0
+        self._pool_masks = {
+            dtype: sum(1 << dev.did for dev in pool) for dtype, pool in self.io_pools.items()
+        }
+
+        # IO burst type -> wait queue, so routing a burst is one dict lookup
+        self._default_io_queue = self.wait_queues.get("GENERIC_IO")
+        self._io_routes = {
+            io_type: self.wait_queues[dtype]
+            for io_type, dtype in IO_ROUTES.items()
+            if dtype in self.wait_queues
+        }
 
         self.finished = []  # list of finished processes
-        self.log = []  # human-readable + snapshots
+        # human-readable lines: leveled, buffered, optionally to a file / the console
+        self.event_log = event_log if event_log is not None else EventLog(console=verbose)
+        self.log = self.event_log.lines  # last N lines
         self.events = []  # structured log for export
         self.verbose = verbose  # if True, print log entries to console
+        self.record = record  # if False, _record() keeps no structured events
         self.future_processes = []  # processes that have not yet started
+        self.registry = ProcessRegistry()  # every process added, by pid and by state
         self.algorithm = algorithm
 
+        # Adaptive RR quanta; None keeps the fixed quanta from the job file
+        if quantum_policy == "adaptive":
+            quantum_policy = AdaptiveQuantum()
+        elif quantum_policy is not None and not isinstance(quantum_policy, AdaptiveQuantum):
+            raise ValueError(f"Unknown quantum policy {quantum_policy!r}; use 'adaptive'")
+        self.quantum_policy = quantum_policy
+
+        # SJF / SRTF read the true burst lengths unless given a predictor
+        self.predictor = make_predictor(predictor)
+
+        self.shares = shares
+
+        # Misses and lateness of jobs with deadlines, counted as they finish
+        self.deadline_stats = DeadlineStats()
+
+        # Per-phase timing is opt-in; when off, step() is not wrapped at all
+        self.profiler = StepProfiler().attach(self) if profile else None
+
+        # Specialized tick for the basic policies, picked once here;
+        # None means every step goes through the generic phases below
+        self.fast_path = fast_path
+        self._fast_policy = fastpath.select(self) if fast_path else None
+
     def _insert_into_ready_queue(self, process):
         """Insert a process into ready queue according to algorithm"""
         if self.algorithm == "FCFS":
@@ -67,20 +248,13 @@ class Scheduler:
 
         elif self.algorithm in ["SJF", "SRTF"]:
             # SJF/SRTF: Insert in sorted order by burst/remaining time
-            if self.algorithm == "SJF":
-                burst = process.current_burst()
-                key_value = burst.get("cpu", float('inf')) if burst else float('inf')
-            else:  # SRTF
-                key_value = process.remaining_burst_time()
+            key = self._burst_key if self.algorithm == "SJF" else self._remaining_key
+            key_value = key(process)
 
             # Find position to insert (ascending order)
             pos = 0
             for p in self.ready_queue:
-                if self.algorithm == "SJF":
-                    p_burst = p.current_burst()
-                    p_value = p_burst.get("cpu", float('inf')) if p_burst else float('inf')
-                else:  # SRTF
-                    p_value = p.remaining_burst_time()
+                p_value = key(p)
 
                 if key_value < p_value:
                     break
@@ -102,6 +276,14 @@ class Scheduler:
             temp_list.insert(pos, process)
             self.ready_queue = collections.deque(temp_list)
 
+        elif self.algorithm in REALTIME_KEYS:
+            # EDF / RM: push on the heap keyed by absolute deadline / period
+            self.ready_queue.append(process)
+
+        elif self.algorithm in FAIR_SHARE_ALGORITHMS:
+            # Stride / Lottery: back of its class's FIFO
+            self.ready_queue.append(process)
+
         else:
             # RR and others: append to right (end of queue)
             self.ready_queue.append(process)
@@ -122,10 +304,7 @@ class Scheduler:
                 return None
 
             # Find the process with minimum CPU burst time
-            shortest_proc = min(
-                self.ready_queue,
-                key=lambda p: p.current_burst().get("cpu", float('inf')) if p.current_burst() else float('inf')
-            )
+            shortest_proc = min(self.ready_queue, key=self._burst_key)
             self.ready_queue.remove(shortest_proc)
             return shortest_proc
 
@@ -134,10 +313,7 @@ class Scheduler:
             if not self.ready_queue:
                 return None
 
-            shortest_proc = min(
-                self.ready_queue,
-                key=lambda p: p.remaining_burst_time()
-            )
+            shortest_proc = min(self.ready_queue, key=self._remaining_key)
             self.ready_queue.remove(shortest_proc)
             return shortest_proc
 
@@ -163,10 +339,69 @@ class Scheduler:
             # RR: Simple FIFO, take from front of queue
             return self.ready_queue.popleft()
 
+        elif self.algorithm in REALTIME_KEYS:
+            # EDF / RM: smallest key is at the top of the heap
+            return self.ready_queue.popleft()
+
+        elif self.algorithm in FAIR_SHARE_ALGORITHMS:
+            # Stride / Lottery: the queue picks the class, then its oldest process
+            return self.ready_queue.popleft()
+
         else:
             # Default: FIFO
             return self.ready_queue.popleft()
 
+    def _burst_key(self, process):
+        """SJF key: length of the process's next CPU burst (true or predicted)"""
+        burst = process.current_burst()
+        if not burst or "cpu" not in burst:
+            return float('inf')
+        if self.predictor:
+            return self.predictor.predict(process)
+        return burst["cpu"]
+
+    def _remaining_key(self, process):
+        """SRTF key: CPU time left in the current burst (true or predicted)"""
+        if self.predictor:
+            # A burst running past its prediction is assumed about to finish
+            return max(self.predictor.predict(process) - process.burst_elapsed(), 0)
+        return process.remaining_burst_time()
+
+    @property
+    def wait_queue(self):
+        """All processes waiting for I/O, pool by pool"""
+        if len(self.wait_queues) == 1:
+            return next(iter(self.wait_queues.values()))
+        return [p for queue in self.wait_queues.values() for p in queue]
+
+    def _waiting_count(self):
+        """Number of processes waiting for I/O across all pools"""
+        return sum(len(queue) for queue in self.wait_queues.values())
+
+    def _enqueue_io(self, process, front=False, expire_at=None):
+        """
+        Put a process in the wait queue of the device type its IO burst needs
+        Args:
+            process: Process whose current burst is an IO burst
+            front: put it at the head of the queue instead of the tail
+            expire_at: DEADLINE expiry to keep if it lands in a DiskQueue (forks)
+        Returns: None
+        """
+        io_type = process.current_burst()["io"].get("type")
+        queue = self._io_routes.get(io_type, self._default_io_queue)
+        if queue is None:
+            raise ValueError(
+                f"No IO device for {io_type} bursts (process {process.pid}); "
+                f"configured pools: {list(self.io_config)}"
+            )
+        process.io_enqueued_at = self.clock.now()
+        if expire_at is not None and isinstance(queue, DiskQueue):
+            queue.append(process, expire_at)
+        elif front:
+            queue.appendleft(process)
+        else:
+            queue.append(process)
+
     def on_state_change(self, callback):
         """Register a callback for state changes (e.g., for the View)."""
         self._callback = callback
@@ -177,11 +412,19 @@ class Scheduler:
         Args:
             process: Process instance to add
         Returns: None
+        Raises: ValueError if the process's affinity allows none of the CPUs
         """
+        if process.affinity is not None:
+            process.affinity = self._allowed_cpus(process)
+            self._placement = True
+        self.registry.register(process)
+
         # Identify queue for the process that has arrived
         if process.arrival_time <= self.clock.now():
             # Put process in ready queue if the arrival time has passed
             process.state = "ready"
+            if self.quantum_policy:
+                self.quantum_policy.admit(process)
             self._insert_into_ready_queue(process)
 
             self._record(
@@ -196,17 +439,26 @@ class Scheduler:
             # Sort future processes by arrival time for efficiency
             self.future_processes.sort(key=lambda p: p.arrival_time)
 
+    def _allowed_cpus(self, process):
+        """The process's affinity mask limited to this scheduler's CPUs"""
+        allowed = process.affinity & self._all_cpus
+        if not allowed:
+            cpus = [cid for cid in range(process.affinity.bit_length()) if process.affinity >> cid & 1]
+            raise ValueError(
+                f"Process {process.pid}: affinity {cpus} allows none of the {len(self.cpus)} CPUs"
+            )
+        return allowed
+
     def processes(self):
-        """Return all processes known to the scheduler"""
-        all = (
-                list(self.ready_queue)
-                + list(self.wait_queue)
-                + self.finished
-                + [cpu.current for cpu in self.cpus if cpu.current]
-                + [dev.current for dev in self.io_devices if dev.current]
-        )
-        rdict = {p.pid: p for p in all}
-        return rdict
+        """
+        All processes known to the scheduler
+        Returns: dict of pid -> Process, maintained by the registry (don't modify it)
+        """
+        return self.registry.by_pid
+
+    def state_counts(self):
+        """Number of processes per state, e.g. {"ready": 3, "running": 2, ...}"""
+        return self.registry.counts()
 
     def _record(self, event, event_type="info", proc=None, device=None):
         """
@@ -218,12 +470,14 @@ class Scheduler:
             device: device ID involved in the event (if any)
         Returns: None
         """
-        entry = f"time={self.clock.now():<3} | {event}"
-        self.log.append(entry)
+        # Only format the line if some sink (buffer, file, console) wants it
+        level = EVENT_LEVELS.get(event_type, INFO)
+        if level >= self.event_log.threshold:
+            self.event_log.write(level, f"time={self.clock.now():<3} | {event}")
 
-        # Print to console if verbose
-        if self.verbose:
-            print(entry)
+        # Every event snapshots all queues, which dominates long headless runs
+        if not self.record:
+            return
 
         # structured record for export as JSON/CSV
         self.events.append(
@@ -260,13 +514,27 @@ class Scheduler:
     def step(self):
         """
         Advance the scheduler by one time unit
+        Each phase is a separate method so it can be timed (see pkg.profiler)
         Returns: None
         """
-        # Handle arrivals
+        if self._fast_policy is not None and not self._placement:
+            fastpath.run(self, single=True)
+            return
+        self._handle_arrivals()
+        self._tick_cpus()
+        self._tick_ios()
+        self._dispatch_cpus()
+        self._dispatch_ios()
+        self.clock.tick()
+
+    def _handle_arrivals(self):
+        """Move processes whose arrival time has come into the ready queue"""
         arrivals = []
         for p in self.future_processes[:]:  # Iterate over copy
             if p.arrival_time <= self.clock.now():
                 p.state = "ready"
+                if self.quantum_policy:
+                    self.quantum_policy.admit(p)
                 self._insert_into_ready_queue(p)
                 arrivals.append(p)
                 self.future_processes.remove(p)
@@ -278,12 +546,25 @@ class Scheduler:
                 proc=p.pid
             )
 
-        # CPU Ticks
-        for cpu in self.cpus:
+    def _tick_cpus(self):
+        """Advance every CPU one time unit, handling preemption and burst completion"""
+        fair_share = self.algorithm in FAIR_SHARE_ALGORITHMS
+        cpus = self.cpus
+        busy = self._all_cpus & ~self._idle_cpus
+        while busy:  # busy CPUs in cid order
+            bit = busy & -busy
+            busy ^= bit
+            cpu = cpus[bit.bit_length() - 1]
+            running = cpu.current
             proc = cpu.tick()
 
-            # Quantum handling only for RR algorithm
-            if self.algorithm == "RR" and cpu.current:
+            # Stride / Lottery charge every tick of CPU to the process's class
+            if fair_share and running and not cpu.last_tick_overhead:
+                self.ready_queue.charge(running)
+
+            # Quantum handling for RR (and the fair share policies, which slice like RR)
+            # (ticks spent on switch overhead don't use up the quantum)
+            if (self.algorithm == "RR" or fair_share) and cpu.current and not cpu.last_tick_overhead:
                 cpu.current.remaining_quantum -= 1
                 if cpu.current.remaining_quantum <= 0 and cpu.current.remaining_burst_time() > 0:
                     # Preempt for RR - quantum expired
@@ -293,7 +574,7 @@ class Scheduler:
                     prem_process.remaining_quantum = prem_process.quantum
                     self._insert_into_ready_queue(prem_process)
                     self._record(
-                        f"{prem_process.pid} quantum expired (RR preemption)",
+                        f"{prem_process.pid} quantum expired ({self.algorithm} preemption)",
                         event_type="preempted",
                         proc=prem_process.pid,
                         device=f"CPU{cpu.cid}",
@@ -304,8 +585,9 @@ class Scheduler:
                 current_proc = cpu.current
                 if self.algorithm == "SRTF":
                     # Find process in ready queue with shortest remaining time
-                    shortest_ready = min(self.ready_queue, key=lambda p: p.remaining_burst_time())
-                    if shortest_ready.remaining_burst_time() < current_proc.remaining_burst_time():
+                    shortest_ready = min(self.ready_queue, key=self._remaining_key)
+                    if (self._remaining_key(shortest_ready) < self._remaining_key(current_proc)
+                            and self._allowed(shortest_ready, cpu)):
                         # Preempt current process
                         cpu.current = None
                         current_proc.state = "ready"
@@ -322,7 +604,7 @@ class Scheduler:
                 elif self.algorithm == "PriorityPreemptive":
                     # Find process in ready queue with higher priority (lower number)
                     highest_ready = min(self.ready_queue, key=lambda p: p.priority)
-                    if highest_ready.priority < current_proc.priority:
+                    if highest_ready.priority < current_proc.priority and self._allowed(highest_ready, cpu):
                         # Preempt current process
                         cpu.current = None
                         current_proc.state = "ready"
@@ -337,13 +619,38 @@ class Scheduler:
                             device=f"CPU{cpu.cid}",
                         )
 
+            # Preemption for EDF / RM: the top of the heap beats the running job
+            elif cpu.current and self.ready_queue and self.algorithm in REALTIME_KEYS:
+                current_proc = cpu.current
+                key = self.ready_queue.key
+                top = self.ready_queue.peek()
+                if key(top) < key(current_proc) and self._allowed(top, cpu):
+                    cpu.current = None
+                    current_proc.state = "ready"
+                    self._insert_into_ready_queue(current_proc)
+                    new_proc = self._select_process_for_cpu()
+                    cpu.assign(new_proc)
+                    self._record(
+                        f"{new_proc.pid} preempts {current_proc.pid} ({self.algorithm})",
+                        event_type="preempted",
+                        proc=current_proc.pid,
+                        device=f"CPU{cpu.cid}",
+                    )
+
             # Handle CPU burst completion
             if proc:
+                length = proc.previous_burst()["cpu"]
+                if self.quantum_policy:
+                    self.quantum_policy.observe(proc, length)
+                if self.predictor:
+                    self.predictor.observe(proc, length)
                 next_burst = proc.current_burst()
                 if next_burst is None:
                     # Finished all bursts
                     proc.state = "finished"
+                    proc.finish_time = self.clock.now()
                     self.finished.append(proc)
+                    self.deadline_stats.record(proc)
                     if self._callback:
                         self._callback(proc.pid, "finished")
                     self._record(
@@ -355,7 +662,7 @@ class Scheduler:
                 elif "io" in next_burst:
                     # Moving to I/O
                     proc.state = "waiting"
-                    self.wait_queue.append(proc)
+                    self._enqueue_io(proc)
                     self._record(
                         f"{proc.pid} finished CPU → wait queue",
                         event_type="cpu_to_io",
@@ -375,15 +682,25 @@ class Scheduler:
                         device=f"CPU{cpu.cid}",
                     )
 
-        # Tick IO devices
-        for dev in self.io_devices:
-            proc = dev.tick()
-            if proc:
+            if cpu.current is None:
+                self._idle_cpus |= bit
+
+    def _tick_ios(self):
+        """Advance every busy IO device one time unit, handling burst completion"""
+        devices = self.io_devices
+        busy = self._busy_ios
+        while busy:  # busy devices in ID order
+            bit = busy & -busy
+            busy ^= bit
+            dev = devices[bit.bit_length() - 1]
+            for proc in dev.tick_all():
                 next_burst = proc.current_burst()
                 if next_burst is None:
                     # Finished all bursts
                     proc.state = "finished"
+                    proc.finish_time = self.clock.now()
                     self.finished.append(proc)
+                    self.deadline_stats.record(proc)
                     if self._callback:
                         self._callback(proc.pid, "finished")
                     self._record(
@@ -404,50 +721,416 @@ class Scheduler:
                         proc=proc.pid,
                         device=f"IO{dev.did}",
                     )
+            if not dev.is_busy():
+                self._busy_ios &= ~bit
 
-        # Dispatch to CPUs
-        for cpu in self.cpus:
-            if not cpu.is_busy() and self.ready_queue:
-                proc = self._select_process_for_cpu()
-                cpu.assign(proc)
-                self._record(
-                    f"{proc.pid} dispatched to CPU{cpu.cid} ({self.algorithm})",
-                    event_type="dispatch_cpu",
-                    proc=proc.pid,
-                    device=f"CPU{cpu.cid}",
-                )
+    @staticmethod
+    def _allowed(process, cpu):
+        """True if the process's affinity mask lets it run on 'cpu'"""
+        return process.affinity is None or process.affinity & cpu.bit
 
-        # Dispatch to IO devices
-        for dev in self.io_devices:
-            if not dev.is_busy() and self.wait_queue:
-                proc = self.wait_queue.popleft()
-                dev.assign(proc)
-                self._record(
-                    f"{proc.pid} dispatched to IO{dev.did}",
-                    event_type="dispatch_io",
-                    proc=proc.pid,
-                    device=f"IO{dev.did}",
-                )
+    def _pick_cpu(self, process, allowed):
+        """
+        Choose a CPU for a process from a non-empty bitmask of idle, allowed CPUs
+        Preference: the CPU it last ran on (soft affinity), then a CPU on the
+        same NUMA node, then the lowest numbered CPU.
+        Returns: CPU
+        """
+        last = process.last_cpu
+        if last is not None:
+            if self.soft_affinity and allowed & (1 << last):
+                return self.cpus[last]
+            same_node = allowed & self._node_masks[process.last_node] if process.last_node < self.numa_nodes else 0
+            if same_node:
+                allowed = same_node
+        return self.cpus[(allowed & -allowed).bit_length() - 1]
 
-        if self.verbose:
-            self._snapshot()
-        self.clock.tick()
+    def _place_processes(self):
+        """
+        Dispatch with placement: processes are taken in algorithm order and
+        each goes to the best idle CPU its affinity mask allows. A process
+        with no allowed idle CPU is skipped and keeps its place in the queue.
+        """
+        idle = self._idle_cpus
+        skipped = []
+        while idle and self.ready_queue:
+            proc = self._select_process_for_cpu()
+            allowed = idle & (self._all_cpus if proc.affinity is None else proc.affinity)
+            if not allowed:
+                skipped.append(proc)
+                continue
+            cpu = self._pick_cpu(proc, allowed)
+            idle &= ~cpu.bit
+            self._idle_cpus &= ~cpu.bit
+            cpu.assign(proc)
+            self._record(
+                f"{proc.pid} dispatched to CPU{cpu.cid} ({self.algorithm})",
+                event_type="dispatch_cpu",
+                proc=proc.pid,
+                device=f"CPU{cpu.cid}",
+            )
+        for proc in reversed(skipped):
+            self.ready_queue.appendleft(proc)
+
+    def _dispatch_cpus(self):
+        """Give idle CPUs the next process from the ready queue"""
+        if self._placement:
+            self._place_processes()
+            return
+        idle = self._idle_cpus
+        while idle and self.ready_queue:  # idle CPUs in cid order
+            bit = idle & -idle
+            idle ^= bit
+            cpu = self.cpus[bit.bit_length() - 1]
+            proc = self._select_process_for_cpu()
+            self._idle_cpus &= ~bit
+            cpu.assign(proc)
+            self._record(
+                f"{proc.pid} dispatched to CPU{cpu.cid} ({self.algorithm})",
+                event_type="dispatch_cpu",
+                proc=proc.pid,
+                device=f"CPU{cpu.cid}",
+            )
+
+    def _dispatch_ios(self):
+        """Give idle IO devices the next process from their device type's wait queue"""
+        now = self.clock.now()
+        devices = self.io_devices
+        for dtype, pool in self.io_pools.items():
+            queue = self.wait_queues[dtype]
+            if not queue:
+                continue
+            stats = self.io_stats[dtype]
+            if dtype in self._async_pools:
+                # async devices take requests while busy, up to their queue depth
+                candidates = pool
+            else:
+                # plain devices take one process each: only the idle ones
+                free = self._pool_masks[dtype] & ~self._busy_ios
+                candidates = []
+                while free and len(candidates) < len(queue):
+                    bit = free & -free
+                    free ^= bit
+                    candidates.append(devices[bit.bit_length() - 1])
+            for dev in candidates:
+                if not queue:
+                    break
+                while queue and dev.can_accept():
+                    proc = dev.take(queue)
+                    stats["served"] += 1
+                    stats["queue_delay"] += now - proc.io_enqueued_at
+                    dev.assign(proc)
+                    self._busy_ios |= 1 << dev.did
+                    self._record(
+                        f"{proc.pid} dispatched to IO{dev.did}",
+                        event_type="dispatch_io",
+                        proc=proc.pid,
+                        device=f"IO{dev.did}",
+                    )
+
+    def has_work(self):
+        """
+        True while there are processes in ready/wait queues, processes that
+        have not arrived yet, or any CPU/IO device is busy
+        """
+        return bool(
+            self.ready_queue
+            or self._waiting_count()
+            or self.future_processes
+            or self._idle_cpus != self._all_cpus
+            or self._busy_ios
+        )
 
     def run(self):
         """
         Run the scheduler until all processes are finished
         Returns: None
         """
+        if self._fast_policy is not None and not self._placement:
+            fastpath.run(self)
+            self.event_log.flush()
+            return
 
-        # Continue stepping while there are processes in ready/wait queues
-        # or any CPU/IO device is busy
-        while (
-                self.ready_queue
-                or self.wait_queue
-                or any(cpu.is_busy() for cpu in self.cpus)
-                or any(dev.is_busy() for dev in self.io_devices)
-        ):
+        while self.has_work():
             self.step()
+        self.event_log.flush()
+
+    def run_until(self, time):
+        """
+        Run the scheduler until the clock reaches 'time' or all work is done
+        Returns: None
+        """
+        if self._fast_policy is not None and not self._placement:
+            fastpath.run(self, until=time)
+            self.event_log.flush()
+            return
+        while self.clock.now() < time and self.has_work():
+            self.step()
+        self.event_log.flush()
+
+    # ---- What-if forking ----
+    def fork(self, algorithm=None, num_cpus=None, num_ios=None, quantum=None, verbose=False,
+             io_config=None, disk_policy=None, quantum_policy=None, predictor=None, shares=None, seed=None,
+             soft_affinity=None, numa_nodes=None, **cpu_costs):
+        """
+        Fork the simulation at the current time into an independent copy
+        Processes are forked copy-on-write (see Process.fork), so this is
+        O(number of processes) no matter how many bursts they carry.
+        CPU and IO counters (busy time, switches, requests served, ...) carry
+        over, so a fork without overrides reports the same metrics as the
+        original would.
+        Args:
+            algorithm: scheduling algorithm for the fork (default: same)
+            num_cpus: CPU count for the fork (default: same)
+            num_ios: GENERIC_IO device count for the fork (default: same devices)
+            quantum: if given, overrides every process's RR quantum
+            verbose: print log entries from the fork
+            io_config: device pools for the fork (default: same, or num_ios)
+            disk_policy: disk queue policy for the fork (default: same)
+            quantum_policy: RR quantum policy for the fork (default: a copy of this one)
+            predictor: SJF/SRTF burst predictor for the fork (default: a copy of this one)
+            shares: Stride / Lottery class shares for the fork (default: same)
+            seed: Lottery random seed for the fork
+            soft_affinity / numa_nodes: placement settings for the fork (default: same)
+            cpu_costs: switch_cost / migration_penalty / dispatch_latency / numa_penalty overrides
+        Returns: new Scheduler with its own private clock
+        Raises: ValueError if an unfinished process's affinity allows none of the fork's CPUs
+        """
+        if io_config is None:
+            io_config = {"GENERIC_IO": num_ios} if num_ios is not None else self.io_config
+
+        clock = Clock(shared=False)
+        clock.time = self.clock.now()
+        child = Scheduler(
+            num_cpus=num_cpus if num_cpus is not None else len(self.cpus),
+            verbose=verbose,
+            algorithm=algorithm if algorithm is not None else self.algorithm,
+            clock=clock,
+            io_config=io_config,
+            disk_policy=disk_policy if disk_policy is not None else self.disk_policy,
+            shares=shares if shares is not None else self.shares,
+            soft_affinity=soft_affinity if soft_affinity is not None else self.soft_affinity,
+            numa_nodes=numa_nodes if numa_nodes is not None else self.numa_nodes,
+            seed=seed,
+            record=self.record,
+            fast_path=self.fast_path,
+            quantum_policy=quantum_policy if quantum_policy is not None else (
+                self.quantum_policy.copy() if self.quantum_policy else None
+            ),
+            predictor=predictor if predictor is not None else (
+                self.predictor.copy() if self.predictor else None
+            ),
+            **dict(self.cpu_costs, **cpu_costs),
+        )
+
+        child.deadline_stats = self.deadline_stats.copy()
+
+        # Time and event counters carry over so the fork's metrics cover the
+        # whole run, not just the part after the fork. Counters of a device
+        # the fork doesn't have go to the first device of its kind, which
+        # keeps the totals.
+        for cpu in self.cpus:
+            if child.cpus:
+                child.cpus[cpu.cid if cpu.cid < len(child.cpus) else 0].carry_counters(cpu)
+            if cpu.cid < len(child.cpus):
+                # an idle CPU still knows who ran last (the next dispatch may be no switch)
+                child.cpus[cpu.cid].last_pid = cpu.last_pid
+        for dtype, pool in self.io_pools.items():
+            child_pool = child.io_pools.get(dtype)
+            if not child_pool:
+                continue
+            for i, dev in enumerate(pool):
+                child_pool[i if i < len(child_pool) else 0].carry_counters(dev)
+            child.io_stats[dtype] = dict(self.io_stats[dtype])
+        child._placement = child._placement or self._placement
+
+        def clone(proc):
+            forked = proc.fork()
+            if forked.affinity is not None and forked.state != "finished":
+                # the fork may have fewer CPUs
+                forked.affinity = child._allowed_cpus(forked)
+                child._placement = True
+            child.registry.register(forked)
+            if quantum is not None:
+                forked.quantum = quantum
+                forked.remaining_quantum = min(forked.remaining_quantum, quantum)
+            return forked
+
+        # Running processes keep their CPU if the fork still has it,
+        # otherwise they go back to the ready queue
+        displaced = []
+        for cpu in self.cpus:
+            if cpu.current:
+                if cpu.cid < len(child.cpus):
+                    child.cpus[cpu.cid].adopt(clone(cpu.current), cpu)
+                else:
+                    displaced.append(clone(cpu.current))
+
+        # Ready queue is re-inserted in order so a new algorithm re-sorts it;
+        # a fair share queue carries on from the parent's as it is
+        if isinstance(child.ready_queue, FairShareQueue) and isinstance(self.ready_queue, FairShareQueue):
+            child.ready_queue.inherit(self.ready_queue, clone, keep_random=seed is None)
+        else:
+            for p in self.ready_queue:
+                child._insert_into_ready_queue(clone(p))
+        for p in displaced:
+            p.state = "ready"
+            child._insert_into_ready_queue(p)
+
+        # A process mid-I/O keeps the same slot of the same pool if the fork
+        # has it; otherwise it goes to the front of its wait queue so it
+        # keeps the progress it made. Requests an async device has finished
+        # but not yet delivered wait for their interrupt on the same device,
+        # or complete straight away if the fork has no async device for them.
+        io_displaced = []
+        for dtype, pool in self.io_pools.items():
+            child_pool = child.io_pools.get(dtype, [])
+            for i, dev in enumerate(pool):
+                # idle disks keep their head too, or the next seek starts from 0
+                if i < len(child_pool) and isinstance(dev, DiskDevice) and isinstance(child_pool[i], DiskDevice):
+                    child_pool[i].inherit_head(dev)
+                target = child_pool[i] if i < len(child_pool) else None
+                for proc, remaining in dev.outstanding():
+                    forked = clone(proc)
+                    if remaining == 0 and not (isinstance(target, AsyncIODevice) and target.can_accept()):
+                        forked.advance_burst()
+                        if forked.current_burst() is None:
+                            forked.state = "finished"
+                            forked.finish_time = clock.now()
+                            child.finished.append(forked)
+                            child.deadline_stats.record(forked)
+                        else:
+                            forked.state = "ready"
+                            child._insert_into_ready_queue(forked)
+                        continue
+                    forked.current_burst()["io"]["duration"] = remaining
+                    if target is not None and target.can_accept():
+                        target.adopt(forked, dev)
+                    else:
+                        io_displaced.append(forked)
+        for p in reversed(io_displaced):
+            p.state = "waiting"
+            child._enqueue_io(p, front=True)
+        # Waiting requests keep their arrival order, queueing time and
+        # DEADLINE expiry
+        for queue in self.wait_queues.values():
+            requests = queue.requests() if isinstance(queue, DiskQueue) else [(p, None) for p in queue]
+            for p, expire_at in requests:
+                forked = clone(p)
+                child._enqueue_io(forked, expire_at=expire_at)
+                forked.io_enqueued_at = p.io_enqueued_at
+
+        child.future_processes = [clone(p) for p in self.future_processes]
+        child._sync_busy_masks()
+        child.finished = [clone(p) for p in self.finished] + child.finished
+        return child
+
+    def _sync_busy_masks(self):
+        """Rebuild the idle CPU / busy device bitmasks from the devices themselves"""
+        self._idle_cpus = 0
+        for cpu in self.cpus:
+            if not cpu.is_busy():
+                self._idle_cpus |= cpu.bit
+        self._busy_ios = 0
+        for dev in self.io_devices:
+            if dev.is_busy():
+                self._busy_ios |= 1 << dev.did
+
+    def fork_many(self, variants):
+        """
+        Fork the simulation once per variant
+        Args:
+            variants: list of dicts of fork() keyword arguments
+        Returns: list of Scheduler instances
+        """
+        return [self.fork(**variant) for variant in variants]
+
+    # ---- Metrics ----
+    def metrics(self):
+        """
+        Summary statistics for the processes that have finished
+        Wait time is everything that wasn't CPU or I/O service time
+        (ready queue + wait queue time).
+        Returns: dict of metrics
+        """
+        now = self.clock.now()
+        done = self.finished
+        turnaround = [p.finish_time - p.arrival_time for p in done]
+        waiting = [t - p.total_cpu - p.total_io for t, p in zip(turnaround, done)]
+        count = len(done)
+        result = {
+            "algorithm": self.algorithm,
+            "cpus": len(self.cpus),
+            "ios": len(self.io_devices),
+            "time": now,
+            "finished": count,
+            "avg_turnaround": sum(turnaround) / count if count else 0.0,
+            "avg_wait": sum(waiting) / count if count else 0.0,
+            "max_wait": max(waiting) if waiting else 0,
+            "throughput": count / now if now else 0.0,
+        }
+        result["cpu"] = self.cpu_metrics()
+        result["io"] = self.io_metrics()
+        if self.quantum_policy:
+            result["quantum"] = self.quantum_policy.metrics()
+        if self.predictor:
+            result["prediction"] = self.predictor.metrics()
+        if self.deadline_stats.jobs:
+            result["deadlines"] = self.deadline_stats.metrics()
+        if isinstance(self.ready_queue, FairShareQueue):
+            result["fair_share"] = self.ready_queue.metrics()
+        if self.profiler:
+            result["profile"] = self.profiler.to_dict()
+        return result
+
+    def cpu_metrics(self):
+        """
+        CPU time split into useful work and overhead
+        Returns: dict with utilization (time running bursts), overhead time
+                 and share, context switches, migrations and cross-node migrations
+        """
+        capacity = len(self.cpus) * self.clock.now()
+        busy = sum(cpu.busy_time for cpu in self.cpus)
+        overhead = sum(cpu.overhead_time for cpu in self.cpus)
+        return {
+            "utilization": busy / capacity if capacity else 0.0,
+            "overhead_time": overhead,
+            "overhead_share": overhead / capacity if capacity else 0.0,
+            "switches": sum(cpu.switches for cpu in self.cpus),
+            "migrations": sum(cpu.migrations for cpu in self.cpus),
+            "node_migrations": sum(cpu.node_migrations for cpu in self.cpus),
+        }
+
+    def io_metrics(self):
+        """
+        Per device type IO statistics
+        Returns: dict of device type -> {"devices", "served", "utilization",
+                 "avg_queue_delay", "queued"}
+        """
+        now = self.clock.now()
+        report = {}
+        for dtype, pool in self.io_pools.items():
+            stats = self.io_stats[dtype]
+            busy = sum(dev.busy_time for dev in pool)
+            report[dtype] = {
+                "devices": len(pool),
+                "served": stats["served"],
+                "utilization": busy / (len(pool) * now) if pool and now else 0.0,
+                "avg_queue_delay": stats["queue_delay"] / stats["served"] if stats["served"] else 0.0,
+                "queued": len(self.wait_queues[dtype]),
+            }
+            if pool and isinstance(pool[0], AsyncIODevice):
+                report[dtype]["queue_depth"] = pool[0].queue_depth
+                report[dtype]["slots"] = pool[0].slots
+                report[dtype]["avg_in_flight"] = sum(dev.slot_time for dev in pool) / (len(pool) * now) if now else 0.0
+                report[dtype]["interrupts"] = sum(dev.interrupts for dev in pool)
+            if pool and isinstance(pool[0], DiskDevice):
+                report[dtype]["policy"] = self.wait_queues[dtype].policy
+                report[dtype]["avg_seek_distance"] = (
+                    sum(dev.seek_distance for dev in pool) / stats["served"] if stats["served"] else 0.0
+                )
+                report[dtype]["seek_time"] = sum(dev.seek_time for dev in pool)
+        return report
 
     def timeline(self):
         """Return the human-readable log as a single string"""
@@ -455,11 +1138,27 @@ class Scheduler:
 
     # ---- Exporters ----
     def export_json(self, filename="timeline.json"):
-        """Export the timeline to a JSON file"""
+        """
+        Export the timeline to a JSON file
+        If profiling is on, the phase timings go next to it in
+        <name>.profile.json
+        """
         with open(filename, "w") as f:
             json.dump(self.events, f, indent=2)
         if self.verbose:
             print(f"✅ Timeline exported to {filename}")
+        if self.profiler:
+            base = filename[:-5] if filename.endswith(".json") else filename
+            self.export_profile(f"{base}.profile.json")
+
+    def export_profile(self, filename="timeline.profile.json"):
+        """Export the step() phase timings to a JSON file"""
+        if not self.profiler:
+            return
+        with open(filename, "w") as f:
+            json.dump(self.profiler.to_dict(), f, indent=2)
+        if self.verbose:
+            print(f"✅ Profile exported to {filename}")
 
     def export_csv(self, filename="timeline.csv"):
         """Export the timeline to a CSV file"""
@@ -480,6 +1179,17 @@ class Scheduler:
         if self.verbose:
             print(f"✅ Timeline exported to {filename}")
 
+    def export_columnar(self, filename="timeline.tlc", codec="zlib", chunk_size=65536):
+        """
+        Export the timeline as compressed columns (see pkg.timelineStore)
+        Read it back with pkg.timelineStore.ColumnarTimeline.
+        """
+        from pkg.timelineStore import export_columnar  # only loaded when used
+
+        export_columnar(self.events, filename, codec=codec, chunk_size=chunk_size)
+        if self.verbose:
+            print(f"✅ Timeline exported to {filename}")
+
     def snapshot(self):
         return {
             "ready": [{"pid": p.pid} for p in self.ready_queue],
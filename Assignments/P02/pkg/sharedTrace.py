@@ -0,0 +1,291 @@
+"""
+Job traces in shared memory, read by many worker processes at once
+
+A sweep that runs the same trace under 32 settings in 32 workers would
+otherwise hold 32 parsed copies of every job and burst. SharedTrace packs a
+trace into one multiprocessing.shared_memory block of flat arrays:
+
+    process table   burst offsets, arrival_time, priority, quantum,
+                    deadline, period, total CPU / IO time
+    bursts          length (CPU ticks or IO duration), IO type code, block
+
+Strings (pids, class ids, IO types) and CPU affinity lists go into a small
+JSON header; affinity is a list of CPU ids of any size, so it doesn't fit a
+fixed-width array. Workers
+attach read-only and build Processes whose burst list is a BurstView over
+the arrays: Process only ever copies its current burst (the "head") to
+count it down, so each worker owns nothing per burst except the cursor and
+that one head (see Process).
+
+Layout:
+    b"STR3" | header length (4 bytes) | JSON header | padding to 8 | arrays
+
+Example:
+    trace = SharedTrace.create(load_jobs("job_jsons/process_file_0001.json"))
+    # in a worker:
+    view = SharedTrace.attach(trace.name)
+    for p in view.processes():
+        sched.add_process(p)
+    view.close()
+    # when every worker is done:
+    trace.close(); trace.unlink()
+"""
+import json
+import math
+import struct
+from multiprocessing import shared_memory
+
+from pkg.process import Process, affinity_mask
+
+MAGIC = b"STR3"
+_PREFIX = struct.Struct("<4sI")
+
+# (name, typecode) of every array, process table first, then bursts
+PROCESS_ARRAYS = (("start", "q"), ("arrival_time", "q"), ("priority", "q"), ("quantum", "q"),
+                  ("total_cpu", "q"), ("total_io", "q"), ("deadline", "d"), ("period", "d"))
+BURST_ARRAYS = (("length", "q"), ("io_type", "q"), ("block", "q"))
+
+CPU = -1  # io_type code of a CPU burst
+NONE = -1  # block: not set
+
+
+def attach_shared_memory(name):
+    """
+    Attach to an existing shared memory block without taking ownership
+    Before Python 3.13 attaching also registers the block with the resource
+    tracker, which would then unlink it when this process exits.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        from multiprocessing import resource_tracker
+
+        block = shared_memory.SharedMemory(name=name)
+        resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+
+class BurstView:
+    """
+    Read-only burst list of one process, decoded from the shared arrays on access
+    Supports len(), indexing and slicing like the list Process normally keeps.
+    """
+
+    __slots__ = ("_trace", "_start", "_end")
+
+    def __init__(self, trace, start, end):
+        self._trace = trace
+        self._start = start
+        self._end = end
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("burst index out of range")
+        return self._trace.burst(self._start + index)
+
+    def __iter__(self):
+        return (self._trace.burst(i) for i in range(self._start, self._end))
+
+    def __reduce__(self):
+        # pickled (e.g. a fork sent to a spawn worker) as a plain list
+        return list, (list(self),)
+
+
+class SharedTrace:
+    """
+    A trace packed into shared memory
+    Attributes:
+        name: shared memory block name (what workers attach with)
+        nbytes: size of the block
+        pids / class_ids / io_types: decoded string columns
+    Methods:
+        create(jobs): pack canonical job dicts (pkg.loader) into a new block
+        attach(name): read-only view of an existing block
+        processes(limit): fresh Process objects reading bursts from the block
+        burst(i): one burst as a dict, in the form Process keeps them
+        close() / unlink(): detach / free the block (unlink once, by the creator)
+        __len__: number of processes
+    """
+
+    def __init__(self, block, owner):
+        self._block = block
+        self.owner = owner
+        self.name = block.name
+        self.nbytes = block.size
+
+        magic, header_size = _PREFIX.unpack_from(block.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory block {block.name} doesn't hold a trace")
+        offset = _PREFIX.size
+        header = json.loads(bytes(block.buf[offset:offset + header_size]))
+        self.pids = header["pids"]
+        self.class_ids = header["class_ids"]
+        self.io_types = header["io_types"]
+        self._affinity = [affinity_mask(cpus) for cpus in header["affinity"]]
+        self._floats = {name: set(jobs) for name, jobs in header["floats"].items()}  # the rest were ints
+
+        buf = block.buf if owner else block.buf.toreadonly()
+        self._views = []  # every memoryview taken from the block, released by close()
+        self._arrays = {}
+        offset = _aligned(offset + header_size)
+        counts = {"process": len(self.pids), "burst": header["bursts"]}
+        for group, arrays in (("process", PROCESS_ARRAYS), ("burst", BURST_ARRAYS)):
+            for name, typecode in arrays:
+                n = counts[group] + (1 if name == "start" else 0)
+                view = buf[offset:offset + 8 * n].cast(typecode)
+                self._views.append(view)
+                self._arrays[name] = view
+                offset += 8 * n
+        self._buf = buf
+
+    def __len__(self):
+        return len(self.pids)
+
+    @classmethod
+    def create(cls, jobs):
+        """
+        Pack canonical job dicts into a new shared memory block
+        Args:
+            jobs: list of dicts as returned by pkg.loader.load_jobs
+        Returns: SharedTrace that owns the block
+        """
+        columns = {name: [] for name, _ in PROCESS_ARRAYS + BURST_ARRAYS}
+        affinity = []
+        io_codes = {}
+        floats = {"deadline": [], "period": []}  # jobs whose value is a float, not an int
+        start = 0
+        for i, job in enumerate(jobs):
+            columns["start"].append(start)
+            total_cpu = total_io = 0
+            for burst in job["bursts"]:
+                if "cpu" in burst:
+                    columns["length"].append(burst["cpu"])
+                    columns["io_type"].append(CPU)
+                    columns["block"].append(NONE)
+                    total_cpu += burst["cpu"]
+                    continue
+                io = burst["io"]
+                if isinstance(io, int):
+                    io = {"duration": io}
+                extra = set(io) - {"type", "duration", "block"}
+                if extra:
+                    raise ValueError(f"pid {job['pid']}: SharedTrace can't store IO fields {sorted(extra)}")
+                io_type = io.get("type")
+                columns["length"].append(io["duration"])
+                columns["io_type"].append(io_codes.setdefault(io_type, len(io_codes)))
+                columns["block"].append(io.get("block", NONE))
+                total_io += io["duration"]
+            start += len(job["bursts"])
+            columns["arrival_time"].append(job.get("arrival_time", 0))
+            columns["priority"].append(job.get("priority", 0))
+            columns["quantum"].append(job.get("quantum", 4))
+            cpus = job.get("affinity")
+            affinity.append(None if cpus is None else sorted(set(cpus)))
+            columns["total_cpu"].append(total_cpu)
+            columns["total_io"].append(total_io)
+            for name in ("deadline", "period"):
+                value = job.get(name)
+                if value is not None and not isinstance(value, int):
+                    floats[name].append(i)
+                columns[name].append(math.nan if value is None else value)
+        columns["start"].append(start)
+
+        header = json.dumps({
+            "pids": [job["pid"] for job in jobs],
+            "class_ids": [job.get("class_id") for job in jobs],
+            "io_types": list(io_codes),
+            "affinity": affinity,
+            "bursts": start,
+            "floats": floats,
+        }).encode()
+        offset = _aligned(_PREFIX.size + len(header))
+        size = offset + 8 * sum(len(values) for values in columns.values())
+        block = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            _PREFIX.pack_into(block.buf, 0, MAGIC, len(header))
+            block.buf[_PREFIX.size:_PREFIX.size + len(header)] = header
+            for name, typecode in PROCESS_ARRAYS + BURST_ARRAYS:
+                n = len(columns[name])
+                struct.pack_into(f"={n}{typecode}", block.buf, offset, *columns[name])
+                offset += 8 * n
+            return cls(block, owner=True)
+        except BaseException:
+            # e.g. a value that doesn't fit 64 bits; don't leak the block
+            block.close()
+            block.unlink()
+            raise
+
+    @classmethod
+    def attach(cls, name):
+        """Read-only view of a trace another process created"""
+        return cls(attach_shared_memory(name), owner=False)
+
+    def burst(self, i):
+        """Burst i of the whole trace as a fresh dict"""
+        arrays = self._arrays
+        code = arrays["io_type"][i]
+        if code == CPU:
+            return {"cpu": arrays["length"][i]}
+        io = {}
+        io_type = self.io_types[code]
+        if io_type is not None:
+            io["type"] = io_type
+        io["duration"] = arrays["length"][i]
+        block = arrays["block"][i]
+        if block != NONE:
+            io["block"] = block
+        return {"io": io}
+
+    def _optional(self, name, i):
+        value = self._arrays[name][i]
+        if math.isnan(value):
+            return None
+        return value if i in self._floats[name] else int(value)
+
+    def process(self, i):
+        """Process i, with a BurstView as its (shared, read-only) burst list"""
+        a = self._arrays
+        return Process(
+            pid=self.pids[i],
+            bursts=BurstView(self, a["start"][i], a["start"][i + 1]),
+            priority=a["priority"][i],
+            quantum=a["quantum"][i],
+            arrival_time=a["arrival_time"][i],
+            class_id=self.class_ids[i],
+            deadline=self._optional("deadline", i),
+            period=self._optional("period", i),
+            affinity=self._affinity[i],
+            totals=(a["total_cpu"][i], a["total_io"][i]),
+        )
+
+    def processes(self, limit=None):
+        """Fresh Process objects for the first 'limit' jobs (default: all)"""
+        return [self.process(i) for i in range(len(self) if limit is None else min(limit, len(self)))]
+
+    def close(self):
+        """
+        Detach from the block
+        Processes built from this trace must be gone first: their burst
+        views read straight from the block.
+        """
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._buf is not self._block.buf:
+            self._buf.release()
+        self._block.close()
+
+    def unlink(self):
+        """Free the block (call once, from the process that created it)"""
+        self._block.unlink()
+
+
+def _aligned(offset):
+    return (offset + 7) & ~7
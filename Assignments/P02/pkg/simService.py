@@ -0,0 +1,452 @@
+"""
+Long-lived simulation service: a worker pool behind a local socket
+
+Running many small simulations as separate `python main.py headless=true`
+processes pays interpreter startup, imports and job file parsing every time.
+The service keeps a multiprocessing.Pool of warm workers and a cache of
+parsed traces, so a request only costs the simulation itself.
+
+Traces are parsed once (pkg.loader, validated) in the service process and
+published to shared memory as a SharedTrace (flat burst arrays plus a process
+table, see pkg.sharedTrace). Workers attach read-only and keep only their own
+per-process cursors, so a trace costs about one copy of memory however many
+workers read it. A trace file is republished when its mtime or size changes;
+the old block is freed once the requests already queued for it are done.
+Generated traces are cached by their parameters (the MAX_GENERATED most
+recently used); a generate request without a seed gets a fresh trace.
+
+A request is a dict:
+    trace       job file path, or
+    generate    {"workload": "standard", "n": 100, "seed": 1, "arrival_spacing": None}
+    algorithm, cpus, ios
+    options     any other Scheduler keyword arguments, e.g. {"quantum_policy": "adaptive"}
+and its result is Scheduler.metrics().
+
+Run the service (from the P02 folder, key=value arguments like main.py):
+    python -m pkg.simService host=127.0.0.1 port=6010 workers=4
+
+Every message the service receives is unpickled, so the connection key is
+what stands between a local user and running code as the service user.
+There is no built-in key: serve() takes one from SIM_SERVICE_AUTHKEY (hex)
+or generates a random one and writes it to a file only the owner can read
+(~/.scheduler-sim.key by default), where SimulationClient finds it.
+
+Use it:
+    with SimulationClient() as client:
+        client.run(trace="job_jsons/process_file_0001.json", algorithm="SRTF", cpus=2)
+        client.map([{"trace": ..., "algorithm": a} for a in ("RR", "FCFS", "SJF")])
+
+Or without the socket, in-process:
+    with SimulationService(workers=4) as service:
+        service.map(requests)
+"""
+import collections
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+
+from pkg.clock import Clock
+from pkg.loader import load_jobs, to_processes, validate_jobs
+from pkg.scheduler import Scheduler
+from pkg.sharedTrace import SharedTrace
+
+DEFAULT_ADDRESS = ("127.0.0.1", 6010)
+AUTHKEY_ENV = "SIM_SERVICE_AUTHKEY"  # hex encoded key
+DEFAULT_KEY_FILE = os.path.join(os.path.expanduser("~"), ".scheduler-sim.key")
+MIN_AUTHKEY_BYTES = 16
+
+MAX_WORKER_TRACES = 16  # traces a worker keeps attached
+MAX_GENERATED = 8  # generated traces the service keeps published
+
+
+# ---------------------------------------
+# Worker side
+# ---------------------------------------
+_TRACES = {}  # shared memory name -> attached SharedTrace, per worker process
+
+
+def _worker_trace(name):
+    """A published trace, attached once per worker"""
+    trace = _TRACES.get(name)
+    if trace is None:
+        if len(_TRACES) >= MAX_WORKER_TRACES:
+            old = _TRACES.pop(next(iter(_TRACES)))  # oldest first
+            try:
+                old.close()
+            except BufferError:
+                pass  # still referenced; the mapping goes when the last view does
+        trace = _TRACES[name] = SharedTrace.attach(name)
+    return trace
+
+
+def simulate(jobs, request):
+    """
+    Run one simulation headless
+    Args:
+        jobs: a SharedTrace, or canonical job dicts (see pkg.loader)
+        request: dict with "algorithm", "cpus", "ios" and optional "options"
+    Returns: Scheduler.metrics()
+    """
+    sched = Scheduler(
+        num_cpus=request.get("cpus", 1),
+        num_ios=request.get("ios", 1),
+        algorithm=request.get("algorithm", "RR"),
+        verbose=False,
+        record=False,
+        clock=Clock(shared=False),
+        **request.get("options", {}),
+    )
+    processes = jobs.processes() if isinstance(jobs, SharedTrace) else to_processes(jobs)
+    for p in processes:
+        sched.add_process(p)
+    sched.run()
+    return sched.metrics()
+
+
+def _run(name, request):
+    """Pool entry point: ("ok", metrics) or ("error", message)"""
+    try:
+        return "ok", simulate(_worker_trace(name), request)
+    except Exception as e:  # reported to the client, the worker keeps serving
+        return "error", f"{type(e).__name__}: {e}"
+
+
+# ---------------------------------------
+# Service side
+# ---------------------------------------
+class TraceCache:
+    """
+    Parsed traces published to shared memory
+    Every ref() counts as a request in flight on that block until release().
+    A block that is replaced (trace file changed), evicted (generated traces
+    past MAX_GENERATED) or never cached (unseeded generate) is retired and
+    unlinked when its last request is released, so queued requests never
+    find their trace gone.
+    Attributes:
+        entries: key -> (stamp, SharedTrace), least recently used first
+        retired: shared memory name -> SharedTrace still in use
+    Methods:
+        ref(request): publish if needed, take a reference and return the block name
+        release(name): drop a reference taken by ref()
+        close(): unlink every block
+    """
+
+    def __init__(self, max_generated=MAX_GENERATED):
+        self.max_generated = max_generated
+        self.entries = collections.OrderedDict()
+        self.retired = {}
+        self._in_flight = collections.Counter()  # shared memory name -> references
+        self._lock = threading.Lock()
+
+    def _retire(self, trace):
+        if self._in_flight[trace.name]:
+            self.retired[trace.name] = trace
+        else:
+            # workers still attached keep their mapping until they drop it
+            trace.close()
+            trace.unlink()
+
+    def _publish(self, key, stamp, jobs):
+        trace = SharedTrace.create(jobs)
+        old = self.entries.pop(key, None)
+        self.entries[key] = (stamp, trace)
+        if old is not None:
+            self._retire(old[1])
+        return trace
+
+    def _evict_generated(self):
+        generated = [key for key in self.entries if key[0] == "generate"]
+        for key in generated[:max(0, len(generated) - self.max_generated)]:
+            self._retire(self.entries.pop(key)[1])
+
+    def ref(self, request):
+        """Publish the request's trace if needed, take a reference and return its shared memory name"""
+        with self._lock:
+            if "trace" in request:
+                path = os.path.abspath(request["trace"])
+                stat = os.stat(path)
+                key, stamp = ("trace", path), (stat.st_mtime_ns, stat.st_size)
+                entry = self.entries.get(key)
+                if entry is None or entry[0] != stamp:
+                    self._publish(key, stamp, load_jobs(path))
+            elif "generate" in request:
+                params = dict(request["generate"])
+                if params.get("seed") is None:
+                    # a different random trace every time: publish it for this request only
+                    trace = SharedTrace.create(generate_jobs(**params))
+                    self.retired[trace.name] = trace
+                    self._in_flight[trace.name] += 1
+                    return trace.name
+                key, stamp = ("generate", json.dumps(params, sort_keys=True)), None
+                if key not in self.entries:
+                    self._publish(key, stamp, generate_jobs(**params))
+                    self._evict_generated()
+            else:
+                raise ValueError("A request needs a 'trace' path or 'generate' parameters")
+            self.entries.move_to_end(key)
+            name = self.entries[key][1].name
+            self._in_flight[name] += 1
+            return name
+
+    def release(self, name):
+        """Drop a reference; a retired block goes when its last reference does"""
+        with self._lock:
+            self._in_flight[name] -= 1
+            if self._in_flight[name] <= 0:
+                del self._in_flight[name]
+                trace = self.retired.pop(name, None)
+                if trace is not None:
+                    trace.close()
+                    trace.unlink()
+
+    def close(self):
+        with self._lock:
+            for trace in [trace for _, trace in self.entries.values()] + list(self.retired.values()):
+                trace.close()
+                trace.unlink()
+            self.entries.clear()
+            self.retired.clear()
+            self._in_flight.clear()
+
+
+def generate_jobs(workload="standard", n=10, seed=None, arrival_spacing=None):
+    """Generate a workload with gen_jobs and validate it like a job file"""
+    from gen_jobs.generate_jobs import generate_processes, load_user_classes
+
+    if seed is not None:
+        random.seed(seed)
+    with contextlib.redirect_stdout(io.StringIO()):  # the generator is chatty
+        jobs, _ = generate_processes(load_user_classes("job_classes.json"), n=n,
+                                     workload_type=workload, arrival_spacing=arrival_spacing)
+    return validate_jobs(jobs, f"generated {workload} workload")
+
+
+class SimulationService:
+    """
+    Worker pool plus trace cache; the socket server (serve) wraps one of these
+    Attributes:
+        workers: number of worker processes
+        served: requests answered so far
+    Methods:
+        run(request): metrics for one request (raises RuntimeError on failure)
+        map(requests): results in order; a failed request gives {"error": message}
+        stats(): counters for monitoring
+        close(): stop the workers and free the shared memory
+    Also a context manager.
+    """
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.traces = TraceCache()
+        self.pool = multiprocessing.Pool(self.workers)
+        self.served = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _submit(self, request):
+        name = self.traces.ref(request)
+
+        def release(_):
+            # the pool runs this before the request's get() returns
+            self.traces.release(name)
+
+        return self.pool.apply_async(_run, (name, request), callback=release, error_callback=release)
+
+    def run(self, request):
+        """Metrics for one request"""
+        status, result = self._submit(request).get()
+        self.served += 1
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def map(self, requests):
+        """Run requests in parallel; results come back in request order"""
+        pending = []
+        for request in requests:
+            try:
+                pending.append(self._submit(request))
+            except Exception as e:  # bad trace: fail this request only
+                pending.append(("error", f"{type(e).__name__}: {e}"))
+        results = []
+        for item in pending:
+            status, result = item if isinstance(item, tuple) else item.get()
+            results.append(result if status == "ok" else {"error": result})
+        self.served += len(results)
+        return results
+
+    def stats(self):
+        return {"workers": self.workers, "served": self.served, "traces": len(self.traces.entries),
+                "retired_traces": len(self.traces.retired)}
+
+    def close(self):
+        self.pool.close()
+        self.pool.join()
+        self.traces.close()
+
+
+# ---------------------------------------
+# Socket protocol
+# ---------------------------------------
+# client -> service: ("run", request) | ("map", [requests]) | ("stats",) | ("shutdown",)
+# service -> client: ("ok", result) | ("error", message)
+
+def _handle(service, conn, stop):
+    """Answer one client connection until it closes"""
+    with conn:
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                return
+            command = message[0]
+            try:
+                if command == "run":
+                    reply = ("ok", service.run(message[1]))
+                elif command == "map":
+                    reply = ("ok", service.map(message[1]))
+                elif command == "stats":
+                    reply = ("ok", service.stats())
+                elif command == "shutdown":
+                    conn.send(("ok", None))
+                    stop.set()
+                    return
+                else:
+                    reply = ("error", f"Unknown command {command!r}")
+            except Exception as e:
+                reply = ("error", f"{type(e).__name__}: {e}")
+            conn.send(reply)
+
+
+def _check_authkey(authkey):
+    """Refuse keys that are short enough to guess"""
+    if len(authkey) < MIN_AUTHKEY_BYTES:
+        raise ValueError(f"The service authkey must be at least {MIN_AUTHKEY_BYTES} random bytes")
+    return authkey
+
+
+def write_key_file(authkey, key_file=DEFAULT_KEY_FILE):
+    """Write the key (hex) to a file only the current user can read"""
+    fd = os.open(key_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        os.fchmod(f.fileno(), 0o600)  # the file may have existed with wider permissions
+        f.write(authkey.hex() + "\n")
+
+
+def read_authkey(key_file=DEFAULT_KEY_FILE):
+    """
+    The service key from SIM_SERVICE_AUTHKEY, else from the key file
+    Raises: RuntimeError if neither is there (the service isn't running)
+    """
+    if os.environ.get(AUTHKEY_ENV):
+        return _check_authkey(bytes.fromhex(os.environ[AUTHKEY_ENV]))
+    try:
+        with open(key_file) as f:
+            return _check_authkey(bytes.fromhex(f.read().strip()))
+    except FileNotFoundError:
+        raise RuntimeError(f"No service key: set {AUTHKEY_ENV} or start the service to create {key_file}") from None
+
+
+def serve(address=DEFAULT_ADDRESS, authkey=None, workers=None, key_file=DEFAULT_KEY_FILE):
+    """
+    Run the service until a client sends "shutdown" (or Ctrl-C)
+    Each client connection gets a thread; requests from all of them share the pool.
+    Args:
+        authkey: connection key; default SIM_SERVICE_AUTHKEY, or else a
+                 random key written to key_file (mode 0600) for clients
+    """
+    if authkey is None and os.environ.get(AUTHKEY_ENV):
+        authkey = bytes.fromhex(os.environ[AUTHKEY_ENV])
+    if authkey is None:
+        authkey = os.urandom(32)
+        write_key_file(authkey, key_file)
+        print(f"Service key written to {key_file}", file=sys.stderr)
+    _check_authkey(authkey)
+    stop = threading.Event()
+    with SimulationService(workers) as service, Listener(address, authkey=authkey) as listener:
+
+        def accept():
+            while True:
+                try:
+                    conn = listener.accept()
+                except multiprocessing.AuthenticationError:
+                    continue  # wrong authkey, keep listening
+                except OSError:
+                    return  # listener closed
+                threading.Thread(target=_handle, args=(service, conn, stop), daemon=True).start()
+
+        threading.Thread(target=accept, daemon=True).start()
+        print(f"Simulation service on {address[0]}:{address[1]} with {service.workers} workers", file=sys.stderr)
+        try:
+            while not stop.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            pass
+        print(f"Simulation service stopped after {service.served} requests", file=sys.stderr)
+
+
+class SimulationClient:
+    """
+    Connection to a running service
+    Methods:
+        run(request=None, **fields): metrics for one request
+        map(requests): results in order ({"error": message} for failures)
+        stats(): service counters
+        shutdown(): stop the service
+        close(): close the connection (also a context manager)
+    """
+
+    def __init__(self, address=DEFAULT_ADDRESS, authkey=None, key_file=DEFAULT_KEY_FILE):
+        """authkey: the service's key (default: read_authkey(key_file))"""
+        if authkey is None:
+            authkey = read_authkey(key_file)
+        self.conn = Client(address, authkey=authkey)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _call(self, *message):
+        self.conn.send(message)
+        status, result = self.conn.recv()
+        if status != "ok":
+            raise RuntimeError(result)
+        return result
+
+    def run(self, request=None, **fields):
+        return self._call("run", dict(request or {}, **fields))
+
+    def map(self, requests):
+        return self._call("map", list(requests))
+
+    def stats(self):
+        return self._call("stats")
+
+    def shutdown(self):
+        return self._call("shutdown")
+
+    def close(self):
+        self.conn.close()
+
+
+if __name__ == "__main__":
+    settings = {"host": DEFAULT_ADDRESS[0], "port": str(DEFAULT_ADDRESS[1]), "workers": "0",
+                "key_file": DEFAULT_KEY_FILE}
+    for arg in sys.argv[1:]:
+        if "=" in arg:
+            key, value = arg.split("=", 1)
+            settings[key] = value
+    serve((settings["host"], int(settings["port"])), workers=int(settings["workers"]) or None,
+          key_file=settings["key_file"])
@@ -0,0 +1,346 @@
+"""
+Random access over exported timeline files (export_csv / export_json)
+
+Answering "what was on CPU2 at t=50000?" from a CSV or JSON export means
+reading the file from the top. TimelineReader builds a sidecar index the
+first time a file is opened (<file>.idx, JSON) and then answers point-in-time
+and range queries with a seek and a short replay, never holding more than a
+few events in memory, so it works on exports far larger than RAM.
+
+The index splits time into buckets of `interval` ticks. For every bucket it
+keeps two byte offsets:
+
+    offset      first event at or after the bucket's start time
+    checkpoint  last event before the bucket's start time
+
+Every exported event carries a full snapshot of the ready queue, wait queue,
+CPUs and IO devices, so the event at `checkpoint` *is* the full system state
+when the bucket starts. state_at(t) seeks to t's bucket, replays its events
+up to t and falls back to the checkpoint when nothing happened in between;
+a range query seeks to the bucket of `start` and reads until `end`.
+
+The index remembers the size and mtime of the file it was built from and is
+rebuilt when either changes.
+
+Example:
+    with TimelineReader("timelines/timeline0001.csv") as tl:
+        tl.on_device("CPU0", 500)
+        tl.state_at(500)["ready_queue"]
+        tl.query(start=100, end=200, pid="7")
+"""
+import ast
+import csv
+import json
+import os
+import re
+
+INDEX_VERSION = 1
+
+# how export_json (indent=2) starts each event, with the event's time
+# (\r?\n: the file may have been saved with Windows line endings)
+JSON_EVENT_START = re.compile(rb'^  \{\r?\n    "time": (-?\d+),', re.M)
+SCAN_BLOCK = 1 << 20
+
+# snapshot columns every event carries (lists of pids / None)
+LIST_COLUMNS = ("ready_queue", "wait_queue", "cpus", "ios")
+
+
+def index_path(filename):
+    """Sidecar index file for an exported timeline"""
+    return f"{filename}.idx"
+
+
+class TimelineReader:
+    """
+    Time-indexed reader for a timeline exported with export_csv or export_json
+    Attributes:
+        filename: the exported timeline
+        format: "csv" or "json"
+        interval: index bucket width in ticks
+        count: number of events
+        time_range: (first, last) event time
+    Methods:
+        events(start, end): generator of events in an inclusive time range
+        query(start, end, pid, device, event_type): matching events as a list
+        state_at(time): queues and devices after every event up to 'time'
+        on_device(device, time): pid on "CPU<n>" / "IO<n>" at 'time'
+        build_index(): rescan the file and rewrite the sidecar index
+        close(): close the file (also a context manager)
+    """
+
+    def __init__(self, filename, interval=100, rebuild=False):
+        if interval < 1:
+            raise ValueError(f"interval must be at least 1, got {interval}")
+        self.filename = filename
+        self.interval = interval
+        self._file = open(filename, "rb")
+        self.format = self._detect_format()
+        self._header = None
+        index = None if rebuild else self._load_index()
+        if index is None:
+            index = self.build_index()
+        self._apply(index)
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    # ---- file format ----
+    def _detect_format(self):
+        self._file.seek(0)
+        head = self._file.read(64).lstrip()
+        return "json" if head.startswith(b"[") else "csv"
+
+    def _read_event(self):
+        """
+        Read the event starting at the current file position
+        Returns: (event dict, offset of the next event) or (None, None) at the end
+        """
+        f = self._file
+        if self.format == "csv":
+            line = f.readline()
+            if not line.strip():
+                return None, None
+            row = next(csv.reader([line.decode("utf-8")]))
+            return self._csv_event(row), f.tell()
+
+        # export_json writes one object per event, "  {" ... "  }," at indent 2
+        line = f.readline()
+        if not line.startswith(b"  {"):
+            return None, None
+        lines = [line]
+        while True:
+            line = f.readline()
+            if not line:
+                raise ValueError(f"{self.filename}: truncated event at byte {f.tell()}")
+            stripped = line.rstrip()
+            if stripped in (b"  }", b"  },"):
+                lines.append(b"}")
+                return json.loads(b"".join(lines)), f.tell()
+            lines.append(line)
+
+    def _csv_event(self, row):
+        event = dict(zip(self._header, row))
+        event["time"] = int(event["time"])
+        for name in ("process", "device"):
+            if event.get(name) == "":
+                event[name] = None  # DictWriter writes None as an empty cell
+        for name in LIST_COLUMNS:
+            if name in event:
+                event[name] = ast.literal_eval(event[name])  # lists are written as Python reprs
+        return event
+
+    def _first_offset(self):
+        """Byte offset of the first event (after the CSV header / JSON '[')"""
+        f = self._file
+        f.seek(0)
+        line = f.readline()
+        if self.format == "csv":
+            self._header = next(csv.reader([line.decode("utf-8")]))
+        return f.tell()
+
+    def _scan_times(self, offset=None):
+        """
+        Yield (time, offset) for every event from 'offset' (default: the first
+        event) on, reading only what's needed for the time, not parsing events
+        """
+        f = self._file
+        if offset is None:
+            offset = self._first_offset()
+        f.seek(offset)
+        if self.format == "csv":
+            for line in f:
+                if line.strip():
+                    yield int(line.split(b",", 1)[0]), offset
+                offset += len(line)
+            return
+
+        # JSON events are ~one line per pid, so search blocks for event starts
+        # instead of looping over lines
+        base, buf = offset, b""
+        while True:
+            block = f.read(SCAN_BLOCK)
+            buf += block
+            consumed = 0
+            for match in JSON_EVENT_START.finditer(buf):
+                yield int(match.group(1)), base + match.start()
+                consumed = match.end()
+            if not block:
+                return
+            # keep enough of the tail for an event start split across blocks
+            consumed = max(consumed, len(buf) - 64)
+            base += consumed
+            buf = buf[consumed:]
+
+    # ---- index ----
+    def _source_stamp(self):
+        stat = os.stat(self.filename)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def _load_index(self):
+        """The sidecar index, or None if it's missing or out of date"""
+        try:
+            with open(index_path(self.filename)) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if (
+            index.get("version") != INDEX_VERSION
+            or index.get("source") != self._source_stamp()
+            or index.get("interval") != self.interval
+        ):
+            return None
+        self._first_offset()  # reads the CSV header
+        return index
+
+    def build_index(self):
+        """
+        Scan the whole file once and write <file>.idx
+        Returns: the index dict
+        """
+        stamp = self._source_stamp()
+        interval = self.interval
+        offsets, checkpoints = [], []
+        first_bucket = None
+        count, first_time, last_time = 0, None, None
+        previous = -1  # offset of the last event seen so far
+        for time, offset in self._scan_times():
+            if last_time is not None and time < last_time:
+                raise ValueError(f"{self.filename}: events are not in time order at t={time}")
+            bucket = time // interval
+            if first_bucket is None:
+                first_bucket = bucket
+                first_time = time
+            # one entry per bucket up to this one, empty buckets included
+            while first_bucket + len(offsets) <= bucket:
+                offsets.append(offset)
+                checkpoints.append(previous)
+            previous = offset
+            last_time = time
+            count += 1
+
+        index = {
+            "version": INDEX_VERSION,
+            "source": stamp,
+            "format": self.format,
+            "interval": interval,
+            "count": count,
+            "time_range": [first_time, last_time],
+            "first_bucket": first_bucket,
+            "offsets": offsets,
+            "checkpoints": checkpoints,
+            "last": previous,
+        }
+        with open(index_path(self.filename), "w") as f:
+            json.dump(index, f)
+        return index
+
+    def _apply(self, index):
+        self.count = index["count"]
+        self.time_range = tuple(index["time_range"])
+        self._first_bucket = index["first_bucket"]
+        self._offsets = index["offsets"]
+        self._checkpoints = index["checkpoints"]
+        self._last = index["last"]
+
+    def _bucket(self, time):
+        """Index entry for 'time', clamped to the indexed range"""
+        return min(max(time // self.interval - self._first_bucket, 0), len(self._offsets) - 1)
+
+    # ---- queries ----
+    def events(self, start=None, end=None):
+        """
+        Events with start <= time <= end, in file order (a generator)
+        Only the part of the file from start's bucket to 'end' is read.
+        """
+        if not self.count:
+            return
+        if start is not None and start > self.time_range[1]:
+            return
+        offset = self._offsets[self._bucket(start)] if start is not None else self._offsets[0]
+        while offset is not None:
+            self._file.seek(offset)
+            event, offset = self._read_event()
+            if event is None:
+                return
+            if end is not None and event["time"] > end:
+                return
+            if start is None or event["time"] >= start:
+                yield event
+
+    def query(self, start=None, end=None, pid=None, device=None, event_type=None):
+        """
+        Events matching every given filter
+        Args:
+            start / end: inclusive time range
+            pid: process ID of the event
+            device: device of the event, e.g. "CPU0" or "IO1"
+            event_type: e.g. "dispatch_cpu"
+        Returns: list of event dicts
+        """
+        return [
+            event for event in self.events(start, end)
+            if (pid is None or event["process"] == pid)
+            and (device is None or event["device"] == device)
+            and (event_type is None or event["event_type"] == event_type)
+        ]
+
+    def _event_at(self, offset):
+        self._file.seek(offset)
+        return self._read_event()[0]
+
+    def state_at(self, time):
+        """
+        System state after every event up to and including 'time'
+        Returns: dict with "time" (the asked time), "event_time" (time of the
+                 event the state comes from) and the ready_queue, wait_queue,
+                 cpus and ios snapshots; None before the first event
+        """
+        if not self.count or time < self.time_range[0]:
+            return None
+        if time >= self.time_range[1]:
+            offset = self._last
+        else:
+            # replay the bucket up to 'time' from its checkpoint; only the
+            # times are read until we know which event holds the state
+            bucket = self._bucket(time)
+            offset = self._checkpoints[bucket]
+            for event_time, event_offset in self._scan_times(self._offsets[bucket]):
+                if event_time > time:
+                    break
+                offset = event_offset
+        latest = self._event_at(offset)
+        state = {"time": time, "event_time": latest["time"]}
+        for name in LIST_COLUMNS:
+            state[name] = latest[name]
+        return state
+
+    def on_device(self, device, time):
+        """
+        Process on a device at 'time'
+        Args:
+            device: "CPU<n>" or "IO<n>"
+            time: simulation time
+        Returns: pid, or None if the device was idle (or 'time' is before the first event)
+        """
+        for prefix, column in (("CPU", "cpus"), ("IO", "ios")):
+            if device.startswith(prefix) and device[len(prefix):].isdigit():
+                break
+        else:
+            raise ValueError(f"Unknown device {device!r}; expected CPU<n> or IO<n>")
+        state = self.state_at(time)
+        if state is None:
+            return None
+        slots = state[column]
+        n = int(device[len(prefix):])
+        if n >= len(slots):
+            raise ValueError(f"{device} doesn't exist; the timeline has {len(slots)} {prefix} devices")
+        return slots[n]
@@ -0,0 +1,358 @@
+"""
+Compressed columnar timeline storage
+
+Scheduler.events is a list of dicts; export_json pretty-prints all of it
+and export_csv turns the list columns into Python reprs. This module stores
+the same events column by column instead:
+
+    time                 int64, delta encoded within a chunk
+    event, event_type    dictionary encoded strings
+    process, device      dictionary encoded (-1 = None)
+    ready_queue, wait_queue, cpus, ios
+                         list columns: a length per event plus one flat
+                         array of dictionary encoded pids
+
+Events are written in chunks (default 65536 events). Every column of every
+chunk is compressed on its own (zlib or lzma, both stdlib), and the footer
+keeps a per-chunk index: byte ranges, min/max time and the pid / device
+codes that appear. A query only reads and decompresses the columns it needs
+from the chunks whose index can match.
+
+File layout:
+    b"TLC1" | chunk columns ... | footer (zlib JSON) | footer length (8 bytes) | b"TLC1"
+
+Example:
+    sched.export_columnar("timeline.tlc")
+    with ColumnarTimeline("timeline.tlc") as tl:
+        tl.query(start=100, end=200, pid="7")
+        tl.query(device="CPU1", columns=["time", "event_type", "process"])
+"""
+import array
+import itertools
+import json
+import lzma
+import operator
+import struct
+import sys
+import zlib
+
+MAGIC = b"TLC1"
+VERSION = 1
+
+CODECS = {
+    "zlib": (lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+    "none": (bytes, bytes),
+}
+
+SCALAR_COLUMNS = ("time", "event", "event_type", "process", "device")
+LIST_COLUMNS = ("ready_queue", "wait_queue", "cpus", "ios")
+COLUMNS = SCALAR_COLUMNS + LIST_COLUMNS
+
+# column -> dictionary its values are encoded with ("time" isn't encoded)
+DICTIONARY_OF = {
+    "event": "event",
+    "event_type": "event_type",
+    "process": "pid",
+    "device": "device",
+    "ready_queue": "pid",
+    "wait_queue": "pid",
+    "cpus": "pid",
+    "ios": "pid",
+}
+
+
+class _Dictionary:
+    """Value <-> integer code table (None is always -1)"""
+
+    def __init__(self, values=()):
+        self.values = list(values)
+        self.codes = {value: code for code, value in enumerate(self.values)}
+        self.codes[None] = -1
+
+    def lookup(self):
+        """List to decode with: lookup[code], where code -1 lands on the trailing None"""
+        return self.values + [None]
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ColumnarWriter:
+    """
+    Streams events into a columnar timeline file
+    Methods:
+        append(event): add one event dict (Scheduler.events format)
+        close(): flush the last chunk and write the footer
+    Also a context manager.
+    """
+
+    def __init__(self, filename, codec="zlib", chunk_size=65536):
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; choose from {list(CODECS)}")
+        self.filename = filename
+        self.codec = codec
+        self.chunk_size = chunk_size
+        self._compress = CODECS[codec][0]
+        self._dicts = {name: _Dictionary() for name in set(DICTIONARY_OF.values())}
+        self._chunks = []
+        self._file = open(filename, "wb")
+        self._file.write(MAGIC)
+        self._new_chunk()
+
+    def _new_chunk(self):
+        self._times = array.array("q")
+        self._scalars = {name: array.array("i") for name in SCALAR_COLUMNS[1:]}
+        self._lengths = {name: array.array("I") for name in LIST_COLUMNS}
+        self._values = {name: array.array("i") for name in LIST_COLUMNS}
+
+    def append(self, event):
+        """Add one event"""
+        self._times.append(event["time"])
+        dicts = self._dicts
+        for name, column in self._scalars.items():
+            column.append(dicts[DICTIONARY_OF[name]].code(event[name]))
+        pids = dicts["pid"]
+        codes = pids.codes
+        for name in LIST_COLUMNS:
+            items = event[name]
+            self._lengths[name].append(len(items))
+            try:
+                self._values[name].extend([codes[v] for v in items])
+            except KeyError:  # first time we see one of these pids
+                self._values[name].extend([pids.code(v) for v in items])
+        if len(self._times) >= self.chunk_size:
+            self._flush()
+
+    def _write_column(self, blobs, name, data):
+        offset = self._file.tell()
+        self._file.write(self._compress(data))
+        blobs[name] = [offset, self._file.tell() - offset]
+
+    def _flush(self):
+        times = self._times
+        if not times:
+            return
+        blobs = {}
+        # delta encoding makes the (mostly constant) time steps compress to almost nothing
+        deltas = array.array("q", map(operator.sub, times, itertools.chain((0,), times)))
+        self._write_column(blobs, "time", deltas.tobytes())
+        for name, column in self._scalars.items():
+            self._write_column(blobs, name, column.tobytes())
+        for name in LIST_COLUMNS:
+            self._write_column(blobs, f"{name}.len", self._lengths[name].tobytes())
+            self._write_column(blobs, f"{name}.values", self._values[name].tobytes())
+        self._chunks.append({
+            "count": len(times),
+            "time_min": min(times),
+            "time_max": max(times),
+            "pids": sorted(set(self._scalars["process"]) - {-1}),
+            "devices": sorted(set(self._scalars["device"]) - {-1}),
+            "columns": blobs,
+        })
+        self._new_chunk()
+
+    def close(self):
+        """Write the last chunk and the footer"""
+        if self._file is None:
+            return
+        self._flush()
+        footer = {
+            "version": VERSION,
+            "codec": self.codec,
+            "byteorder": sys.byteorder,
+            "count": sum(c["count"] for c in self._chunks),
+            "dictionaries": {name: d.values for name, d in self._dicts.items()},
+            "chunks": self._chunks,
+        }
+        data = zlib.compress(json.dumps(footer).encode())
+        self._file.write(data)
+        self._file.write(struct.pack("<Q", len(data)))
+        self._file.write(MAGIC)
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_columnar(events, filename, codec="zlib", chunk_size=65536):
+    """
+    Write a list of event dicts as a columnar timeline
+    Args:
+        events: Scheduler.events
+        filename: output path (".tlc" by convention)
+        codec: "zlib", "lzma" or "none"
+        chunk_size: events per chunk
+    Returns: None
+    """
+    with ColumnarWriter(filename, codec, chunk_size) as writer:
+        for event in events:
+            writer.append(event)
+
+
+class ColumnarTimeline:
+    """
+    Read-side of a columnar timeline file
+    Attributes:
+        count: number of events
+        time_range: (first, last) event time
+        chunks: per-chunk index from the footer
+    Methods:
+        query(start, end, pid, device, event_type, columns): matching events as dicts
+        column(name): one whole column as a list (decoded values)
+        to_columns(columns): dict of column -> list for the whole file
+        close(): close the file (also a context manager)
+    """
+
+    _TYPECODES = {"time": "q", "len": "I"}
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._file = open(filename, "rb")
+        self._file.seek(-12, 2)
+        size, magic = struct.unpack("<Q4s", self._file.read(12))
+        if magic != MAGIC:
+            raise ValueError(f"{filename} is not a columnar timeline")
+        self._file.seek(-12 - size, 2)
+        footer = json.loads(zlib.decompress(self._file.read(size)))
+        if footer["version"] != VERSION:
+            raise ValueError(f"Unsupported timeline version {footer['version']}")
+        self._decompress = CODECS[footer["codec"]][1]
+        self._swap = footer["byteorder"] != sys.byteorder
+        self.count = footer["count"]
+        self.chunks = footer["chunks"]
+        self._dicts = {name: _Dictionary(values) for name, values in footer["dictionaries"].items()}
+        self.time_range = (
+            (self.chunks[0]["time_min"], self.chunks[-1]["time_max"]) if self.chunks else (None, None)
+        )
+
+    def __len__(self):
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    # ---- decoding ----
+    def _raw(self, chunk, blob):
+        """Decompressed array for one stored column of a chunk"""
+        offset, size = chunk["columns"][blob]
+        self._file.seek(offset)
+        typecode = self._TYPECODES.get(blob.rsplit(".", 1)[-1], "i")
+        values = array.array(typecode, self._decompress(self._file.read(size)))
+        if self._swap:
+            values.byteswap()
+        return values
+
+    def _times(self, chunk):
+        return list(itertools.accumulate(self._raw(chunk, "time")))
+
+    def _list_column(self, chunk, name):
+        """(start offsets, flat codes) for a list column"""
+        lengths = self._raw(chunk, f"{name}.len")
+        offsets = [0]
+        offsets.extend(itertools.accumulate(lengths))
+        return offsets, self._raw(chunk, f"{name}.values")
+
+    def _lookup(self, name):
+        return self._dicts[DICTIONARY_OF[name]].lookup()
+
+    # ---- queries ----
+    def _code(self, dictionary, value):
+        """Code of a value in a dictionary, or None if it never occurs"""
+        return self._dicts[dictionary].codes.get(value)
+
+    def _candidate_chunks(self, start, end, pid_code, device_code):
+        for chunk in self.chunks:
+            if start is not None and chunk["time_max"] < start:
+                continue
+            if end is not None and chunk["time_min"] > end:
+                continue
+            if pid_code is not None and pid_code not in chunk["pids"]:
+                continue
+            if device_code is not None and device_code not in chunk["devices"]:
+                continue
+            yield chunk
+
+    def query(self, start=None, end=None, pid=None, device=None, event_type=None, columns=None):
+        """
+        Events matching every given filter
+        Args:
+            start / end: inclusive time range
+            pid: process ID of the event
+            device: device of the event, e.g. "CPU0" or "IO1"
+            event_type: e.g. "dispatch_cpu"
+            columns: columns to return (default: all)
+        Returns: list of event dicts
+        """
+        columns = list(columns or COLUMNS)
+        codes = {}
+        for name, value in (("process", pid), ("device", device), ("event_type", event_type)):
+            if value is not None:
+                code = self._code(DICTIONARY_OF[name], value)
+                if code is None:
+                    return []  # value never occurs in the file
+                codes[name] = code
+
+        results = []
+        for chunk in self._candidate_chunks(start, end, codes.get("process"), codes.get("device")):
+            times = self._times(chunk)
+            rows = range(chunk["count"])
+            if start is not None or end is not None:
+                lo = start if start is not None else times[0]
+                hi = end if end is not None else times[-1]
+                rows = [i for i in rows if lo <= times[i] <= hi]
+            for name, code in codes.items():
+                column = self._raw(chunk, name)
+                rows = [i for i in rows if column[i] == code]
+            if not rows:
+                continue
+            decoded = {}
+            for name in columns:
+                if name == "time":
+                    decoded[name] = [times[i] for i in rows]
+                elif name in LIST_COLUMNS:
+                    offsets, flat = self._list_column(chunk, name)
+                    lookup = self._lookup(name)
+                    decoded[name] = [[lookup[c] for c in flat[offsets[i]:offsets[i + 1]]] for i in rows]
+                else:
+                    column = self._raw(chunk, name)
+                    lookup = self._lookup(name)
+                    decoded[name] = [lookup[column[i]] for i in rows]
+            results.extend(dict(zip(columns, values)) for values in zip(*(decoded[c] for c in columns)))
+        return results
+
+    def column(self, name):
+        """One column for the whole file, decoded"""
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown column {name!r}; columns are {COLUMNS}")
+        values = []
+        for chunk in self.chunks:
+            if name == "time":
+                values.extend(self._times(chunk))
+            elif name in LIST_COLUMNS:
+                offsets, flat = self._list_column(chunk, name)
+                lookup = self._lookup(name)
+                decoded = [lookup[c] for c in flat]
+                values.extend(decoded[offsets[i]:offsets[i + 1]] for i in range(chunk["count"]))
+            else:
+                lookup = self._lookup(name)
+                values.extend([lookup[c] for c in self._raw(chunk, name)])
+        return values
+
+    def to_columns(self, columns=None):
+        """dict of column name -> list of values for the whole file"""
+        return {name: self.column(name) for name in (columns or COLUMNS)}
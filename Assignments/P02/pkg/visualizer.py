@@ -1,5 +1,6 @@
 import pygame
-import sys
+
+from pkg.realtime import REALTIME_KEYS
 
 # Visualizer settings
 WIDTH, HEIGHT = 1000, 700  # Increased size for better layout
@@ -40,6 +41,10 @@ class Visualizer:
             "SRTF": (50, 205, 50),  # Lime Green
             "Priority": (70, 130, 180),  # Steel Blue
             "PriorityPreemptive": (100, 149, 237),  # Cornflower Blue
+            "EDF": (220, 20, 60),  # Crimson
+            "RM": (218, 165, 32),  # Goldenrod
+            "Stride": (0, 139, 139),  # Dark Cyan
+            "Lottery": (199, 21, 133),  # Medium Violet Red
             "RR": (186, 85, 211)  # Medium Orchid
         }
 
@@ -49,11 +54,11 @@ class Visualizer:
             return items
 
         processes = []
+        all_procs = self.scheduler.processes()  # pid index, no copy
         for item in items:
             pid = item.get("pid")
             if pid is not None:
                 # Get the actual process object from scheduler
-                all_procs = self.scheduler.processes()
                 if pid in all_procs:
                     proc = all_procs[pid]
                     processes.append({
@@ -84,6 +89,13 @@ class Visualizer:
                 x["process"].priority,
                 x["process"].arrival_time
             ))
+        elif algorithm in REALTIME_KEYS:
+            # EDF / RM - sort by absolute deadline / period
+            key = REALTIME_KEYS[algorithm]
+            processes.sort(key=lambda x: (
+                key(x["process"]),
+                x["process"].arrival_time
+            ))
         # RR doesn't need sorting - processes execute in round-robin order
 
         return [{"pid": p["pid"]} for p in processes]
@@ -160,6 +172,7 @@ class Visualizer:
             self.screen.blit(algo_surf, algo_rect)
 
         # Draw each process as a box inside the queue
+        all_procs = self.scheduler.processes()  # pid index, looked up once per queue
         max_visible = (QUEUE_HEIGHT - 70) // (BOX_HEIGHT + BOX_PADDING)
         visible_items = sorted_items[:max_visible]
 
@@ -180,7 +193,6 @@ class Visualizer:
 
             # Get box color
             if pid is not None:
-                all_procs = self.scheduler.processes()
                 if pid in all_procs:
                     proc = all_procs[pid]
                     box_color = self._get_process_color(proc, algorithm)
@@ -195,7 +207,6 @@ class Visualizer:
 
             # Draw process information
             if pid is not None:
-                all_procs = self.scheduler.processes()
                 if pid in all_procs:
                     proc = all_procs[pid]
 
@@ -213,6 +224,11 @@ class Visualizer:
                         info = f"P{pid} (Pri:{proc.priority})"
                     elif algorithm == "RR":
                         info = f"P{pid} (Q:{proc.remaining_quantum}/{proc.quantum})"
+                    elif algorithm == "EDF":
+                        deadline = proc.absolute_deadline
+                        info = f"P{pid} (D:{deadline if deadline is not None else '-'})"
+                    elif algorithm == "RM":
+                        info = f"P{pid} (T:{proc.period if proc.period is not None else '-'})"
                     else:
                         info = f"P{pid}"
                 else:
@@ -244,7 +260,11 @@ class Visualizer:
             "SRTF": "Shortest Remaining Time First - Preemptive; executes process with shortest remaining burst (R = remaining time)",
             "Priority": "Priority Scheduling - Lower number = higher priority (Pri = priority)",
             "PriorityPreemptive": "Preemptive Priority - Can preempt running process if higher priority arrives",
-            "RR": "Round Robin - Each process gets time quantum (Q = remaining/quantum); preempts when quantum expires"
+            "RR": "Round Robin - Each process gets time quantum (Q = remaining/quantum); preempts when quantum expires",
+            "EDF": "Earliest Deadline First - Preemptive; runs the process with the earliest absolute deadline",
+            "RM": "Rate Monotonic - Preemptive; shorter period = higher priority",
+            "Stride": "Stride Scheduling - CPU shared between classes by share; lowest pass class runs next",
+            "Lottery": "Lottery Scheduling - CPU shared between classes; next class drawn by tickets (shares)",
         }
 
         # Draw legend box
@@ -299,13 +319,13 @@ class Visualizer:
         stats_header = self.large_font.render("Statistics", True, BLACK)
         self.screen.blit(stats_header, (stats_rect.x + 10, stats_rect.y + 10))
 
-        # Gather statistics
-        all_procs = self.scheduler.processes()
-        ready_count = len(self.scheduler.ready_queue)
-        wait_count = len(self.scheduler.wait_queue)
-        cpu_count = sum(1 for cpu in self.scheduler.cpus if cpu.current)
-        io_count = sum(1 for io in self.scheduler.io_devices if io.current)
-        finished_count = len(self.scheduler.finished)
+        # Gather statistics (per-state counts kept by the scheduler's registry)
+        registry = self.scheduler.registry
+        ready_count = registry.count("ready")
+        wait_count = registry.count("waiting")
+        cpu_count = registry.count("running")
+        io_count = registry.count("io")
+        finished_count = registry.count("finished")
         total_count = ready_count + wait_count + cpu_count + io_count + finished_count
 
         # Draw statistics
@@ -400,8 +420,8 @@ class Visualizer:
             # Control frame rate
             self.clock.tick(FPS)
 
+        # Return to the caller (main.py still prints the summary and exports)
         pygame.quit()
-        sys.exit()
 
 
 # Test/Demo class remains the same
@@ -0,0 +1,57 @@
+"""
+What-if analysis: fork a running simulation into variants and run
+each variant to completion in parallel worker processes.
+
+Example:
+    sched.run_until(500)  # warm up to t=500
+    results = run_variants(sched, [
+        {"algorithm": "RR", "quantum": 2},
+        {"algorithm": "SRTF"},
+        {"algorithm": "FCFS", "num_cpus": 4},
+    ])
+"""
+import multiprocessing
+
+# Forks waiting to be run. With the "fork" start method the workers inherit
+# this list from the parent, so forks never get pickled.
+_PENDING = []
+
+
+def _run_scheduler(sched):
+    """Run one forked scheduler to completion and return its metrics"""
+    sched.run()
+    return sched.metrics()
+
+
+def _run_pending(index):
+    """Worker entry point for the inherited _PENDING list"""
+    return _run_scheduler(_PENDING[index])
+
+
+def run_variants(scheduler, variants, workers=None):
+    """
+    Fork a scheduler once per variant and run every fork to completion
+    Args:
+        scheduler: Scheduler to fork from (left untouched)
+        variants: list of dicts of Scheduler.fork() keyword arguments
+        workers: number of worker processes (1 = run in this process,
+                 None = one per CPU core)
+    Returns: list of metrics dicts, in the same order as variants
+    """
+    forks = scheduler.fork_many(variants)
+    if workers == 1 or len(forks) <= 1:
+        return [_run_scheduler(f) for f in forks]
+
+    ctx = multiprocessing.get_context()
+    if ctx.get_start_method() == "fork":
+        # Workers see the forks through copy-on-write process memory
+        _PENDING[:] = forks
+        try:
+            with ctx.Pool(workers) as pool:
+                return pool.map(_run_pending, range(len(forks)))
+        finally:
+            _PENDING.clear()
+
+    # spawn/forkserver: each fork is pickled and shipped to a worker
+    with ctx.Pool(workers) as pool:
+        return pool.map(_run_scheduler, forks)
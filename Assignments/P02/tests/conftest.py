@@ -0,0 +1,35 @@
+"""
+Shared workloads for the equivalence tests
+
+The tests run from any folder: the P02 folder goes on sys.path so `pkg` and
+`gen_jobs` import, and job files are found relative to it.
+"""
+import glob
+import os
+import sys
+
+P02 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if P02 not in sys.path:
+    sys.path.insert(0, P02)
+
+from pkg.loader import load_jobs  # noqa: E402
+from pkg.simService import generate_jobs  # noqa: E402
+
+JOB_FILES = sorted(glob.glob(os.path.join(P02, "job_jsons", "process_file_*.json")))
+
+# (workload preset, seed) pairs for generated workloads
+GENERATED = [("standard", 1), ("cpu_bound", 2), ("io_bound", 3), ("standard", 4)]
+
+
+def shipped_workloads():
+    """(name, jobs) for every shipped job file"""
+    return [(os.path.basename(path), load_jobs(path, cache=False)) for path in JOB_FILES]
+
+
+def generated_workloads(n=40):
+    """(name, jobs) for a few gen_jobs workloads with fixed seeds"""
+    return [(f"{preset}-{seed}", generate_jobs(preset, n=n, seed=seed)) for preset, seed in GENERATED]
+
+
+def all_workloads():
+    return shipped_workloads() + generated_workloads()
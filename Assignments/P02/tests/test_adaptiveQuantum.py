@@ -0,0 +1,82 @@
+"""
+Adaptive per-process Round Robin quantum (pkg.adaptiveQuantum)
+"""
+import pytest
+
+import conftest  # noqa: F401  (puts the P02 folder on sys.path)
+from pkg.adaptiveQuantum import AdaptiveQuantum
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+
+def test_quantum_follows_the_bursts_by_hand():
+    policy = AdaptiveQuantum(alpha=0.5, beta=0.25, k=2)
+    proc = Process("p", [{"cpu": 4}], class_id="A")
+    policy.observe(proc, 4)
+    assert proc.burst_estimate == [4, 2]
+    assert proc.quantum == proc.remaining_quantum == 8  # ceil(4 + 2 * 2)
+    policy.observe(proc, 8)
+    assert proc.burst_estimate == [6, 2.5]  # dev 0.75 * 2 + 0.25 * 4, ema 0.5 * 4 + 0.5 * 8
+    assert proc.quantum == 11
+
+
+def test_quantum_is_clamped():
+    policy = AdaptiveQuantum(min_quantum=3, max_quantum=10)
+    proc = Process("p", [{"cpu": 1}])
+    policy.observe(proc, 1)
+    assert proc.quantum == 3
+    policy.observe(proc, 500)
+    assert proc.quantum == 10
+
+
+def test_new_arrivals_start_from_their_class_estimate():
+    policy = AdaptiveQuantum()
+    policy.observe(Process("a1", [{"cpu": 4}], class_id="A"), 4)
+    newcomer = Process("a2", [{"cpu": 4}], quantum=2, class_id="A")
+    stranger = Process("b1", [{"cpu": 4}], quantum=2, class_id="B")
+    policy.admit(newcomer)
+    policy.admit(stranger)
+    assert newcomer.quantum == 8
+    assert stranger.quantum == 2  # no B bursts seen yet: the job file's quantum
+
+
+def make(quantum_policy, procs=4):
+    sched = Scheduler(num_cpus=1, num_ios=1, verbose=False, algorithm="RR",
+                      clock=Clock(shared=False), quantum_policy=quantum_policy)
+    for i in range(procs):
+        bursts = [{"cpu": 10}, {"io": {"duration": 1}}] * 4 + [{"cpu": 10}]
+        sched.add_process(Process(f"p{i}", bursts, quantum=2, class_id="A"))
+    return sched
+
+
+def preemptions(sched):
+    return sum(1 for e in sched.events if e["event_type"] == "preempted")
+
+
+def test_steady_bursts_stop_being_preempted():
+    fixed, adaptive = make(None), make("adaptive")
+    fixed.run()
+    adaptive.run()
+    # only each process's first burst runs on the job file's quantum of 2
+    assert adaptive.metrics()["quantum"]["A"]["within_slice"] == pytest.approx(4 / 5)
+    assert preemptions(adaptive) == 4 * 4
+    assert preemptions(fixed) == 4 * 5 * 4
+    assert adaptive.clock.now() == fixed.clock.now()  # same work, one CPU always busy
+
+
+def test_fork_learns_on_its_own_copy():
+    full = make("adaptive")
+    full.run()
+    sched = make("adaptive")
+    sched.run_until(50)
+    fork = sched.fork()
+    fork.run()
+    assert fork.metrics()["quantum"] == full.metrics()["quantum"]
+    assert sched.quantum_policy is not fork.quantum_policy
+    assert sched.quantum_policy.stats["A"]["bursts"] < full.quantum_policy.stats["A"]["bursts"]
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        Scheduler(verbose=False, clock=Clock(shared=False), quantum_policy="fixed")
@@ -0,0 +1,55 @@
+"""
+Affinity masks against the scheduler's CPUs (pkg.scheduler, pkg.loader)
+
+A process that may run on no existing CPU must be refused up front rather
+than sit in the ready queue forever.
+"""
+import pytest
+
+import conftest  # noqa: F401  (puts the P02 folder on sys.path)
+from pkg.clock import Clock
+from pkg.loader import JobFileError, validate_jobs
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+
+def make(num_cpus=2):
+    return Scheduler(num_cpus=num_cpus, num_ios=1, verbose=False, clock=Clock(shared=False))
+
+
+def test_affinity_is_masked_to_existing_cpus():
+    sched = make(2)
+    proc = Process("p", [{"cpu": 3}], affinity=0b1010)  # CPUs 1 and 3
+    sched.add_process(proc)
+    assert proc.affinity == 0b10
+    sched.run()
+    assert [p.pid for p in sched.finished] == ["p"]
+
+
+def test_affinity_with_no_existing_cpu_is_refused():
+    sched = make(2)
+    with pytest.raises(ValueError, match="affinity"):
+        sched.add_process(Process("p", [{"cpu": 3}], affinity=1 << 5))
+    assert not sched.has_work()
+
+
+def test_fork_with_fewer_cpus_rechecks_affinity():
+    sched = make(2)
+    sched.add_process(Process("a", [{"cpu": 20}], affinity=0b01))
+    sched.add_process(Process("b", [{"cpu": 20}, {"io": {"duration": 2}}, {"cpu": 1}], affinity=0b10))
+    sched.add_process(Process("c", [{"cpu": 5}], arrival_time=50, affinity=0b10))
+    sched.run_until(5)
+    with pytest.raises(ValueError, match="affinity"):
+        sched.fork(num_cpus=1)
+
+    fork = sched.fork(num_cpus=2)
+    fork.run()
+    assert sorted(p.pid for p in fork.finished) == ["a", "b", "c"]
+
+
+def test_loader_rejects_affinity_past_num_cpus():
+    jobs = [{"pid": 1, "bursts": [{"cpu": 1}], "affinity": [0, 5]}]
+    assert validate_jobs(jobs, "jobs")[0]["affinity"] == [0, 5]  # CPU count unknown
+    assert validate_jobs(jobs, "jobs", num_cpus=6)[0]["affinity"] == [0, 5]
+    with pytest.raises(JobFileError, match="num_cpus=2"):
+        validate_jobs(jobs, "jobs", num_cpus=2)
@@ -0,0 +1,93 @@
+"""
+Asynchronous IO devices (pkg.asyncIODevice): queue depth, slots, interrupts
+"""
+import pytest
+
+from conftest import all_workloads
+from pkg.asyncIODevice import AsyncIODevice
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+WORKLOADS = all_workloads()
+
+
+def io_request(pid, duration):
+    return Process(pid, [{"io": {"duration": duration}}, {"cpu": 1}])
+
+
+def run_device(device, clock, ticks):
+    """{tick: [pids delivered]} for the ticks that delivered something"""
+    delivered = {}
+    for now in range(ticks):
+        clock.time = now
+        done = device.tick_all()
+        if done:
+            delivered[now] = [p.pid for p in done]
+    return delivered
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "SRTF"])
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_queue_depth_one_matches_sync_device(name, jobs, algorithm):
+    results = []
+    for io_config in ({"GENERIC_IO": 1}, {"GENERIC_IO": {"count": 1, "queue_depth": 1, "slots": 1}}):
+        sched = Scheduler(verbose=False, clock=Clock(shared=False), algorithm=algorithm, num_cpus=2,
+                          io_config=io_config)
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        sched.run()
+        io = sched.io_metrics()["GENERIC_IO"]
+        results.append((sorted((p.pid, p.finish_time) for p in sched.finished),
+                        sched.clock.now(), io["served"], io["utilization"], io["avg_queue_delay"]))
+    assert results[0] == results[1]
+
+
+def test_slots_and_queue_depth():
+    clock = Clock(shared=False)
+    device = AsyncIODevice(0, clock, queue_depth=4, slots=2)
+    for pid, duration in [("a", 3), ("b", 3), ("c", 5), ("d", 1)]:
+        assert device.can_accept()
+        device.assign(io_request(pid, duration))
+    assert not device.can_accept()  # four outstanding = queue depth
+
+    # a and b take the two slots; c and d start when they finish at t=3
+    assert run_device(device, clock, 12) == {3: ["a", "b"], 4: ["d"], 8: ["c"]}
+    assert device.busy_time == 9  # ticks 0-8 had something in service
+    assert device.slot_time == 4 * 2 + 2 + 4 * 1  # two in service to t=4, then one
+    assert device.interrupts == 3
+    assert not device.is_busy()
+
+
+def test_completions_in_one_window_raise_one_interrupt():
+    clock = Clock(shared=False)
+    device = AsyncIODevice(0, clock, queue_depth=8, slots=8, coalesce=3, coalesce_timeout=10)
+    for pid, duration in [("a", 1), ("b", 2), ("c", 3)]:
+        device.assign(io_request(pid, duration))
+    assert run_device(device, clock, 6) == {3: ["a", "b", "c"]}
+    assert device.interrupts == 1
+
+
+def test_coalescing_timeout_delivers_a_partial_batch():
+    clock = Clock(shared=False)
+    device = AsyncIODevice(0, clock, queue_depth=8, slots=8, coalesce=3, coalesce_timeout=2)
+    device.assign(io_request("a", 1))
+    assert run_device(device, clock, 6) == {3: ["a"]}  # finished at 1, held for 2 ticks
+    assert device.interrupts == 1
+
+
+def test_interrupt_counts_in_a_run():
+    _, jobs = WORKLOADS[-1]
+    counts = {}
+    for coalesce in (1, 4):
+        sched = Scheduler(verbose=False, clock=Clock(shared=False), algorithm="RR", num_cpus=2,
+                          io_config={"GENERIC_IO": {"count": 1, "queue_depth": 16, "slots": 4,
+                                                    "coalesce": coalesce, "coalesce_timeout": 3}})
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        sched.run()
+        io = sched.io_metrics()["GENERIC_IO"]
+        assert len(sched.finished) == len(jobs)
+        assert io["interrupts"] <= io["served"]
+        counts[coalesce] = io["interrupts"]
+    assert counts[4] < counts[1]
@@ -0,0 +1,46 @@
+"""
+The vectorized batch engine (pkg.batch) against Scheduler
+
+Every workload is simulated once in a single batch and once per workload
+with Scheduler; finish times, makespan and the averaged metrics must match.
+"""
+import pytest
+
+from conftest import all_workloads
+
+np = pytest.importorskip("numpy")
+
+from pkg.batch import BATCH_ALGORITHMS, encode_workloads, simulate_batch, verify_against_scheduler  # noqa: E402
+from pkg.clock import Clock  # noqa: E402
+from pkg.process import Process  # noqa: E402
+from pkg.scheduler import Scheduler  # noqa: E402
+
+WORKLOADS = all_workloads()
+DEVICES = [(1, 1), (2, 2), (4, 2)]
+
+
+@pytest.mark.parametrize("num_cpus, num_ios", DEVICES)
+@pytest.mark.parametrize("algorithm", BATCH_ALGORITHMS)
+def test_batch_matches_scheduler(algorithm, num_cpus, num_ios):
+    workloads = [jobs for _, jobs in WORKLOADS]
+    batch = encode_workloads(workloads)
+    result = simulate_batch(batch, algorithm, num_cpus, num_ios)
+
+    for w, (name, jobs) in enumerate(WORKLOADS):
+        sched = Scheduler(num_cpus=num_cpus, num_ios=num_ios, verbose=False,
+                          algorithm=algorithm, clock=Clock(shared=False))
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        sched.run()
+        metrics = sched.metrics()
+
+        finish = dict(zip(batch["pids"][w], result["finish"][w].tolist()))
+        assert finish == {p.pid: p.finish_time for p in sched.finished}, name
+        assert result["makespan"][w] == sched.clock.now(), name
+        assert result["avg_turnaround"][w] == pytest.approx(metrics["avg_turnaround"]), name
+        assert result["avg_wait"][w] == pytest.approx(metrics["avg_wait"]), name
+
+
+@pytest.mark.parametrize("algorithm", BATCH_ALGORITHMS)
+def test_verify_against_scheduler(algorithm):
+    assert verify_against_scheduler([jobs for _, jobs in WORKLOADS], algorithm, 2, 1) == []
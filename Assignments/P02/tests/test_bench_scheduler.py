@@ -0,0 +1,75 @@
+"""
+Benchmark suite (benchmarks/bench_scheduler.py): baseline keys and comparison
+"""
+import json
+import os
+import sys
+
+import pytest
+
+from conftest import P02
+
+sys.path.insert(0, os.path.join(P02, "benchmarks"))  # a script folder, not a package
+import bench_scheduler as bench  # noqa: E402
+
+
+def case(**changes):
+    base = {"algorithm": "RR", "size": 100, "cpus": 4, "ios": 2, "workload": "standard",
+            "seed": 1, "export": False, "record": True, "fast_path": True}
+    return dict(base, **changes)
+
+
+def test_parse_args():
+    settings = bench.parse_args(["algorithms=RR,SJF", "sizes=10,20", "cpus=2", "record=false", "threshold=0.5"])
+    assert settings["algorithms"] == ["RR", "SJF"]
+    assert settings["sizes"] == [10, 20]
+    assert settings["cpus"] == [2]
+    assert settings["ios"] == [1, 2]
+    assert settings["record"] is False and settings["fast_path"] is True
+    assert settings["threshold"] == 0.5
+
+
+def test_case_key_tells_runs_apart():
+    keys = {bench.case_key(case()), bench.case_key(case(fast_path=False)),
+            bench.case_key(case(record=False)), bench.case_key(case(cpus=1))}
+    assert len(keys) == 4
+    assert bench.case_key(case()) == "RR|n=100|cpus=4|ios=2|standard|fast"
+    # results from before the fast path existed compare with generic runs
+    old = case()
+    del old["fast_path"]
+    assert bench.case_key(old) == bench.case_key(case(fast_path=False))
+
+
+def test_compare_flags_slowdowns_past_the_threshold():
+    baseline = {"results": [case(algorithm=a, ticks_per_sec=1000.0) for a in ("RR", "SJF", "FCFS")]}
+    results = [
+        case(algorithm="RR", ticks_per_sec=950.0),  # 5% slower
+        case(algorithm="SJF", ticks_per_sec=800.0),  # 20% slower
+        case(algorithm="FCFS", ticks_per_sec=1500.0),
+        case(algorithm="EDF", ticks_per_sec=10.0),  # not in the baseline
+        case(algorithm="RR", fast_path=False, ticks_per_sec=10.0),  # fast baseline doesn't apply
+    ]
+    assert bench.compare(results, baseline, 0.10) == [bench.case_key(results[1])]
+    assert [r["vs_baseline"] for r in results] == pytest.approx([-0.05, -0.2, 0.5, None, None])
+
+
+def test_main_saves_results_and_reports_regressions(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(P02)
+    out, baseline = str(tmp_path / "latest.json"), str(tmp_path / "baseline.json")
+    args = ["algorithms=FCFS,RR", "sizes=20", "cpus=2", "ios=1", "export=false",
+            f"out={out}", f"baseline={baseline}"]
+    assert bench.main(args + ["save_baseline=true"]) == 0
+    with open(out) as f:
+        results = json.load(f)["results"]
+    assert [r["algorithm"] for r in results] == ["FCFS", "RR"]
+    assert all(r["ticks"] > 0 and r["events"] > 0 for r in results)
+
+    # a baseline far faster than any real run makes every case a regression
+    with open(baseline) as f:
+        report = json.load(f)
+    for r in report["results"]:
+        r["ticks_per_sec"] *= 1000
+    with open(baseline, "w") as f:
+        json.dump(report, f)
+    assert bench.main(args) == 1
+    assert "Regressions" in capsys.readouterr().out
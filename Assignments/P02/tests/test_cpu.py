@@ -0,0 +1,105 @@
+"""
+Context-switch accounting and the overhead model on a CPU (pkg.cpu) and across forks
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.cpu import CPU
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+
+def test_first_dispatch_is_not_a_switch():
+    cpu = CPU(0, Clock(shared=False), switch_cost=3, dispatch_latency=1)
+    a, b = Process("a", [{"cpu": 5}]), Process("b", [{"cpu": 5}])
+
+    cpu.assign(a)
+    assert cpu.switches == 0
+    assert cpu.overhead_remaining == 1  # dispatch latency only
+
+    cpu.current = None
+    cpu.assign(a)  # the same process again
+    assert cpu.switches == 0
+    assert cpu.overhead_remaining == 1
+
+    cpu.current = None
+    cpu.assign(b)
+    assert cpu.switches == 1
+    assert cpu.overhead_remaining == 4
+
+
+def test_switch_overhead_in_a_run():
+    # Two processes round robin on one CPU: a, b, a, b, a with quantum 2
+    sched = Scheduler(num_cpus=1, num_ios=1, verbose=False, algorithm="RR",
+                      clock=Clock(shared=False), switch_cost=1)
+    sched.add_process(Process("a", [{"cpu": 6}], quantum=2))
+    sched.add_process(Process("b", [{"cpu": 4}], quantum=2))
+    sched.run()
+    metrics = sched.cpu_metrics()
+    assert metrics["switches"] == 4
+    assert metrics["overhead_time"] == 4
+
+
+def test_fork_keeps_switch_counts():
+    sched = Scheduler(num_cpus=2, num_ios=1, verbose=False, algorithm="RR",
+                      clock=Clock(shared=False), switch_cost=2)
+    for i in range(6):
+        sched.add_process(Process(f"p{i}", [{"cpu": 7}, {"io": {"duration": 3}}, {"cpu": 5}], quantum=2))
+    full = sched.fork()
+    full.run()
+    sched.run_until(15)
+    fork = sched.fork()
+    fork.run()
+    assert fork.cpu_metrics() == full.cpu_metrics()
+
+
+def test_migration_and_numa_penalties():
+    clock = Clock(shared=False)
+    cpus = [CPU(0, clock, migration_penalty=2, node=0, numa_penalty=5),
+            CPU(1, clock, migration_penalty=2, node=0, numa_penalty=5),
+            CPU(2, clock, migration_penalty=2, node=1, numa_penalty=5)]
+    proc = Process("p", [{"cpu": 9}])
+    overheads = []
+    for cid in (0, 0, 1, 2, 2):
+        cpus[cid].current = None
+        cpus[cid].assign(proc)
+        overheads.append(cpus[cid].overhead_remaining)
+    assert overheads == [0, 0, 2, 7, 0]
+    assert [cpu.migrations for cpu in cpus] == [0, 1, 1]
+    assert [cpu.node_migrations for cpu in cpus] == [0, 0, 1]
+
+
+def test_overhead_is_paid_before_the_burst_and_not_from_the_quantum():
+    sched = Scheduler(num_cpus=1, num_ios=1, verbose=False, algorithm="RR",
+                      clock=Clock(shared=False), switch_cost=2, dispatch_latency=1)
+    sched.add_process(Process("a", [{"cpu": 4}], quantum=2))
+    sched.add_process(Process("b", [{"cpu": 2}], quantum=2))
+    sched.run()
+    # a (1 tick latency), b (1 + 2 for the switch), a again (1 + 2)
+    assert sched.cpus[0].overhead_time == 7
+    assert sched.cpus[0].busy_time == 6
+    # with the overhead taken from the quantum, a would need three slices
+    assert [e["process"] for e in sched.events if e["event_type"] == "preempted"] == ["a"]
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR"])
+def test_overhead_adds_up_over_a_run(algorithm):
+    # FCFS and RR never preempt a process that is still paying overhead,
+    # so every tick charged is paid
+    _, jobs = generated_workloads(n=40)[0]
+    costs = {"switch_cost": 2, "migration_penalty": 3, "dispatch_latency": 1}
+    sched = Scheduler(num_cpus=3, num_ios=2, verbose=False, algorithm=algorithm,
+                      clock=Clock(shared=False), **costs)
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    sched.run()
+    metrics = sched.cpu_metrics()
+    dispatches = sum(1 for e in sched.events if e["event_type"] == "dispatch_cpu")
+    assert metrics["migrations"] > 0
+    assert metrics["overhead_time"] == (costs["switch_cost"] * metrics["switches"]
+                                        + costs["migration_penalty"] * metrics["migrations"]
+                                        + costs["dispatch_latency"] * dispatches)
+    assert sum(cpu.busy_time for cpu in sched.cpus) == sum(
+        burst["cpu"] for job in jobs for burst in job["bursts"] if "cpu" in burst)
+    assert metrics["utilization"] + metrics["overhead_share"] <= 1
@@ -0,0 +1,189 @@
+"""
+Disk model (pkg.diskDevice) against brute-force references
+
+BlockIndex is checked against a plain sorted list. The disk queue policies
+are checked against a reference that re-sorts every queued request on each
+pick: requests in (block, arrival sequence) order, with the head moving
+forwards or backwards through that order.
+"""
+import random
+
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.diskDevice import DISK_BLOCKS, DISK_POLICIES, BlockIndex, DiskDevice, DiskQueue
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+
+# ---- BlockIndex ----
+def brute_after(pairs, block):
+    found = [p for p in sorted(pairs) if p[0] >= block]
+    return (found[0][0], min(s for b, s in found if b == found[0][0])) if found else None
+
+
+def brute_before(pairs, block):
+    found = [p for p in sorted(pairs) if p[0] <= block]
+    return (found[-1][0], max(s for b, s in found if b == found[-1][0])) if found else None
+
+
+@pytest.mark.parametrize("span", [4, 1000, 3 * DISK_BLOCKS])
+def test_block_index_matches_sorted_list(span):
+    rng = random.Random(span)
+    index = BlockIndex()
+    pairs = set()
+    seq = 0
+    for _ in range(2000):
+        if pairs and rng.random() < 0.45:
+            block, s = rng.choice(sorted(pairs))
+            index.discard(block, s)
+            pairs.remove((block, s))
+        else:
+            block = rng.randrange(span)
+            index.add(block, seq)
+            pairs.add((block, seq))
+            seq += 1
+        assert len(index) == len(pairs)
+        probe = rng.randrange(-1, span + 2)
+        assert index.at_or_after(probe) == brute_after(pairs, probe)
+        assert index.at_or_before(probe) == brute_before(pairs, probe)
+        assert index.around(probe) == (brute_before(pairs, probe - 1), brute_after(pairs, probe))
+        assert index.first() == brute_after(pairs, 0)
+        assert index.last() == brute_before(pairs, span + 2)
+
+
+def test_block_index_rejects_negative_blocks():
+    with pytest.raises(ValueError):
+        BlockIndex().add(-1, 0)
+
+
+# ---- queue policies ----
+class ReferenceQueue:
+    """The disk queue policies written out directly, O(n log n) per pick"""
+
+    def __init__(self, policy, read_expire=50, write_expire=250):
+        self.policy = policy
+        self.read_expire = read_expire
+        self.write_expire = write_expire
+        self.entries = []  # (block, seq, process, expiry)
+        self.next_seq = 0
+        self.front_seq = 0
+
+    def add(self, process, now, front=False):
+        io = process.current_burst()["io"]
+        expire = self.write_expire if "WRITE" in io["type"] else self.read_expire
+        if front:
+            self.front_seq -= 1
+            seq = self.front_seq
+        else:
+            seq = self.next_seq
+            self.next_seq += 1
+        self.entries.append((io["block"], seq, process, now + expire))
+
+    def pop(self, disk, now):
+        order = sorted(self.entries, key=lambda e: (e[0], e[1]))
+        after = [e for e in order if e[0] >= disk.head]
+        if self.policy == "FIFO":
+            chosen = min(order, key=lambda e: e[1])
+        elif self.policy == "SSTF":
+            below = [e for e in order if e[0] < disk.head][-1:]
+            chosen = min(below + after[:1], key=lambda e: (abs(e[0] - disk.head), e[1]))
+        elif self.policy == "C-SCAN":
+            chosen = after[0] if after else order[0]
+        elif self.policy == "DEADLINE":
+            expired = [e for e in order if e[3] <= now]
+            if expired:
+                chosen = min(expired, key=lambda e: (e[3], e[1]))
+            else:
+                chosen = after[0] if after else order[0]
+        elif disk.direction > 0:  # SCAN
+            chosen = after[0] if after else order[-1]
+            disk.direction = 1 if after else -1
+        else:
+            at_or_below = [e for e in order if e[0] <= disk.head]
+            chosen = at_or_below[-1] if at_or_below else order[0]
+            disk.direction = -1 if at_or_below else 1
+        self.entries.remove(chosen)
+        return chosen[2]
+
+
+class ReferenceDisk:
+    def __init__(self):
+        self.head = 0
+        self.direction = 1
+        self.seek_distance = 0
+
+    def serve(self, block):
+        if block != self.head:
+            self.direction = 1 if block > self.head else -1
+        self.seek_distance += abs(block - self.head)
+        self.head = block
+
+
+def request(pid, rng, span):
+    io_type = rng.choice(["DISK_READ", "DISK_WRITE"])
+    return Process(pid, [{"io": {"type": io_type, "duration": 1, "block": rng.randrange(span)}}])
+
+
+@pytest.mark.parametrize("disks", [1, 3])
+@pytest.mark.parametrize("span", [20, DISK_BLOCKS])
+@pytest.mark.parametrize("policy", DISK_POLICIES)
+def test_service_order_and_seek_distance(policy, span, disks):
+    rng = random.Random(f"{policy}-{span}-{disks}")
+    clock = Clock(shared=False)
+    queue = DiskQueue(clock, policy)
+    reference = ReferenceQueue(policy)
+    devices = [DiskDevice(i, clock) for i in range(disks)]
+    ref_devices = [ReferenceDisk() for _ in range(disks)]
+
+    served, expected = [], []
+    pid = 0
+    for now in range(400):
+        clock.time = now
+        for _ in range(rng.choice([0, 1, 1, 2, 4])):
+            proc = request(pid, rng, span)
+            front = rng.random() < 0.1
+            (queue.appendleft if front else queue.append)(proc)
+            reference.add(proc, now, front)
+            pid += 1
+        d = rng.randrange(disks)
+        if len(queue) and rng.random() < 0.7:
+            proc = devices[d].take(queue)
+            devices[d].assign(proc)
+            devices[d].current = None
+            served.append(proc.pid)
+            ref_proc = reference.pop(ref_devices[d], now)
+            ref_devices[d].serve(ref_proc.current_burst()["io"]["block"])
+            expected.append(ref_proc.pid)
+        assert served == expected
+
+    assert [dev.seek_distance for dev in devices] == [ref.seek_distance for ref in ref_devices]
+    assert [(dev.head, dev.direction) for dev in devices] == [(ref.head, ref.direction) for ref in ref_devices]
+
+
+# ---- forks ----
+WORKLOADS = generated_workloads(n=40)[:3]
+
+
+@pytest.mark.parametrize("fork_at", [5, 97, 250])
+@pytest.mark.parametrize("policy", DISK_POLICIES)
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_forked_disk_queues_continue_the_run(name, jobs, policy, fork_at):
+    def make():
+        sched = Scheduler(verbose=False, clock=Clock(shared=False), algorithm="RR", num_cpus=2,
+                          io_config={"DISK": 2, "NIC": 1, "GENERIC_IO": 1}, disk_policy=policy)
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        return sched
+
+    full = make()
+    full.run()
+    sched = make()
+    sched.run_until(fork_at)
+    fork = sched.fork()
+    fork.run()
+
+    assert sorted((p.pid, p.finish_time) for p in fork.finished) == \
+        sorted((p.pid, p.finish_time) for p in full.finished)
+    assert fork.io_metrics()["DISK"] == full.io_metrics()["DISK"]
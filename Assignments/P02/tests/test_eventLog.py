@@ -0,0 +1,97 @@
+"""
+Leveled, buffered scheduler log (pkg.eventLog)
+"""
+import io
+
+import pytest
+
+from conftest import generated_workloads
+from pkg import eventLog
+from pkg.clock import Clock
+from pkg.eventLog import DEBUG, INFO, WARNING, EventLog, parse_level
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+
+def test_levels():
+    assert parse_level("Info") == INFO and parse_level(25) == 25
+    with pytest.raises(ValueError):
+        parse_level("verbose")
+    log = EventLog(level="info", capacity=None)
+    assert not log.enabled(DEBUG) and log.enabled(INFO)
+    for level, line in [(DEBUG, "d"), (INFO, "i"), (WARNING, "w")]:
+        log.write(level, line)
+    assert list(log.lines) == ["i", "w"]
+    # a console at debug lowers the threshold for formatting
+    assert EventLog(level="warning", console=True, console_level="debug").enabled(DEBUG)
+    assert not EventLog(level="off").enabled(WARNING)
+
+
+def test_ring_buffer_keeps_the_last_lines():
+    log = EventLog(capacity=3)
+    for i in range(10):
+        log.write(INFO, str(i))
+    assert list(log.lines) == ["7", "8", "9"]
+
+
+def test_file_is_written_in_batches(tmp_path):
+    path = tmp_path / "run.log"
+    log = EventLog(filename=str(path), flush_every=3)
+    log.write(INFO, "a")
+    log.write(INFO, "b")
+    assert not path.exists()
+    log.write(INFO, "c")
+    assert path.read_text() == "a\nb\nc\n"
+    log.write(DEBUG, "d")
+    log.close()
+    assert path.read_text() == "a\nb\nc\nd\n"
+
+
+def test_console_sampling_reports_skipped_lines():
+    out = io.StringIO()
+    log = EventLog(console=True, console_every=3, stream=out)
+    for i in range(1, 11):
+        log.write(INFO, f"line {i}")
+    shown = "... 2 log lines not shown\n"
+    assert out.getvalue() == "line 1\n" + shown + "line 4\n" + shown + "line 7\n" + shown + "line 10\n"
+    assert log.suppressed == 6
+    assert len(log.lines) == 10  # sampling only thins the console
+
+
+def test_console_rate_limit(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(eventLog.time, "monotonic", lambda: now[0])
+    out = io.StringIO()
+    log = EventLog(console=True, console_rate=2, stream=out)
+    for i in range(5):
+        log.write(INFO, f"burst {i}")
+    assert out.getvalue() == "burst 0\nburst 1\n"
+    assert log.suppressed == 3
+    now[0] += 0.5  # half a second refills one line
+    log.write(INFO, "later")
+    log.write(INFO, "dropped")
+    assert out.getvalue().endswith("... 3 log lines not shown\nlater\n")
+    assert log.suppressed == 4
+
+
+def run(event_log):
+    _, jobs = generated_workloads(n=40)[0]
+    sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm="RR",
+                      clock=Clock(shared=False), event_log=event_log)
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    sched.run()
+    return sched
+
+
+def test_scheduler_lines_follow_the_event_levels():
+    full = run(EventLog(capacity=None))
+    assert len(full.log) == len(full.events)
+
+    info = run(EventLog(level="info", capacity=None))
+    assert info.events == full.events  # the timeline doesn't depend on the log
+    expected = [e["event"] for e in full.events if e["event_type"] in ("arrival", "finished")]
+    assert [line.split(" | ", 1)[1] for line in info.log] == expected
+
+    off = run(EventLog(level="off"))
+    assert not off.log and off.events == full.events
@@ -0,0 +1,98 @@
+"""
+Stride and lottery fair-share scheduling (pkg.fairShare)
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.fairShare import FairShareQueue, parse_shares
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+SHARES = {"A": 1, "B": 3, "C": 2}
+
+
+def test_parse_shares():
+    assert parse_shares("A:1,B:3,C") == {"A": 1.0, "B": 3.0, "C": 1.0}
+
+
+def run_queue(queue, ticks):
+    """Pick a process, charge it one tick and put it back, 'ticks' times"""
+    picks = {}
+    for _ in range(ticks):
+        proc = queue.popleft()
+        queue.charge(proc)
+        picks[proc.class_id] = picks.get(proc.class_id, 0) + 1
+        queue.append(proc)
+    return picks
+
+
+def always_ready_queue(policy, seed=None):
+    queue = FairShareQueue(policy, SHARES, seed=seed)
+    for class_id in SHARES:
+        for i in range(3):
+            queue.append(Process(f"{class_id}{i}", [{"cpu": 10 ** 6}], class_id=class_id))
+    return queue
+
+
+def test_stride_picks_exactly_in_proportion():
+    picks = run_queue(always_ready_queue("Stride"), 6000)
+    assert picks == {"A": 1000, "B": 3000, "C": 2000}
+
+
+def test_lottery_picks_roughly_in_proportion():
+    picks = run_queue(always_ready_queue("Lottery", seed=11), 60000)
+    for class_id, share in SHARES.items():
+        assert picks[class_id] / 60000 == pytest.approx(share / 6, abs=0.01)
+
+
+@pytest.mark.parametrize("algorithm", ["Stride", "Lottery"])
+def test_cpu_share_over_a_long_run(algorithm):
+    # CPU-bound processes in every class, so every class always has work ready
+    sched = Scheduler(num_cpus=2, num_ios=1, verbose=False, algorithm=algorithm,
+                      clock=Clock(shared=False), shares=SHARES, seed=3, record=False)
+    for class_id in SHARES:
+        for i in range(4):
+            sched.add_process(Process(f"{class_id}{i}", [{"cpu": 3000}], quantum=5, class_id=class_id))
+    sched.run_until(6000)
+    for class_id, row in sched.metrics()["fair_share"].items():
+        assert row["actual"] == pytest.approx(row["target"], abs=0.02), class_id
+
+
+def test_classes_returning_from_idle_start_at_the_current_pass():
+    queue = FairShareQueue("Stride", {"A": 1, "B": 1})
+    a = Process("a", [{"cpu": 100}], class_id="A")
+    queue.append(a)
+    run_queue(queue, 50)  # A alone for 50 ticks
+    queue.append(Process("b", [{"cpu": 100}], class_id="B"))
+    # B can't claim the 50 ticks it was idle for: the two now alternate
+    picks = run_queue(queue, 20)
+    assert picks == {"A": 10, "B": 10}
+
+
+WORKLOADS = generated_workloads(n=40)[:2]
+
+
+@pytest.mark.parametrize("fork_at", [3, 97, 400])
+@pytest.mark.parametrize("algorithm", ["Stride", "Lottery"])
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_fork_continues_the_same_way(name, jobs, algorithm, fork_at):
+    def make():
+        sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm=algorithm,
+                          clock=Clock(shared=False), shares={"A": 1, "B": 3, "C": 2, "D": 1}, seed=7)
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        return sched
+
+    full = make()
+    full.run()
+    sched = make()
+    sched.run_until(fork_at)
+    fork = sched.fork()
+    fork.run()
+
+    forked_at = sched.clock.now()
+    assert [e for e in fork.events if e["time"] > forked_at] == [e for e in full.events if e["time"] > forked_at]
+    assert sorted((p.pid, p.finish_time) for p in fork.finished) == \
+        sorted((p.pid, p.finish_time) for p in full.finished)
+    assert fork.metrics()["fair_share"] == full.metrics()["fair_share"]
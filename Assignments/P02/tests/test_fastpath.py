@@ -0,0 +1,67 @@
+"""
+The per-policy fast step (pkg.fastpath) against the generic Scheduler step
+
+Every basic policy runs each workload twice, fast_path=True and False, and
+the timelines (structured events, log lines, state callbacks) and metrics
+must be identical. Forks taken mid-run must carry on identically as well.
+"""
+import pytest
+
+from conftest import all_workloads
+from pkg.clock import Clock
+from pkg.fastpath import POLICIES
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+WORKLOADS = all_workloads()
+
+CONFIGS = {
+    "1cpu-1io": {"num_cpus": 1, "num_ios": 1},
+    "2cpu-2io": {"num_cpus": 2, "num_ios": 2},
+    "typed-io-costs": {"num_cpus": 2, "io_config": {"DISK": 1, "NIC": 1, "GENERIC_IO": 1},
+                       "switch_cost": 1, "migration_penalty": 2, "dispatch_latency": 1},
+    "no-record": {"num_cpus": 3, "num_ios": 1, "record": False},
+}
+
+
+def make(jobs, fast_path, **config):
+    sched = Scheduler(verbose=False, clock=Clock(shared=False), fast_path=fast_path, **config)
+    changes = []
+    sched.on_state_change(lambda pid, state: changes.append((sched.clock.now(), pid, state)))
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    return sched, changes
+
+
+def outcome(sched, changes):
+    finished = sorted((p.pid, p.finish_time) for p in sched.finished)
+    return sched.events, list(sched.log), changes, finished, sched.metrics(), sched.clock.now()
+
+
+@pytest.mark.parametrize("config", CONFIGS.values(), ids=CONFIGS.keys())
+@pytest.mark.parametrize("algorithm", sorted(POLICIES))
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_run_matches_generic(name, jobs, algorithm, config):
+    results = []
+    for fast_path in (False, True):
+        sched, changes = make(jobs, fast_path, algorithm=algorithm, **config)
+        assert (sched._fast_policy is not None) == fast_path
+        sched.run()
+        results.append(outcome(sched, changes))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("algorithm", sorted(POLICIES))
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_steps_and_fork_match_generic(name, jobs, algorithm):
+    results = []
+    for fast_path in (False, True):
+        sched, changes = make(jobs, fast_path, algorithm=algorithm, num_cpus=2, num_ios=1)
+        for _ in range(25):
+            sched.step()
+        sched.run_until(60)
+        fork = sched.fork()
+        sched.run()
+        fork.run()
+        results.append((outcome(sched, changes), fork.events, fork.metrics()))
+    assert results[0] == results[1]
@@ -0,0 +1,64 @@
+"""
+Forking a run (Scheduler.fork) without overrides must not change its results
+
+The fork carries the processes, queues, devices and counters, so running
+it to the end reports the same finish times and metrics() as the run it
+was forked from would have.
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+WORKLOADS = generated_workloads(n=40)[:3]
+
+CONFIGS = {
+    "rr-switch-cost": dict(algorithm="RR", num_cpus=2, num_ios=2, switch_cost=1),
+    "srtf-disk": dict(algorithm="SRTF", num_cpus=3, io_config={"DISK": 2, "NIC": 1, "GENERIC_IO": 1},
+                      disk_policy="SSTF", migration_penalty=2),
+    "fcfs-async": dict(algorithm="FCFS", num_cpus=2, io_config={
+        "NIC": {"count": 1, "queue_depth": 8, "slots": 2, "coalesce": 3, "coalesce_timeout": 2},
+        "GENERIC_IO": 1}),
+    "stride": dict(algorithm="Stride", num_cpus=2, num_ios=1, shares={"A": 1, "B": 3}, switch_cost=1),
+    "lottery-numa": dict(algorithm="Lottery", num_cpus=2, num_ios=1, seed=4, numa_nodes=2,
+                         numa_penalty=3, migration_penalty=1),
+    "rr-fast-path": dict(algorithm="RR", num_cpus=4, num_ios=1, dispatch_latency=1, record=False),
+}
+
+
+def make(jobs, config):
+    sched = Scheduler(verbose=False, clock=Clock(shared=False), **config)
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    return sched
+
+
+@pytest.mark.parametrize("fork_at", [1, 60, 300])
+@pytest.mark.parametrize("config", CONFIGS.values(), ids=CONFIGS.keys())
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_fork_reproduces_metrics(name, jobs, config, fork_at):
+    full = make(jobs, config)
+    full.run()
+
+    sched = make(jobs, config)
+    sched.run_until(fork_at)
+    fork = sched.fork()
+    fork.run()
+
+    assert fork.metrics() == full.metrics()
+    assert sorted((p.pid, p.finish_time) for p in fork.finished) == \
+        sorted((p.pid, p.finish_time) for p in full.finished)
+
+
+def test_fork_with_fewer_cpus_keeps_counter_totals():
+    _, jobs = WORKLOADS[0]
+    sched = make(jobs, CONFIGS["rr-switch-cost"])
+    sched.run_until(200)
+    before = sched.cpu_metrics()
+    fork = sched.fork(num_cpus=1)
+    after = fork.cpu_metrics()
+    assert after["switches"] == before["switches"]
+    assert after["overhead_time"] == before["overhead_time"]
+    assert sum(cpu.busy_time for cpu in fork.cpus) == sum(cpu.busy_time for cpu in sched.cpus)
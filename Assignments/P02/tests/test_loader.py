@@ -0,0 +1,107 @@
+"""
+Job file cache (pkg.loader)
+
+Every test gets its own cache directory through $SCHEDULER_SIM_CACHE.
+Cache hits are recognised by load_jobs not parsing the JSON at all.
+"""
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import JOB_FILES
+from pkg import loader
+from pkg.loader import JobFileError, cache_path, load_jobs
+
+
+@pytest.fixture
+def job_file(tmp_path, monkeypatch):
+    monkeypatch.setenv(loader.CACHE_ENV, str(tmp_path / "cache"))
+    path = tmp_path / "jobs.json"
+    shutil.copy(JOB_FILES[0], path)
+    return str(path)
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """List that gets one entry per JSON parse load_jobs does"""
+    calls = []
+    parse_json = loader.parse_json
+
+    def counting(raw):
+        calls.append(len(raw))
+        return parse_json(raw)
+
+    monkeypatch.setattr(loader, "parse_json", counting)
+    return calls
+
+
+def edit(path):
+    """Rename the first job's pid "1" to "X", keeping the file's size"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    with open(path, "wb") as f:
+        f.write(raw.replace(b'"pid": "1"', b'"pid": "X"', 1))
+
+
+def test_second_load_is_a_cache_hit(job_file, parses):
+    first = load_jobs(job_file)
+    assert len(parses) == 1
+    assert os.path.exists(cache_path(job_file))
+    assert load_jobs(job_file) == first
+    assert len(parses) == 1
+
+
+def test_cache_is_bypassed_when_asked(job_file, parses):
+    load_jobs(job_file, cache=False)
+    assert not os.path.exists(cache_path(job_file))
+    load_jobs(job_file)
+    load_jobs(job_file, cache=False)
+    assert len(parses) == 3
+
+
+def test_changed_content_invalidates_the_cache(job_file, parses):
+    first = load_jobs(job_file)
+    size = os.path.getsize(job_file)
+    stat = os.stat(job_file)
+    edit(job_file)
+    os.utime(job_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))  # same size and mtime
+    assert os.path.getsize(job_file) == size
+
+    second = load_jobs(job_file)
+    assert len(parses) == 2
+    assert second[0]["pid"] == "X"
+    assert second[1:] == first[1:]
+    assert load_jobs(job_file) == second  # and the new content is cached
+    assert len(parses) == 2
+
+
+@pytest.mark.parametrize("garbage", [b"", b"not a pickle", b"\x80\x05\x95truncated"])
+def test_corrupt_cache_file_is_replaced(job_file, parses, garbage):
+    expected = load_jobs(job_file)
+    with open(cache_path(job_file), "wb") as f:
+        f.write(garbage)
+    assert load_jobs(job_file) == expected
+    assert load_jobs(job_file) == expected
+    assert len(parses) == 2  # parsed again once, then the rewritten cache is used
+
+
+@pytest.mark.skipif(not hasattr(os, "getuid"), reason="POSIX permissions")
+def test_cache_others_can_write_is_ignored(job_file, parses):
+    load_jobs(job_file)
+    os.chmod(cache_path(job_file), 0o666)
+    load_jobs(job_file)
+    assert len(parses) == 2
+
+
+def test_cache_hit_still_checks_affinity(job_file, parses):
+    with open(job_file) as f:
+        jobs = json.load(f)
+    jobs[0]["affinity"] = [3]
+    with open(job_file, "w") as f:
+        json.dump(jobs, f)
+    assert load_jobs(job_file, num_cpus=4)[0]["affinity"] == [3]
+    with pytest.raises(JobFileError):
+        load_jobs(job_file, num_cpus=2)
+    assert len(parses) == 1
@@ -0,0 +1,58 @@
+"""
+Headless runs of main.py: one JSON line of metrics on stdout
+
+main.py runs as a script from the P02 folder, like a harness would run it.
+Headless mode needs neither rich nor pygame.
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import JOB_FILES, P02
+from pkg.clock import Clock
+from pkg.loader import load_jobs, to_processes
+from pkg.scheduler import Scheduler
+
+
+def run_main(tmp_path, *args):
+    env = dict(os.environ, SCHEDULER_SIM_CACHE=str(tmp_path / "cache"))
+    return subprocess.run([sys.executable, "main.py", "headless=true", *args], cwd=P02, env=env,
+                          capture_output=True, text=True, timeout=120)
+
+
+@pytest.mark.parametrize("algorithm, cpus", [("RR", 1), ("SRTF", 2), ("EDF", 2)])
+def test_headless_prints_the_metrics_as_json(tmp_path, algorithm, cpus):
+    result = run_main(tmp_path, "file_num=1", f"algorithm={algorithm}", f"cpus={cpus}")
+    assert result.returncode == 0, result.stderr
+    lines = result.stdout.splitlines()
+    assert len(lines) == 1  # everything else went to stderr
+    metrics = json.loads(lines[0])
+
+    sched = Scheduler(num_cpus=cpus, num_ios=1, verbose=False, algorithm=algorithm,
+                      clock=Clock(shared=False), record=False)
+    for p in to_processes(load_jobs(JOB_FILES[0], cache=False)):
+        sched.add_process(p)
+    sched.run()
+    assert metrics.pop("processes") == len(sched.finished)
+    assert metrics.pop("wall_time") >= 0
+    assert metrics == json.loads(json.dumps(sched.metrics()))
+
+
+def test_headless_options_reach_the_scheduler(tmp_path):
+    result = run_main(tmp_path, "file_num=1", "algorithm=RR", "cpus=2", "switch_cost=2",
+                      "io_config=DISK:1,GENERIC_IO:1", "profile=true")
+    assert result.returncode == 0, result.stderr
+    metrics = json.loads(result.stdout)
+    assert metrics["cpu"]["overhead_time"] == 2 * metrics["cpu"]["switches"] > 0
+    assert set(metrics["io"]) == {"DISK", "GENERIC_IO"}
+    assert metrics["profile"]["steps"] == metrics["time"]
+
+
+def test_headless_failure_exits_non_zero_with_nothing_on_stdout(tmp_path):
+    result = run_main(tmp_path, "file_num=9999")
+    assert result.returncode == 1
+    assert result.stdout == ""
+    assert "Could not find file" in result.stderr
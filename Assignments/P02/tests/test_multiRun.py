@@ -0,0 +1,72 @@
+"""
+Many workloads in one interpreter (pkg.multiRun) against separate Scheduler runs
+"""
+import pytest
+
+from conftest import JOB_FILES, generated_workloads
+from pkg.clock import Clock
+from pkg.loader import load_jobs
+from pkg.multiRun import COLUMNS, format_table, run_workloads
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+CONFIGS = [
+    {"algorithm": "FCFS"},
+    {"algorithm": "RR", "num_cpus": 2, "num_ios": 2},
+    {"algorithm": "SRTF", "num_cpus": 2, "io_config": {"DISK": 1, "GENERIC_IO": 1}, "disk_policy": "SSTF"},
+    {"algorithm": "EDF", "num_cpus": 3, "switch_cost": 1},
+    {"algorithm": "Stride", "num_cpus": 2, "shares": {"A": 1, "B": 2, "C": 1, "D": 1}},
+    {"algorithm": "RR", "quantum_policy": "adaptive"},
+]
+
+
+@pytest.fixture(autouse=True)
+def private_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCHEDULER_SIM_CACHE", str(tmp_path / "cache"))
+
+
+def separate_run(jobs, config):
+    sched = Scheduler(verbose=False, clock=Clock(shared=False), **config)
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    sched.run()
+    return sched.metrics()
+
+
+@pytest.mark.parametrize("slice_ticks", [1, 7, 1000])
+def test_rows_match_separate_runs(slice_ticks):
+    generated = [jobs for _, jobs in generated_workloads(n=40)[:2]]
+    workloads = JOB_FILES[:3] + generated
+    table = run_workloads(workloads, CONFIGS, slice_ticks=slice_ticks)
+    assert set(table) == set(COLUMNS)
+    assert len(table["workload"]) == len(workloads) * len(CONFIGS)
+
+    row = 0
+    for workload in workloads:
+        jobs = load_jobs(workload) if isinstance(workload, str) else workload
+        for c, config in enumerate(CONFIGS):
+            m = separate_run(jobs, config)
+            assert table["config"][row] == c
+            assert table["error"][row] is None
+            for key in ("algorithm", "cpus", "ios", "time", "finished", "avg_turnaround", "avg_wait",
+                        "max_wait", "throughput"):
+                assert table[key][row] == m[key], (workload, config, key)
+            assert table["cpu_utilization"][row] == m["cpu"]["utilization"]
+            assert table["switches"][row] == m["cpu"]["switches"]
+            row += 1
+
+
+def test_a_bad_config_fails_only_its_own_rows():
+    table = run_workloads(JOB_FILES[:2], [{"algorithm": "RR"}, {"algorithm": "RR", "no_such_option": 1}])
+    assert table["error"][0] is None and table["error"][2] is None
+    assert table["error"][1].startswith("TypeError") and table["error"][3].startswith("TypeError")
+    assert table["time"][1] is None
+    assert table["workload"] == ["process_file_0001.json"] * 2 + ["process_file_0002.json"] * 2
+    assert len(format_table(table).splitlines()) == 2 + 4
+
+
+def test_settings_it_owns_are_refused():
+    with pytest.raises(ValueError):
+        run_workloads(JOB_FILES[:1], [{"algorithm": "RR", "record": True}])
+    with pytest.raises(ValueError):
+        run_workloads(JOB_FILES[:1], [{"algorithm": "RR"}], slice_ticks=0)
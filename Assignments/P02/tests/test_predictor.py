@@ -0,0 +1,81 @@
+"""
+CPU burst predictors for SJF / SRTF (pkg.predictor)
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.predictor import BurstPredictor, ExponentialPredictor, make_predictor
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+
+class LastBurst(BurstPredictor):
+    """Predicts the last burst again"""
+
+    name = "last"
+
+    def estimate(self, predicted, length):
+        return length
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        BurstPredictor()
+
+    class NoEstimate(BurstPredictor):
+        pass
+
+    with pytest.raises(TypeError):
+        NoEstimate()
+    assert LastBurst().predict(Process("p", [{"cpu": 3}])) == 5
+
+
+def test_exponential_average_by_hand():
+    predictor = ExponentialPredictor(alpha=0.5, initial=5)
+    proc = Process("p", [{"cpu": 9}, {"cpu": 3}])
+    assert predictor.predict(proc) == 5
+    predictor.observe(proc, 9)
+    assert predictor.predict(proc) == 7  # 0.5 * 9 + 0.5 * 5
+    predictor.observe(proc, 3)
+    assert predictor.predict(proc) == 5  # 0.5 * 3 + 0.5 * 7
+    # a process with no history gets the mean burst seen so far
+    assert predictor.predict(Process("q", [{"cpu": 1}])) == 6
+    assert predictor.metrics() == {"predictor": "ema", "bursts": 2, "mean_abs_error": 4.0,
+                                   "mean_error": 0.0, "mean_burst": 6.0, "alpha": 0.5}
+
+
+def test_make_predictor():
+    assert make_predictor(None) is None
+    custom = LastBurst()
+    assert make_predictor(custom) is custom
+    assert make_predictor("ema", alpha=0.25).alpha == 0.25
+    with pytest.raises(ValueError):
+        make_predictor("oracle")
+    with pytest.raises(ValueError):
+        ExponentialPredictor(alpha=1.5)
+
+
+@pytest.mark.parametrize("algorithm", ["SJF", "SRTF"])
+def test_subclass_drives_a_run_and_its_forks(algorithm):
+    _, jobs = generated_workloads(n=40)[0]
+
+    def make():
+        sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm=algorithm,
+                          clock=Clock(shared=False), predictor=LastBurst())
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        return sched
+
+    full = make()
+    full.run()
+    cpu_bursts = sum(1 for job in jobs for burst in job["bursts"] if "cpu" in burst)
+    assert full.metrics()["prediction"]["bursts"] == cpu_bursts
+    assert full.metrics()["prediction"]["predictor"] == "last"
+
+    sched = make()
+    sched.run_until(120)
+    fork = sched.fork()
+    fork.run()
+    assert fork.metrics()["prediction"] == full.metrics()["prediction"]
+    assert sched.predictor.bursts < cpu_bursts  # the fork learned on its own copy
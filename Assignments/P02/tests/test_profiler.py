@@ -0,0 +1,66 @@
+"""
+Per-phase profiling of Scheduler.step() (pkg.profiler)
+"""
+import json
+
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.profiler import StepProfiler
+from pkg.scheduler import Scheduler
+
+_, JOBS = generated_workloads(n=40)[2]
+
+
+def make(profile, algorithm="RR"):
+    sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm=algorithm,
+                      clock=Clock(shared=False), profile=profile)
+    for job in JOBS:
+        sched.add_process(Process.from_dict(job))
+    return sched
+
+
+@pytest.mark.parametrize("bucket, length", [("0", 0), ("1", 1), ("2-3", 2), ("2-3", 3), ("4-7", 7), ("64-127", 100)])
+def test_bucket(bucket, length):
+    assert StepProfiler.bucket(length) == bucket
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "SRTF", "EDF"])
+def test_profiling_does_not_change_the_run(algorithm):
+    plain, profiled = make(False, algorithm), make(True, algorithm)
+    plain.run()
+    profiled.run()
+    assert profiled.events == plain.events
+    assert "profile" not in plain.metrics()
+    assert plain.profiler is None
+
+
+def test_every_step_and_phase_is_counted():
+    sched = make(True)
+    sched.run()
+    profile = sched.metrics()["profile"]
+    steps = profile["steps"]
+    assert steps == sched.clock.now()
+    for phase in ("arrivals", "cpu_tick", "io_tick", "cpu_dispatch", "io_dispatch"):
+        assert profile["phases"][phase]["calls"] == steps, phase
+    # one _record call per timeline event
+    assert profile["phases"]["record"]["calls"] == len(sched.events)
+    assert sum(profile["ready_queue_histogram"].values()) == steps
+    timed = sum(profile["phases"][p]["seconds"] for p in profile["phases"] if p != "record")
+    assert 0 < timed <= profile["step_seconds"]
+    assert all(0 <= row["share"] <= 1 for row in profile["phases"].values())
+
+
+def test_export_json_writes_the_profile_next_to_it(tmp_path):
+    sched = make(True)
+    sched.run()
+    sched.export_json(str(tmp_path / "run.json"))
+    with open(tmp_path / "run.profile.json") as f:
+        assert json.load(f)["steps"] == sched.clock.now()
+
+    plain = make(False)
+    plain.run()
+    plain.export_json(str(tmp_path / "plain.json"))
+    assert not (tmp_path / "plain.profile.json").exists()
@@ -0,0 +1,107 @@
+"""
+EDF / rate-monotonic scheduling and deadline-miss accounting (pkg.realtime)
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.realtime import DeadlineQueue, deadline_key, period_key
+from pkg.scheduler import Scheduler
+
+
+def test_deadline_queue_order():
+    queue = DeadlineQueue(deadline_key)
+    procs = {
+        "late": Process("late", [{"cpu": 1}], deadline=50),
+        "none": Process("none", [{"cpu": 1}]),
+        "early": Process("early", [{"cpu": 1}], arrival_time=5, deadline=3),  # absolute 8
+        "tie1": Process("tie1", [{"cpu": 1}], deadline=20),
+        "tie2": Process("tie2", [{"cpu": 1}], arrival_time=10, deadline=10),
+        "implicit": Process("implicit", [{"cpu": 1}], period=30),  # deadline = period
+    }
+    for name in ("late", "none", "early", "tie1", "tie2", "implicit"):
+        queue.append(procs[name])
+    front = Process("front", [{"cpu": 1}], deadline=20)
+    queue.appendleft(front)  # ahead of the other deadline-20 jobs
+    queue.remove(procs["late"])
+    assert [p.pid for p in queue] == ["early", "front", "tie1", "tie2", "implicit", "none"]
+    assert queue.peek().pid == "early"
+    assert [queue.popleft().pid for _ in range(len(queue))] == ["early", "front", "tie1", "tie2", "implicit", "none"]
+    with pytest.raises(ValueError):
+        queue.remove(procs["late"])
+
+
+def test_period_key():
+    assert period_key(Process("p", [{"cpu": 1}], period=7)) == 7
+    assert period_key(Process("p", [{"cpu": 1}], deadline=7)) == float("inf")
+
+
+def run_three(algorithm):
+    """
+    One CPU, three jobs (finish times are the tick a job's last CPU tick runs in):
+        a: 4 ticks, arrives 0, deadline 20        -> absolute deadline 20
+        b: 3 ticks, arrives 1, deadline 5         -> 6
+        c: 2 ticks, arrives 2, period 3 (implicit) -> 5
+    """
+    sched = Scheduler(num_cpus=1, num_ios=1, verbose=False, algorithm=algorithm, clock=Clock(shared=False))
+    sched.add_process(Process("a", [{"cpu": 4}], deadline=20))
+    sched.add_process(Process("b", [{"cpu": 3}], arrival_time=1, deadline=5))
+    sched.add_process(Process("c", [{"cpu": 2}], arrival_time=2, period=3))
+    sched.run()
+    return {p.pid: p.finish_time for p in sched.finished}, sched.metrics()["deadlines"]
+
+
+def test_edf_meets_every_deadline():
+    # a runs at t=1, b preempts it, c preempts b at t=2 and runs 3-4,
+    # then b 5-6 (just in time) and a 7-9
+    finish, deadlines = run_three("EDF")
+    assert finish == {"a": 9, "b": 6, "c": 4}
+    assert deadlines["missed"] == 0
+    assert deadlines["max_lateness"] == 0
+    assert deadlines["avg_lateness"] == pytest.approx((-11 + 0 - 1) / 3)
+
+
+def test_rate_monotonic_misses_the_job_without_a_period():
+    # only c has a period, so only c preempts; a and b stay in arrival
+    # order and b runs 5-7, one tick past its deadline
+    finish, deadlines = run_three("RM")
+    assert finish == {"a": 9, "b": 7, "c": 4}
+    assert (deadlines["jobs"], deadlines["missed"], deadlines["max_lateness"]) == (3, 1, 1)
+    assert deadlines["lateness_histogram"] == {"1": 1}
+
+
+def test_fcfs_misses_are_counted_too():
+    # a 1-4, b 5-7 (1 late), c 8-9 (4 late)
+    finish, deadlines = run_three("FCFS")
+    assert finish == {"a": 4, "b": 7, "c": 9}
+    assert deadlines["missed"] == 2
+    assert deadlines["miss_rate"] == pytest.approx(2 / 3)
+    assert deadlines["lateness_histogram"] == {"1": 1, "4-7": 1}
+
+
+def test_no_deadlines_no_report():
+    sched = Scheduler(num_cpus=1, num_ios=1, verbose=False, algorithm="EDF", clock=Clock(shared=False))
+    sched.add_process(Process("a", [{"cpu": 2}]))
+    sched.run()
+    assert "deadlines" not in sched.metrics()
+
+
+@pytest.mark.parametrize("algorithm", ["EDF", "RM"])
+def test_fork_keeps_deadline_accounting(algorithm):
+    _, jobs = generated_workloads(n=40)[0]
+
+    def make():
+        sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm=algorithm, clock=Clock(shared=False))
+        for job in jobs:
+            sched.add_process(Process.from_dict(job))
+        return sched
+
+    full = make()
+    full.run()
+    assert full.metrics()["deadlines"]["jobs"] > 0
+    sched = make()
+    sched.run_until(200)
+    fork = sched.fork()
+    fork.run()
+    assert fork.metrics()["deadlines"] == full.metrics()["deadlines"]
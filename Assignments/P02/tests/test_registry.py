@@ -0,0 +1,72 @@
+"""
+Process registry (pkg.registry): pid index and per-state counts
+"""
+from collections import Counter
+
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.registry import ProcessRegistry
+from pkg.scheduler import Scheduler
+
+
+def test_counts_follow_state_changes():
+    registry = ProcessRegistry()
+    a, b = Process("a", [{"cpu": 1}]), Process("b", [{"cpu": 1}])
+    registry.register(a)
+    registry.register(b)
+    registry.register(a)  # again: no change
+    assert registry.counts() == {"new": 2}
+    a.state = "ready"
+    b.state = "ready"
+    a.state = "running"
+    assert registry.counts() == {"ready": 1, "running": 1}
+    assert registry.count("waiting") == 0
+    assert len(registry) == 2 and "a" in registry and "c" not in registry
+    assert registry.get("b") is b and registry.get("c") is None
+    assert set(registry) == {a, b}
+
+
+def test_replacing_a_pid_drops_the_old_process():
+    registry = ProcessRegistry()
+    old, new = Process("p", [{"cpu": 1}]), Process("p", [{"cpu": 1}])
+    old.state = "ready"
+    registry.register(old)
+    registry.register(new)
+    assert registry.get("p") is new
+    assert registry.counts() == {"new": 1}
+    old.state = "finished"  # no longer reports to the registry
+    assert registry.counts() == {"new": 1}
+
+
+def counted(sched):
+    return dict(Counter(p.state for p in sched.processes().values()))
+
+
+@pytest.mark.parametrize("algorithm", ["FCFS", "RR", "SRTF", "EDF", "Lottery"])
+def test_state_counts_match_the_processes_after_every_step(algorithm):
+    _, jobs = generated_workloads(n=40)[1]
+    sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm=algorithm,
+                      clock=Clock(shared=False), shares={"A": 1, "B": 1, "C": 1, "D": 1}, seed=1)
+    for job in jobs:
+        sched.add_process(Process.from_dict(job))
+    assert set(sched.processes()) == {job["pid"] for job in jobs}
+
+    fork = None
+    while sched.has_work():
+        sched.step()
+        assert sched.state_counts() == counted(sched), f"t={sched.clock.now()}"
+        running = sum(1 for cpu in sched.cpus if cpu.current is not None)
+        assert sched.state_counts().get("running", 0) == running
+        if sched.clock.now() == 100:
+            fork = sched.fork()
+    assert sched.state_counts() == {"finished": len(jobs)}
+
+    # the fork has its own registry, untouched by the parent finishing
+    assert fork.state_counts() == counted(fork)
+    assert fork.state_counts() != sched.state_counts()
+    assert all(fork.processes()[pid] is not p for pid, p in sched.processes().items())
+    fork.run()
+    assert fork.state_counts() == {"finished": len(jobs)}
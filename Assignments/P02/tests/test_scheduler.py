@@ -0,0 +1,68 @@
+"""
+Scheduler bookkeeping: the idle CPU / busy IO device bitmasks
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+
+_, JOBS = generated_workloads(n=40)[0]
+
+CONFIGS = {
+    "rr-fast": dict(algorithm="RR"),
+    "rr-generic": dict(algorithm="RR", fast_path=False),
+    "srtf-disk": dict(algorithm="SRTF", io_config={"DISK": 2, "NIC": 1, "GENERIC_IO": 1}),
+    "fcfs-async": dict(algorithm="FCFS", io_config={"GENERIC_IO": {"count": 2, "queue_depth": 4, "slots": 2}}),
+    "stride": dict(algorithm="Stride", shares={"A": 1, "B": 2, "C": 1, "D": 1}),
+    "edf-affinity": dict(algorithm="EDF", num_cpus=4),
+}
+
+
+def make(config):
+    options = dict(num_cpus=3, num_ios=2, verbose=False, clock=Clock(shared=False))
+    options.update(CONFIGS[config])
+    sched = Scheduler(**options)
+    for i, job in enumerate(JOBS):
+        proc = Process.from_dict(job)
+        if config == "edf-affinity" and i % 3 == 0:
+            proc.affinity = 1 << (i % 4)
+        sched.add_process(proc)
+    return sched
+
+
+def check_masks(sched):
+    idle = sum(cpu.bit for cpu in sched.cpus if not cpu.is_busy())
+    busy = sum(1 << dev.did for dev in sched.io_devices if dev.is_busy())
+    assert (sched._idle_cpus, sched._busy_ios) == (idle, busy), f"t={sched.clock.now()}"
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_masks_match_the_devices_after_every_step(config):
+    sched = make(config)
+    check_masks(sched)
+    steps = 0
+    while sched.has_work():
+        sched.step()
+        check_masks(sched)
+        steps += 1
+        if steps == 150:
+            # a fork rebuilds its masks from the devices it adopted
+            fork = sched.fork()
+            check_masks(fork)
+            fork.step()
+            check_masks(fork)
+    assert len(sched.finished) == len(JOBS)
+    assert sched._idle_cpus == sched._all_cpus and sched._busy_ios == 0
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_has_work_agrees_with_the_devices(config):
+    sched = make(config)
+    sched.run_until(120)
+    busy = any(cpu.is_busy() for cpu in sched.cpus) or any(dev.is_busy() for dev in sched.io_devices)
+    assert busy
+    assert sched.has_work()
+    sched.run()
+    assert not sched.has_work()
@@ -0,0 +1,107 @@
+"""
+Job traces in shared memory (pkg.sharedTrace)
+
+A worker process attaches to the block, as the simulation service's
+workers do, and describes every Process it builds; the description must
+equal the one for the Processes load_jobs + to_processes build.
+"""
+import json
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from conftest import all_workloads
+from pkg.clock import Clock
+from pkg.loader import load_jobs, to_processes
+from pkg.scheduler import Scheduler
+from pkg.sharedTrace import SharedTrace
+
+FIELDS = ("pid", "priority", "quantum", "arrival_time", "class_id", "deadline", "period",
+          "affinity", "total_cpu", "total_io")
+
+# every optional field, ints and floats mixed in deadline / period, and
+# affinity ids on both sides of the 64-bit boundary
+MIXED = [
+    {"pid": "a", "bursts": [{"cpu": 3}, {"io": 2}, {"cpu": 1}], "deadline": 10, "period": 2.5},
+    {"pid": "b", "bursts": [{"cpu": 4}, {"io": {"type": "DISK_READ", "duration": 3, "block": 812}}, {"cpu": 2}],
+     "deadline": 7.5, "period": 20, "affinity": [63], "class_id": "B", "priority": 2},
+    {"pid": "c", "bursts": [{"cpu": 2}, {"io": {"type": "NIC", "duration": 1}}, {"cpu": 5}],
+     "affinity": [70], "arrival_time": 4, "quantum": 2},
+    {"pid": 17, "bursts": [{"cpu": 6}], "affinity": [2, 0, 2], "deadline": 30},
+]
+
+
+def describe(processes):
+    """Everything a Scheduler reads from a Process, with exact types"""
+    return [
+        [(name, type(getattr(p, name)).__name__, getattr(p, name)) for name in FIELDS]
+        + [("bursts", p.bursts)]
+        for p in processes
+    ]
+
+
+def run(processes):
+    sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm="EDF", clock=Clock(shared=False))
+    for p in processes:
+        if p.affinity is None or p.affinity & 0b11:
+            sched.add_process(p)
+    sched.run()
+    return sched.events
+
+
+def attach_and_describe(name):
+    """Runs in a worker process"""
+    view = SharedTrace.attach(name)
+    try:
+        return describe(view.processes()), run(view.processes())
+    finally:
+        view.close()
+
+
+@pytest.fixture(scope="module")
+def worker():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        yield pool
+
+
+def write(tmp_path, jobs):
+    path = tmp_path / "jobs.json"
+    path.write_text(json.dumps(jobs))
+    return str(path)
+
+
+def check(jobs, worker):
+    trace = SharedTrace.create(jobs)
+    try:
+        seen, events = worker.submit(attach_and_describe, trace.name).result()
+    finally:
+        trace.close()
+        trace.unlink()
+    assert seen == describe(to_processes(jobs))
+    assert events == run(to_processes(jobs))
+
+
+def test_mixed_fields_survive_shared_memory(tmp_path, worker):
+    jobs = load_jobs(write(tmp_path, MIXED), cache=False)
+    check(jobs, worker)
+    types = {p.pid: (type(p.deadline), type(p.period)) for p in to_processes(jobs)}
+    assert types["a"] == (int, float) and types["b"] == (float, int)
+
+
+WORKLOADS = all_workloads()
+
+
+@pytest.mark.parametrize("name, jobs", WORKLOADS, ids=[name for name, _ in WORKLOADS])
+def test_workloads_survive_shared_memory(name, jobs, tmp_path, worker):
+    check(load_jobs(write(tmp_path, jobs), cache=False), worker)
+
+
+@pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="checks blocks in /dev/shm")
+def test_failed_create_frees_its_block():
+    before = set(os.listdir("/dev/shm"))
+    with pytest.raises(struct.error):  # doesn't fit the 64-bit burst array
+        SharedTrace.create([{"pid": "x", "bursts": [{"cpu": 2 ** 64}]}])
+    assert set(os.listdir("/dev/shm")) == before
+
@@ -0,0 +1,90 @@
+"""
+Trace publishing in the simulation service (pkg.simService)
+
+Blocks must outlive the requests queued for them, generated traces are
+bounded, and unseeded generate requests each get their own trace.
+"""
+import json
+import os
+import shutil
+
+import pytest
+
+from conftest import JOB_FILES
+from pkg.simService import SimulationService, TraceCache
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="checks blocks in /dev/shm")
+
+
+def published(name):
+    return os.path.exists(os.path.join("/dev/shm", name.lstrip("/")))
+
+
+@pytest.fixture
+def trace_file(tmp_path):
+    path = tmp_path / "trace.json"
+    shutil.copy(JOB_FILES[0], path)
+    return str(path)
+
+
+def rewrite(path):
+    """Change the file's size so the cache sees a new version"""
+    with open(path) as f:
+        jobs = json.load(f)
+    with open(path, "w") as f:
+        json.dump(jobs, f, indent=1)
+
+
+def test_changed_trace_keeps_old_block_until_released(trace_file):
+    cache = TraceCache()
+    try:
+        old = cache.ref({"trace": trace_file})
+        rewrite(trace_file)
+        new = cache.ref({"trace": trace_file})
+        assert new != old
+        assert published(old)  # a request still holds it
+        cache.release(old)
+        assert not published(old)
+        cache.release(new)
+        assert published(new)  # current version stays cached
+    finally:
+        cache.close()
+    assert not published(new)
+
+
+def test_generated_traces_are_bounded(tmp_path):
+    cache = TraceCache(max_generated=3)
+    try:
+        names = []
+        for seed in range(5):
+            names.append(cache.ref({"generate": {"workload": "standard", "n": 5, "seed": seed}}))
+            cache.release(names[-1])
+        assert len(cache.entries) == 3
+        assert [published(name) for name in names] == [False, False, True, True, True]
+    finally:
+        cache.close()
+
+
+def test_unseeded_generate_is_not_cached():
+    cache = TraceCache()
+    try:
+        request = {"generate": {"workload": "standard", "n": 5}}
+        first, second = cache.ref(request), cache.ref(request)
+        assert first != second
+        assert not cache.entries
+        cache.release(first)
+        cache.release(second)
+        assert not published(first) and not published(second)
+    finally:
+        cache.close()
+
+
+def test_requests_queued_across_a_trace_change(trace_file):
+    requests = [{"trace": trace_file, "algorithm": algorithm} for algorithm in ("RR", "FCFS", "SJF") * 10]
+    with SimulationService(workers=2) as service:
+        pending = [service._submit(request) for request in requests]
+        rewrite(trace_file)
+        pending += [service._submit(request) for request in requests]
+        results = [item.get() for item in pending]
+        assert [status for status, _ in results] == ["ok"] * len(results)
+        assert not service.traces.retired
@@ -0,0 +1,128 @@
+"""
+Random access over exported timelines (pkg.timelineReader)
+
+A run is exported with export_json and export_csv; every query on the
+files must give what filtering the in-memory events directly gives, with
+either line ending.
+"""
+import os
+
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+from pkg.timelineReader import TimelineReader, index_path
+
+_, JOBS = generated_workloads(n=40)[0]
+
+
+@pytest.fixture(scope="module")
+def run():
+    sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm="RR", clock=Clock(shared=False))
+    for job in JOBS:
+        sched.add_process(Process.from_dict(job))
+    sched.run()
+    return sched
+
+
+def to_crlf(path):
+    with open(path, "rb") as f:
+        data = f.read().replace(b"\r\n", b"\n")
+    with open(path, "wb") as f:
+        f.write(data.replace(b"\n", b"\r\n"))
+
+
+def to_lf(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data.replace(b"\r\n", b"\n"))
+
+
+@pytest.fixture(params=["json", "csv"])
+def export(request, run, tmp_path):
+    """Path of a fresh JSON or CSV export of the run"""
+    path = str(tmp_path / f"timeline.{request.param}")
+    getattr(run, f"export_{request.param}")(path)
+    return path
+
+
+def state_before(events, time):
+    latest = [e for e in events if e["time"] <= time]
+    return latest[-1] if latest else None
+
+
+@pytest.mark.parametrize("line_ending", [to_lf, to_crlf], ids=["lf", "crlf"])
+def test_reader_matches_the_events(run, export, line_ending):
+    line_ending(export)
+    events = run.events
+    last = events[-1]["time"]
+    with TimelineReader(export, interval=7) as tl:
+        assert len(tl) == len(events)
+        assert tl.time_range == (events[0]["time"], last)
+        assert list(tl.events()) == events
+
+        for start, end in [(0, 0), (5, 40), (33, 34), (last - 3, last + 10), (last + 1, None)]:
+            expected = [e for e in events if e["time"] >= start and (end is None or e["time"] <= end)]
+            assert list(tl.events(start, end)) == expected
+
+        for pid, device, event_type in [("3", None, None), (None, "CPU1", None),
+                                        (None, None, "dispatch_cpu"), ("7", "CPU0", "dispatch_cpu")]:
+            expected = [
+                e for e in events if 10 <= e["time"] <= 120
+                and (pid is None or e["process"] == pid)
+                and (device is None or e["device"] == device)
+                and (event_type is None or e["event_type"] == event_type)
+            ]
+            assert tl.query(10, 120, pid=pid, device=device, event_type=event_type) == expected
+
+        for time in [-1, 0, 1, 6, 7, 50, 99, last - 1, last, last + 5]:
+            latest = state_before(events, time)
+            state = tl.state_at(time)
+            if latest is None:
+                assert state is None
+                assert tl.on_device("CPU0", time) is None
+                continue
+            assert state["event_time"] == latest["time"]
+            for name in ("ready_queue", "wait_queue", "cpus", "ios"):
+                assert state[name] == latest[name]
+            assert tl.on_device("CPU1", time) == latest["cpus"][1]
+            assert tl.on_device("IO0", time) == latest["ios"][0]
+
+
+def test_crlf_file_reads_like_the_original(export, tmp_path):
+    crlf = str(tmp_path / ("crlf" + os.path.splitext(export)[1]))
+    with open(export, "rb") as f:
+        data = f.read()
+    with open(crlf, "wb") as f:
+        f.write(data.replace(b"\r\n", b"\n").replace(b"\n", b"\r\n"))
+    with TimelineReader(export, interval=5) as original, TimelineReader(crlf, interval=5) as converted:
+        assert len(converted) == len(original)
+        assert list(converted.events()) == list(original.events())
+        assert converted.state_at(77) == original.state_at(77)
+
+
+def test_index_is_rebuilt_when_the_file_changes(run, export):
+    with TimelineReader(export, interval=10) as tl:
+        assert len(tl) == len(run.events)
+    assert os.path.exists(index_path(export))
+
+    # shorter run, written over the same file: the old index no longer fits
+    sched = Scheduler(num_cpus=1, num_ios=1, verbose=False, algorithm="FCFS", clock=Clock(shared=False))
+    for job in JOBS[:3]:
+        sched.add_process(Process.from_dict(job))
+    sched.run()
+    getattr(sched, "export_" + os.path.splitext(export)[1][1:])(export)
+    with TimelineReader(export, interval=10) as tl:
+        assert len(tl) == len(sched.events)
+        assert list(tl.events()) == sched.events
+
+
+def test_on_device_rejects_unknown_devices(export):
+    with TimelineReader(export) as tl:
+        with pytest.raises(ValueError):
+            tl.on_device("GPU0", 10)
+        with pytest.raises(ValueError):
+            tl.on_device("CPU9", 10)
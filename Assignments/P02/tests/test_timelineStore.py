@@ -0,0 +1,93 @@
+"""
+Columnar timeline files (pkg.timelineStore)
+
+A run's events are written with every codec and with chunks small enough
+that queries cross chunk boundaries; reading them back, whole or filtered,
+must give exactly the in-memory events.
+"""
+import pytest
+
+from conftest import generated_workloads
+from pkg.clock import Clock
+from pkg.process import Process
+from pkg.scheduler import Scheduler
+from pkg.timelineStore import CODECS, COLUMNS, ColumnarTimeline, export_columnar
+
+_, JOBS = generated_workloads(n=40)[1]
+
+
+@pytest.fixture(scope="module")
+def events():
+    sched = Scheduler(num_cpus=2, num_ios=2, verbose=False, algorithm="SRTF", clock=Clock(shared=False))
+    for job in JOBS:
+        sched.add_process(Process.from_dict(job))
+    sched.run()
+    return sched.events
+
+
+@pytest.fixture(scope="module", ids=lambda p: f"{p[0]}-{p[1]}",
+                params=[(codec, chunk_size) for codec in CODECS for chunk_size in (17, 65536)])
+def timeline(request, events, tmp_path_factory):
+    codec, chunk_size = request.param
+    path = str(tmp_path_factory.mktemp(codec) / "timeline.tlc")
+    export_columnar(events, path, codec=codec, chunk_size=chunk_size)
+    with ColumnarTimeline(path) as tl:
+        yield tl
+
+
+def matching(events, start=None, end=None, pid=None, device=None, event_type=None):
+    return [
+        e for e in events
+        if (start is None or e["time"] >= start)
+        and (end is None or e["time"] <= end)
+        and (pid is None or e["process"] == pid)
+        and (device is None or e["device"] == device)
+        and (event_type is None or e["event_type"] == event_type)
+    ]
+
+
+def test_round_trip(events, timeline):
+    assert len(timeline) == len(events)
+    assert timeline.time_range == (events[0]["time"], events[-1]["time"])
+    assert timeline.query() == events
+    assert timeline.to_columns() == {name: [e[name] for e in events] for name in COLUMNS}
+
+
+@pytest.mark.parametrize("filters", [
+    {"start": 0, "end": 0},
+    {"start": 40, "end": 95},
+    {"start": 96, "end": 96},
+    {"end": 30},
+    {"start": 150},
+    {"pid": "4"},
+    {"device": "CPU1"},
+    {"device": "IO0", "event_type": "dispatch_io"},
+    {"start": 20, "end": 200, "pid": "2", "event_type": "dispatch_cpu"},
+    {"event_type": "finished"},
+], ids=str)
+def test_queries_match_filtering_the_events(events, timeline, filters):
+    assert timeline.query(**filters) == matching(events, **filters)
+
+
+def test_values_that_never_occur_match_nothing(timeline):
+    assert timeline.query(pid="no such pid") == []
+    assert timeline.query(device="GPU0") == []
+    assert timeline.query(start=10 ** 9) == []
+
+
+def test_column_projection(events, timeline):
+    columns = ["time", "process", "cpus"]
+    expected = [{name: e[name] for name in columns} for e in matching(events, start=30, end=120, device="CPU0")]
+    assert timeline.query(start=30, end=120, device="CPU0", columns=columns) == expected
+    assert timeline.column("ready_queue") == [e["ready_queue"] for e in events]
+    with pytest.raises(KeyError):
+        timeline.column("nope")
+
+
+def test_unknown_codec_and_foreign_files(tmp_path):
+    with pytest.raises(ValueError):
+        export_columnar([], str(tmp_path / "x.tlc"), codec="snappy")
+    other = tmp_path / "other.tlc"
+    other.write_bytes(b"not a timeline at all")
+    with pytest.raises(ValueError):
+        ColumnarTimeline(str(other))